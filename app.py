@@ -5,9 +5,10 @@ Main Flask application for PaaS Platform
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 import logging
+import os
 import sys
 from pathlib import Path
-from config import config, Config
+from config import config, ensure_env_file
 
 # Import backend modules
 from backend.api.routes import api_bp
@@ -15,25 +16,34 @@ from backend.api.proxmox_routes import api_proxmox_bp
 from backend.utils.helpers import setup_logging
 from backend.extensions import db, migrate, init_extensions
 
-def create_app(config_name='default'):
+def create_app(config_name=None):
     """
     Application factory pattern
     
+    Safe to call once per server worker: it writes no files besides the
+    configured directories, installs logging handlers only on the first
+    call in a process, and skips db.create_all() when AUTO_CREATE_TABLES is
+    off (the production default; run `flask db upgrade` on deploy instead).
+    
     Args:
-        config_name: Configuration to use (development, production, testing)
+        config_name: Configuration to use (development, production, testing);
+            defaults to the FLASK_CONFIG environment variable
     
     Returns:
         Flask application instance
     """
+    config_name = config_name or os.getenv('FLASK_CONFIG', 'default')
+    config_class = config[config_name]
+    
     app = Flask(__name__)
     
     # Load configuration
-    app.config.from_object(config[config_name])
+    app.config.from_object(config_class)
     
-    # Initialize app directories
-    Config.init_app()
+    # Initialize app directories and validate settings for this configuration
+    config_class.init_app()
     
-    # Setup logging
+    # Setup logging (no-op after the first app in this process)
     setup_logging(app.config['LOG_FILE'], app.config['LOG_LEVEL'])
     
     # Enable CORS
@@ -42,9 +52,10 @@ def create_app(config_name='default'):
     # Initialize extensions (database, migrations)
     init_extensions(app)
     
-    # Create database tables if they don't exist
-    with app.app_context():
-        db.create_all()
+    # Create database tables if they don't exist (development convenience)
+    if app.config['AUTO_CREATE_TABLES']:
+        with app.app_context():
+            db.create_all()
     
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix='/api')
@@ -90,6 +101,9 @@ def create_app(config_name='default'):
 
 if __name__ == '__main__':
     try:
+        # First run: create .env from the example
+        ensure_env_file()
+        
         # Create app instance
         app = create_app('development')
         
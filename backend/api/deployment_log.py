@@ -0,0 +1,186 @@
+"""
+Deployment Log
+Per-deployment log file with timestamped lines and ranged reads
+"""
+
+import logging
+import mmap
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE_NAME = 'deployment.log'
+
+# Every line starts with a fixed-width UTC timestamp, e.g. 2024-01-31T12:00:00.123Z
+TIMESTAMP_LENGTH = 24
+
+# Upper bound on bytes returned by a single read
+DEFAULT_READ_LIMIT = 1024 * 1024
+
+
+def format_timestamp(moment: datetime) -> str:
+    """
+    Format a datetime the way log lines are stamped
+
+    Args:
+        moment: Naive UTC or timezone-aware datetime
+
+    Returns:
+        Fixed-width ISO 8601 UTC timestamp with milliseconds
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}Z"
+
+
+def parse_since(value: Union[str, float, None]) -> Optional[str]:
+    """
+    Convert a since= query value into a log timestamp
+
+    Args:
+        value: Unix epoch seconds or an ISO 8601 datetime
+
+    Returns:
+        Timestamp comparable with log line prefixes, or None if empty
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    if value is None or value == '':
+        return None
+    try:
+        return format_timestamp(datetime.fromtimestamp(float(value), tz=timezone.utc))
+    except (TypeError, ValueError):
+        pass
+    return format_timestamp(datetime.fromisoformat(str(value).replace('Z', '+00:00')))
+
+
+class DeploymentLog:
+    """
+    Append-only, line-timestamped log file for one deployment
+
+    Callable, so it can be attached as a sink to an OutputBuffer and receive
+    Terraform and SSH command output as it streams in.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize the log
+
+        Args:
+            path: Log file path (parent directories are created)
+        """
+        self.path = Path(path)
+        self._partial = b''
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _write_lines(self, lines):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'ab')
+        stamp = format_timestamp(datetime.utcnow()).encode() + b' '
+        self._file.write(b''.join(stamp + line.rstrip(b'\r') + b'\n' for line in lines))
+        self._file.flush()
+
+    def write(self, data: bytes):
+        """
+        Append output, stamping every completed line
+
+        Args:
+            data: Raw output bytes
+        """
+        with self._lock:
+            lines = (self._partial + data).split(b'\n')
+            self._partial = lines.pop()
+            if lines:
+                self._write_lines(lines)
+
+    __call__ = write
+
+    def close(self):
+        """Flush any unterminated line and close the file"""
+        with self._lock:
+            if self._partial:
+                self._write_lines([self._partial])
+                self._partial = b''
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _find_since(view, size: int, since: str) -> int:
+    """Binary search the first line stamped at or after since"""
+    target = since.encode()
+    lo, hi = 0, size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        line_start = view.rfind(b'\n', 0, mid) + 1
+        if view[line_start:line_start + TIMESTAMP_LENGTH] < target:
+            line_end = view.find(b'\n', mid)
+            lo = size if line_end == -1 else line_end + 1
+        else:
+            hi = line_start
+    return lo
+
+
+def _next_line(view, position: int, size: int) -> int:
+    """Move a position forward to the start of the next full line"""
+    if position == 0 or view[position - 1:position] == b'\n':
+        return position
+    line_end = view.find(b'\n', position)
+    return size if line_end == -1 else line_end + 1
+
+
+def read_log(
+    path: Union[str, Path],
+    offset: Optional[int] = None,
+    tail: Optional[int] = None,
+    since: Optional[str] = None,
+    limit: int = DEFAULT_READ_LIMIT
+) -> Dict[str, Any]:
+    """
+    Read a byte range of a deployment log without loading the whole file
+
+    The file is memory-mapped and only the requested slice is copied out.
+    offset continues from a previous read, tail returns roughly the last
+    bytes, and since starts at the first line stamped at or after a time.
+    At most limit bytes are returned; pass the returned offset back in to
+    continue. With neither offset nor since, the newest bytes win.
+
+    Args:
+        path: Log file path
+        offset: Absolute byte offset to start at
+        tail: Number of bytes from the end to return (aligned to a line start)
+        since: Timestamp from parse_since()
+        limit: Maximum number of bytes returned
+
+    Returns:
+        Dictionary with data (bytes), offset (next read position), size and truncated
+    """
+    path = Path(path)
+    size = path.stat().st_size if path.exists() else 0
+    if size == 0 or (offset is not None and offset >= size):
+        return {'data': b'', 'offset': size, 'size': size, 'truncated': False}
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        if offset is not None:
+            start = max(0, offset)
+        elif since is not None:
+            start = _find_since(view, size, since)
+        elif tail is not None:
+            start = _next_line(view, max(0, size - tail), size)
+        else:
+            start = 0
+
+        truncated = False
+        if offset is None and since is None and size - start > limit:
+            # Without an explicit starting point, favour the newest output
+            start = _next_line(view, size - limit, size)
+            truncated = True
+
+        end = min(size, start + limit)
+        return {'data': view[start:end], 'offset': end, 'size': size, 'truncated': truncated}
@@ -0,0 +1,204 @@
+"""
+Deployment Pipeline
+Provisions infrastructure and deploys the application for a queued deployment
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+from backend.api.terraform_manager import TerraformManager
+from backend.api.package_cache import active_cache_url
+from backend.models.deployment import Deployment, DeploymentStatus
+from backend.models.deployment_checkpoint import STEP_PREFIX, DeploymentCheckpoint
+from backend.api.live_output import LineLogger
+from backend.api.deployment_log import DeploymentLog
+from backend.api.stage_events import StageTimer
+from backend.extensions import db, inventory, live_output, stage_events
+
+logger = logging.getLogger(__name__)
+
+
+def _mark_failed(deployment: Deployment, error: str):
+    """Record a failure on the deployment row"""
+    try:
+        deployment.status = DeploymentStatus.FAILED
+        deployment.error_message = error
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+
+
+def _checkpoint(deployment: Deployment, stage: str, **detail):
+    """Record a completed stage; a failure to do so must not fail the deployment"""
+    try:
+        DeploymentCheckpoint.record(deployment.id, stage, **detail)
+    except Exception as e:
+        logger.warning(f"Could not checkpoint {stage} of {deployment.name}: {e}")
+        db.session.rollback()
+
+
+def resume_point(checkpoints: Dict[str, Dict]) -> str:
+    """
+    Get the first stage a run with these checkpoints starts at
+
+    Args:
+        checkpoints: Result of DeploymentCheckpoint.completed()
+
+    Returns:
+        'vm_id_allocated', 'provisioned' or 'deploy'
+    """
+    if 'provisioned' in checkpoints:
+        return 'deploy'
+    if 'vm_id_allocated' in checkpoints:
+        return 'provisioned'
+    return 'vm_id_allocated'
+
+
+def run_deployment(deployment_id: str, env_vars: Optional[Dict[str, str]] = None):
+    """
+    Run the provision -> deploy stages for a deployment
+
+    Executed by a background worker inside an application context. Progress
+    is written to the Deployment row after every stage so that API clients
+    can follow it through GET /api/deployments/<id>, and every stage
+    boundary is recorded in deployment_events (GET .../<id>/timeline).
+
+    Completed stages are checkpointed in deployment_checkpoints. A retry
+    (POST /api/deployments/<id>/retry) runs this again: it keeps the reserved
+    VM ID and golden image, skips Terraform once the guest is provisioned,
+    and skips remote steps checkpointed as done on that guest.
+
+    Args:
+        deployment_id: Deployment identifier
+        env_vars: Optional environment variables for the application
+    """
+    deployment = Deployment.get_by_id(deployment_id)
+    if not deployment:
+        logger.error(f"Deployment {deployment_id} not found, dropping job")
+        return
+
+    name = deployment.name
+    deployment_type = deployment.deployment_type
+    framework = deployment.framework
+    output = live_output.open(deployment.id, sinks=[LineLogger(logger, f"[{name}] ")])
+    deployment_log = None
+    stages = StageTimer(deployment.id, sink=stage_events.record)
+    succeeded = False
+
+    try:
+        logger.info(f"Starting automated deployment: {name} (ID: {deployment.id})")
+        logger.info(f"Framework: {framework}, Type: {deployment_type}, Repo: {deployment.github_url}")
+
+        terraform_manager = TerraformManager()
+
+        # Terraform and SSH command output is appended to the deployment's log file
+        deployment_log = DeploymentLog(terraform_manager.log_path(name))
+        output.sinks.append(deployment_log)
+
+        checkpoints = DeploymentCheckpoint.completed(deployment.id)
+        allocated = checkpoints.get('vm_id_allocated')
+        if checkpoints:
+            logger.info(f"Resuming {name} at {resume_point(checkpoints)} ({len(checkpoints)} checkpoint(s))")
+
+        if 'provisioned' in checkpoints:
+            # The guest exists; go straight back to the remote steps
+            golden_image_id = allocated.get('golden_image_id') if allocated else None
+            deployment.status = DeploymentStatus.DEPLOYING
+            deployment.ip_address = checkpoints['provisioned']['ip_address']
+            deployment.vm_id = checkpoints['provisioned']['vm_id']
+            db.session.commit()
+        else:
+            # A new guest has none of the remote work of an earlier one
+            if any(stage.startswith(STEP_PREFIX) for stage in checkpoints):
+                DeploymentCheckpoint.forget_steps(deployment.id)
+                checkpoints = {stage: detail for stage, detail in checkpoints.items() if not stage.startswith(STEP_PREFIX)}
+
+            # Generate Terraform configuration, reusing the VM ID and golden image of an earlier attempt
+            logger.info(f"Generating Terraform configuration...")
+            stage_start = stages.now()
+            tf_config = terraform_manager.generate_config(
+                deployment_type=deployment_type,
+                framework=framework,
+                name=name,
+                resources=deployment.resources,
+                deployment_id=deployment.id,
+                use_golden_image=allocated is None,
+                vm_id=allocated['vm_id'] if allocated else None,
+                golden_image_id=allocated.get('golden_image_id') if allocated else None
+            )
+            golden_image = tf_config.get('golden_image')
+            golden_image_id = golden_image['id'] if golden_image else None
+            stages.record('config_generated', stage_start, golden_image=golden_image['version'] if golden_image else None)
+
+            # Held by the row from now on, so the ID survives its reservation expiring before a retry
+            deployment.vm_id = tf_config['variables']['vm_id']
+            if not allocated:
+                _checkpoint(deployment, 'vm_id_allocated', vm_id=deployment.vm_id, golden_image_id=golden_image_id)
+
+            # Apply Terraform configuration to provision infrastructure
+            logger.info(f"Provisioning {deployment_type.upper()} infrastructure on Proxmox...")
+            deployment.status = DeploymentStatus.PROVISIONING
+            db.session.commit()
+
+            result = terraform_manager.apply(name, tf_config, output=output, stages=stages)
+
+            if not result['success']:
+                logger.error(f"Infrastructure provisioning failed for {name}: {result.get('error')}")
+                _mark_failed(deployment, result.get('error'))
+                return
+
+            # A new guest exists now; make the next inventory read see it
+            inventory.invalidate()
+
+            init_info = result.get('init', {})
+            logger.info(f"Terraform init for {name}: {'cache hit' if init_info.get('cache_hit') else 'ran'} ({init_info.get('seconds')}s)")
+            logger.info(f"Provisioning stage timings for {name}: {result.get('timings', {})}")
+
+            deployment.status = DeploymentStatus.DEPLOYING
+            deployment.ip_address = result.get('ip_address')
+            deployment.vm_id = result.get('vm_id')
+            db.session.commit()
+            _checkpoint(deployment, 'provisioned', vm_id=deployment.vm_id, ip_address=deployment.ip_address)
+
+        logger.info(f"Infrastructure provisioned: {deployment_type.upper()} ID {deployment.vm_id}, IP {deployment.ip_address}")
+        logger.info(f"Deploying application via SSH...")
+
+        # Deploy application directly via SSH
+        deploy_result = terraform_manager.deploy_application(
+            ip_address=deployment.ip_address,
+            framework=framework,
+            github_url=deployment.github_url,
+            env_vars=env_vars,
+            output=output,
+            stages=stages,
+            baked=golden_image_id is not None,
+            package_cache_url=active_cache_url(),
+            on_step=lambda index, key: _checkpoint(deployment, f"{STEP_PREFIX}{key}", index=index),
+            completed_steps=[stage[len(STEP_PREFIX):] for stage in checkpoints if stage.startswith(STEP_PREFIX)]
+        )
+
+        if not deploy_result['success']:
+            logger.error(f"Application deployment failed for {name}: {deploy_result.get('error')}")
+            _mark_failed(deployment, deploy_result.get('error'))
+            return
+
+        deployment.status = DeploymentStatus.RUNNING
+        deployment.deployed_at = datetime.utcnow()
+        deployment.error_message = None
+        db.session.commit()
+        _checkpoint(deployment, 'deployed')
+        succeeded = True
+
+        logger.info(f"Application deployed successfully on {deployment.ip_address}")
+
+    except Exception as e:
+        logger.error(f"Deployment error: {e}", exc_info=True)
+        db.session.rollback()
+        _mark_failed(deployment, str(e))
+
+    finally:
+        # Whole run, start to finish; the per-stage rows above break it down
+        stages.record('pipeline', stages.origin, status='ok' if succeeded else 'failed')
+        output.close()
+        if deployment_log:
+            deployment_log.close()
@@ -0,0 +1,210 @@
+"""
+Deployment Events
+In-process publish/subscribe of deployment status changes for Server-Sent Events
+"""
+
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from sqlalchemy import event, inspect
+
+logger = logging.getLogger(__name__)
+
+# Fields sent with every status event; enough for the dashboard to patch a row
+EVENT_FIELDS = ('id', 'name', 'deployment_type', 'framework', 'ip_address', 'vm_id', 'error_message')
+
+# Session.info key holding changes flushed but not yet committed
+PENDING_KEY = 'deployment_status_events'
+
+
+class Subscription:
+    """One connected event-stream client"""
+
+    def __init__(self, max_queue: int):
+        self.queue: 'queue.Queue[Optional[Dict[str, Any]]]' = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+
+class DeploymentEvents:
+    """
+    Broadcast committed deployment status transitions to subscribers
+
+    SQLAlchemy session hooks collect status changes on flush and publish
+    them only after the transaction commits, so clients never see a state
+    that was rolled back. A short backlog lets reconnecting clients resume
+    from their Last-Event-ID. Events are process-local.
+    """
+
+    def __init__(self, app=None):
+        """Initialize the broker, optionally binding it to an application"""
+        self.backlog_size = 256
+        self.max_queue = 100
+        self.heartbeat = 15.0
+        self._backlog: deque = deque(maxlen=self.backlog_size)
+        self._subscribers: List[Subscription] = []
+        self._callbacks: List[Callable[[Dict[str, Any]], None]] = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._hooked = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, session=None):
+        """
+        Bind the broker to a Flask application
+
+        Args:
+            app: Flask application instance
+            session: Session (or scoped session) to watch, defaults to db.session
+        """
+        self.backlog_size = int(app.config.get('DEPLOYMENT_EVENTS_BACKLOG', 256))
+        self.max_queue = int(app.config.get('DEPLOYMENT_EVENTS_QUEUE_SIZE', 100))
+        self.heartbeat = float(app.config.get('DEPLOYMENT_EVENTS_HEARTBEAT', 15))
+        with self._lock:
+            self._backlog = deque(self._backlog, maxlen=self.backlog_size)
+        app.extensions['deployment_events'] = self
+
+        if not self._hooked:
+            if session is None:
+                from backend.extensions import db
+                session = db.session
+            event.listen(session, 'after_flush', self._collect)
+            event.listen(session, 'after_commit', self._flush_pending)
+            event.listen(session, 'after_rollback', self._discard_pending)
+            self._hooked = True
+
+    # Session hooks
+
+    def _collect(self, session, flush_context):
+        """Record status changes of Deployment rows written by this flush"""
+        from backend.models.deployment import Deployment
+
+        pending = session.info.setdefault(PENDING_KEY, [])
+        for obj in list(session.new) + list(session.dirty):
+            if not isinstance(obj, Deployment):
+                continue
+            history = inspect(obj).attrs['status'].history
+            if not history.added:
+                continue
+            previous = history.deleted[0].value if history.deleted else None
+            if previous == history.added[0].value:
+                continue
+            payload = {field: getattr(obj, field) for field in EVENT_FIELDS}
+            payload['status'] = history.added[0].value
+            payload['previous'] = previous
+            pending.append(payload)
+
+    def _flush_pending(self, session):
+        for payload in session.info.pop(PENDING_KEY, []):
+            self.publish(payload)
+
+    def _discard_pending(self, session):
+        session.info.pop(PENDING_KEY, None)
+
+    # Publish / subscribe
+
+    def on_change(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Register an in-process callback run for every published event
+
+        Args:
+            callback: Callable receiving the event payload
+        """
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def publish(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send an event to every subscriber
+
+        Args:
+            payload: JSON-serializable event data
+
+        Returns:
+            The event with its assigned id
+        """
+        with self._lock:
+            item = {'id': self._next_id, 'data': payload}
+            self._next_id += 1
+            self._backlog.append(item)
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(item)
+            except queue.Full:
+                # A client that cannot keep up is disconnected; it resumes from the backlog
+                subscription.overflowed = True
+
+        for callback in self._callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.warning(f"Deployment event callback failed: {e}")
+        return item
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Register a subscriber
+
+        Args:
+            last_event_id: Replay backlog events after this id
+
+        Returns:
+            Subscription whose queue receives events
+        """
+        subscription = Subscription(self.max_queue)
+        with self._lock:
+            if last_event_id is not None:
+                if last_event_id >= self._next_id:
+                    last_event_id = 0  # Ids restarted with the process; replay what we have
+                missed = [item for item in self._backlog if item['id'] > last_event_id]
+                for item in missed[-self.max_queue:]:
+                    subscription.queue.put_nowait(item)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber"""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def stream(self, last_event_id: Optional[int] = None) -> Iterator[str]:
+        """
+        Generate a text/event-stream body
+
+        Args:
+            last_event_id: Resume point sent by a reconnecting client
+
+        Yields:
+            SSE frames, with comment heartbeats while idle
+        """
+        subscription = self.subscribe(last_event_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    item = subscription.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"id: {item['id']}\nevent: status\ndata: {json.dumps(item['data'], default=str)}\n\n"
+                if subscription.overflowed and subscription.queue.empty():
+                    # Events were dropped; end the stream so the client reconnects with Last-Event-ID
+                    break
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get broker statistics
+
+        Returns:
+            Dictionary with subscribers and last event id
+        """
+        with self._lock:
+            return {'subscribers': len(self._subscribers), 'last_event_id': self._next_id - 1}
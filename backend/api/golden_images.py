@@ -0,0 +1,197 @@
+"""
+Golden Images
+Builds one Proxmox template per framework language with its system packages baked in
+"""
+
+import logging
+import shutil
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+from flask import current_app
+from backend.api.terraform_manager import TerraformManager
+from backend.api.proxmox_client import with_proxmox
+from backend.api.live_output import LineLogger
+from backend.api.package_cache import active_cache_url, guest_commands
+from backend.extensions import db, inventory, live_output
+from backend.models.golden_image import GoldenImage
+from backend.utils.validators import RESERVED_NAME_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Run on the builder guest after the setup commands, before it becomes a template
+TEMPLATE_PREP_COMMANDS = [
+    # Every clone needs its own machine-id (DHCP client ID) and SSH host keys
+    "truncate -s 0 /etc/machine-id && rm -f /var/lib/dbus/machine-id",
+    "rm -f /etc/ssh/ssh_host_* && "
+    "printf '[Unit]\\nDescription=Generate missing SSH host keys\\nBefore=ssh.service\\n\\n"
+    "[Service]\\nType=oneshot\\nExecStart=/usr/bin/ssh-keygen -A\\n\\n"
+    "[Install]\\nWantedBy=multi-user.target\\n' > /etc/systemd/system/ssh-host-keys.service && "
+    "systemctl enable ssh-host-keys.service",
+    "(cloud-init clean --logs 2>/dev/null || true) && apt-get clean && rm -rf /tmp/* /root/.npm/_cacache",
+    # Package cache settings are applied per deployment, never baked in
+    guest_commands(None)[0]
+]
+
+
+def framework_for(language: str) -> Optional[str]:
+    """
+    Get a framework of the language to provision the builder guest with
+
+    Args:
+        language: Framework language
+
+    Returns:
+        Framework identifier, or None if no framework uses the language
+    """
+    for framework, framework_config in current_app.config['SUPPORTED_FRAMEWORKS'].items():
+        if framework_config['language'] == language:
+            return framework
+    return None
+
+
+def queue_build(language: str, deployment_type: str, force: bool = False) -> Tuple[GoldenImage, bool]:
+    """
+    Record a golden image build and hand it to the deployment workers
+
+    Args:
+        language: Framework language
+        deployment_type: 'vm' or 'lxc'
+        force: Build even if a template for the current setup commands exists
+
+    Returns:
+        (image, queued): the new build, or the existing ready image or build
+        in progress with queued=False
+
+    Raises:
+        QueueFullError: If the deployment queue is full
+    """
+    from backend.extensions import job_queue
+
+    in_progress = GoldenImage.building(language, deployment_type)
+    if in_progress:
+        return in_progress, False
+
+    version = TerraformManager().bake_version(language)
+    if not force:
+        ready = GoldenImage.current(language, deployment_type, version)
+        if ready:
+            return ready, False
+
+    image = GoldenImage(language=language, deployment_type=deployment_type, version=version, status='building')
+    db.session.add(image)
+    db.session.commit()
+
+    try:
+        job_queue.submit(build_golden_image, image.id)
+    except Exception as e:
+        image.status = 'failed'
+        image.error_message = str(e)
+        db.session.commit()
+        raise
+
+    logger.info(f"Queued golden image build {image.id} ({language}/{deployment_type} {version})")
+    return image, True
+
+
+def build_golden_image(image_id: int):
+    """
+    Provision a builder guest, run the setup commands and turn it into a template
+
+    Executed by a background worker inside an application context. The
+    builder goes through the normal Terraform path from the stock OS
+    template; once converted, its Terraform working directory is dropped so
+    that the template is never destroyed along with a deployment.
+
+    Args:
+        image_id: GoldenImage identifier
+    """
+    image = db.session.get(GoldenImage, image_id)
+    if not image:
+        logger.error(f"Golden image {image_id} not found, dropping job")
+        return
+
+    # Reserved prefix: the build's Terraform workdir must not collide with a deployment's
+    name = f"{RESERVED_NAME_PREFIX}golden-{image.language}-{image.deployment_type}-{image.version}"
+    terraform_manager = TerraformManager()
+    output = live_output.open(f"golden-image-{image.id}", sinks=[LineLogger(logger, f"[{name}] ")])
+    provisioned = False
+
+    try:
+        framework = framework_for(image.language)
+        if not framework:
+            raise ValueError(f"No framework uses language {image.language}")
+
+        logger.info(f"Building golden image {name}")
+        tf_config = terraform_manager.generate_config(
+            deployment_type=image.deployment_type,
+            framework=framework,
+            name=name,
+            resources={},
+            deployment_id=f"golden-image-{image.id}",
+            use_golden_image=False
+        )
+
+        result = terraform_manager.apply(name, tf_config, output=output)
+        if not result['success']:
+            raise Exception(f"Builder provisioning failed: {result.get('error')}")
+        provisioned = True
+
+        commands = terraform_manager.build_bake_commands(image.language) + TEMPLATE_PREP_COMMANDS
+        setup = terraform_manager.run_commands(
+            result['ip_address'], commands, output=output, preamble=guest_commands(active_cache_url())
+        )
+        if not setup['success']:
+            raise Exception(f"Setup commands failed: {setup.get('error')}")
+
+        node = tf_config['variables']['proxmox_node']
+        _convert_to_template(int(result['vm_id']), image.deployment_type, node)
+
+        # The template now belongs to the image, not to a Terraform working directory
+        shutil.rmtree(terraform_manager.state_dir / name, ignore_errors=True)
+        provisioned = False
+
+        for previous in GoldenImage.query.filter(
+            GoldenImage.language == image.language,
+            GoldenImage.deployment_type == image.deployment_type,
+            GoldenImage.status == 'ready'
+        ):
+            # Kept on Proxmox: linked clones still depend on it
+            previous.status = 'retired'
+
+        image.status = 'ready'
+        image.vm_id = int(result['vm_id'])
+        image.node = node
+        image.ready_at = datetime.utcnow()
+        db.session.commit()
+        inventory.invalidate()
+        logger.info(f"Golden image {name} ready as template {image.vm_id}")
+
+    except Exception as e:
+        logger.error(f"Golden image build {name} failed: {e}", exc_info=True)
+        db.session.rollback()
+        image.status = 'failed'
+        image.error_message = str(e)
+        db.session.commit()
+        if provisioned:
+            terraform_manager.destroy(name)
+
+    finally:
+        output.close()
+
+
+def _convert_to_template(vm_id: int, deployment_type: str, node: str):
+    """Shut the builder guest down and mark it as a Proxmox template"""
+
+    def guest(proxmox):
+        return proxmox.nodes(node).lxc(vm_id) if deployment_type == 'lxc' else proxmox.nodes(node).qemu(vm_id)
+
+    with_proxmox(lambda proxmox: guest(proxmox).status.shutdown.post())
+
+    deadline = time.monotonic() + current_app.config.get('GOLDEN_IMAGE_SHUTDOWN_TIMEOUT', 120)
+    while with_proxmox(lambda proxmox: guest(proxmox).status.current.get()).get('status') != 'stopped':
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{deployment_type} {vm_id} did not shut down")
+        time.sleep(2)
+
+    with_proxmox(lambda proxmox: guest(proxmox).template.post())
@@ -0,0 +1,172 @@
+"""
+Cluster Inventory
+In-memory snapshot of Proxmox /cluster/resources shared by all API requests
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from backend.api.proxmox_client import with_proxmox
+
+logger = logging.getLogger(__name__)
+
+GUEST_TYPES = ('qemu', 'lxc')
+
+
+class ClusterInventory:
+    """
+    Cached view of every node and guest in the Proxmox cluster
+
+    One /cluster/resources call per refresh interval feeds every dashboard
+    endpoint, so Proxmox load does not grow with the number of open browser
+    tabs. Reads older than the TTL (or asked for with fresh=True) fall
+    through to a live call; concurrent readers share that single call. The
+    background refresher starts on the first read and skips refreshes while
+    nobody is reading.
+    """
+
+    def __init__(self, app=None):
+        """Initialize the inventory, optionally binding it to an application"""
+        self.app = None
+        self.ttl = 30
+        self.interval = 15
+        self.idle_timeout = 600
+        self._resources: Optional[List[Dict[str, Any]]] = None
+        self._fetched_at = 0.0
+        self._stale = False
+        self._last_read = 0.0
+        self._fetch_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Bind the inventory to a Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.ttl = float(app.config.get('PROXMOX_INVENTORY_TTL', 30))
+        self.interval = float(app.config.get('PROXMOX_INVENTORY_INTERVAL', 15))
+        self.idle_timeout = float(app.config.get('PROXMOX_INVENTORY_IDLE_TIMEOUT', 600))
+        app.extensions['cluster_inventory'] = self
+
+    def age(self) -> Optional[float]:
+        """
+        Get the snapshot age
+
+        Returns:
+            Seconds since the last successful refresh, or None if never fetched
+        """
+        if self._resources is None:
+            return None
+        return round(time.monotonic() - self._fetched_at, 3)
+
+    def resources(self, fresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get every entry of /cluster/resources
+
+        Args:
+            fresh: Bypass the snapshot and read Proxmox live
+
+        Returns:
+            List of resource dictionaries (nodes, guests, storage, ...)
+        """
+        self._last_read = time.monotonic()
+        self._ensure_refresher()
+
+        if fresh:
+            self.refresh()
+        elif self._resources is None or self._stale or self.age() >= self.ttl:
+            try:
+                self.refresh(max_age=self.ttl)
+            except Exception as e:
+                if self._resources is None:
+                    raise
+                logger.warning(f"Inventory refresh failed, serving {self.age()}s old snapshot: {e}")
+
+        return self._resources
+
+    def guests(self, node: Optional[str] = None, fresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get QEMU VMs and LXC containers
+
+        Args:
+            node: Only return guests on this node (all nodes if None)
+            fresh: Bypass the snapshot and read Proxmox live
+
+        Returns:
+            List of guest resource dictionaries
+        """
+        return [
+            r for r in self.resources(fresh)
+            if r.get('type') in GUEST_TYPES and (node is None or r.get('node') == node)
+        ]
+
+    def nodes(self, fresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get cluster nodes
+
+        Args:
+            fresh: Bypass the snapshot and read Proxmox live
+
+        Returns:
+            List of node resource dictionaries
+        """
+        return [r for r in self.resources(fresh) if r.get('type') == 'node']
+
+    def refresh(self, max_age: Optional[float] = None):
+        """
+        Pull /cluster/resources into the snapshot
+
+        Args:
+            max_age: Skip the call if another thread refreshed more recently
+                than this while we waited for the lock
+        """
+        with self._fetch_lock:
+            if max_age is not None and self._resources is not None and not self._stale and self.age() < max_age:
+                return
+            resources = with_proxmox(lambda proxmox: proxmox.cluster.resources.get(), self.app.config)
+            self._resources = resources
+            self._fetched_at = time.monotonic()
+            self._stale = False
+
+    def invalidate(self):
+        """Mark the snapshot stale so the next read goes to Proxmox"""
+        self._stale = True
+
+    def stop(self):
+        """Stop the background refresher"""
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+    def _ensure_refresher(self):
+        """Start the background refresher on first use"""
+        if self._refresher is not None or self.interval <= 0:
+            return
+        with self._start_lock:
+            if self._refresher is None:
+                self._stop.clear()
+                self._refresher = threading.Thread(
+                    target=self._refresh_loop,
+                    name='cluster-inventory',
+                    daemon=True
+                )
+                self._refresher.start()
+
+    def _refresh_loop(self):
+        """Refresh the snapshot every interval while it is being read"""
+        while not self._stop.wait(self.interval):
+            if time.monotonic() - self._last_read > self.idle_timeout:
+                continue
+            try:
+                self.refresh(max_age=self.interval / 2)
+            except Exception as e:
+                logger.warning(f"Background inventory refresh failed: {e}")
@@ -0,0 +1,214 @@
+"""
+IP Waiter
+Waits for a freshly provisioned VM/LXC to obtain an IPv4 address
+"""
+
+import logging
+import random
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# MAC address inside a Proxmox netX config value (virtio=..., hwaddr=...)
+MAC_PATTERN = re.compile(r'([0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5})')
+
+
+class IPWaitTimeout(Exception):
+    """Raised when no address shows up before the deadline"""
+
+
+def _usable_ipv4(ip: Optional[str]) -> bool:
+    """Check that an address is a routable guest IPv4 address"""
+    return bool(ip) and ip != '0.0.0.0' and not ip.startswith('127.') and not ip.startswith('169.254.')
+
+
+def parse_leases(content: str) -> Dict[str, str]:
+    """
+    Parse a DHCP lease table into a MAC -> IP mapping
+
+    Understands dnsmasq lease files (``<expiry> <mac> <ip> <host> <id>``)
+    and ISC dhcpd ``lease <ip> { hardware ethernet <mac>; }`` blocks.
+    Later entries win, matching how both servers append renewals.
+
+    Args:
+        content: Lease file content
+
+    Returns:
+        Dictionary of lower-case MAC address to IP address
+    """
+    leases = {}
+
+    for block in re.finditer(r'lease\s+([\d.]+)\s*\{(.*?)\}', content, re.S):
+        mac = re.search(r'hardware ethernet\s+([0-9a-fA-F:]{17})', block.group(2))
+        if mac:
+            leases[mac.group(1).lower()] = block.group(1)
+
+    for line in content.splitlines():
+        parts = line.split()
+        if len(parts) >= 3 and parts[0].isdigit() and MAC_PATTERN.fullmatch(parts[1]):
+            leases[parts[1].lower()] = parts[2]
+
+    return leases
+
+
+class IPWaiter:
+    """
+    Poll every IP source at once with exponential backoff and a deadline
+
+    Each round queries the QEMU guest agent or the LXC interfaces endpoint,
+    plus the DHCP lease table when one is configured, in parallel. The wait
+    ends as soon as any source reports a usable address.
+    """
+
+    def __init__(
+        self,
+        proxmox,
+        node: str,
+        timeout: float = 180,
+        initial_delay: float = 0.5,
+        max_delay: float = 5.0,
+        leases_file: Optional[str] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the waiter
+
+        Args:
+            proxmox: ProxmoxAPI client
+            node: Proxmox node hosting the guest
+            timeout: Overall deadline in seconds
+            initial_delay: First backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay
+            leases_file: Optional path to a dnsmasq/dhcpd lease file
+            sleep: Sleep function (overridable for tests)
+        """
+        self.proxmox = proxmox
+        self.node = node
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.leases_file = Path(leases_file) if leases_file else None
+        self.sleep = sleep
+
+    def wait(self, vm_id, deployment_type: str) -> Dict[str, Any]:
+        """
+        Block until the guest has an IPv4 address
+
+        Args:
+            vm_id: VM or LXC container ID
+            deployment_type: 'vm' or 'lxc'
+
+        Returns:
+            Dictionary with ip, source, attempts and seconds
+
+        Raises:
+            IPWaitTimeout: If no address appears before the deadline
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        sources = self._sources(vm_id, deployment_type)
+        attempt = 0
+
+        # Not used as a context manager: a slow source must not delay returning
+        pool = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix=f"ip-wait-{vm_id}")
+        try:
+            while True:
+                attempt += 1
+                found = self._poll(pool, sources)
+                if found:
+                    ip, source = found
+                    seconds = round(time.monotonic() - start, 3)
+                    logger.info(f"Found {deployment_type} IP {ip} for {vm_id} via {source} after {attempt} attempt(s), {seconds}s")
+                    return {'ip': ip, 'source': source, 'attempts': attempt, 'seconds': seconds}
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                delay = min(self.max_delay, self.initial_delay * (2 ** (attempt - 1)))
+                delay = random.uniform(delay / 2, delay)
+                logger.info(f"IP not ready yet for {deployment_type} {vm_id}, attempt {attempt}, next check in {delay:.1f}s")
+                self.sleep(min(delay, remaining))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        raise IPWaitTimeout(
+            f"Could not retrieve IP address for {deployment_type} {vm_id} within {self.timeout}s ({attempt} attempts)"
+        )
+
+    def _sources(self, vm_id, deployment_type: str) -> List[Tuple[str, Callable[[], Optional[str]]]]:
+        """Build the list of (name, probe) pairs for a guest"""
+        if deployment_type == 'lxc':
+            sources = [('lxc-interfaces', lambda: self._from_lxc_interfaces(vm_id))]
+        else:
+            sources = [('guest-agent', lambda: self._from_guest_agent(vm_id))]
+
+        if self.leases_file:
+            mac_cache = {}
+
+            def from_leases():
+                # Only a MAC that was found is kept; a failed lookup is retried next attempt
+                if 'mac' not in mac_cache:
+                    mac = self._guest_mac(vm_id, deployment_type)
+                    if not mac:
+                        return None
+                    mac_cache['mac'] = mac
+                return self._from_leases(mac_cache['mac'])
+
+            sources.append(('dhcp-leases', from_leases))
+
+        return sources
+
+    def _poll(self, pool, sources) -> Optional[Tuple[str, str]]:
+        """Query all sources in parallel and return the first address found"""
+        pending = {pool.submit(probe): name for name, probe in sources}
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    ip = future.result()
+                except Exception as e:
+                    logger.debug(f"IP source {name} failed: {e}")
+                    continue
+                if _usable_ipv4(ip):
+                    return ip, name
+
+        return None
+
+    def _from_lxc_interfaces(self, vm_id) -> Optional[str]:
+        """Read eth0 from the LXC interfaces endpoint"""
+        interfaces = self.proxmox.nodes(self.node).lxc(vm_id).interfaces.get() or []
+        for interface in interfaces:
+            if interface.get('name') == 'eth0' and 'inet' in interface:
+                return interface['inet'].split('/')[0]  # Remove CIDR notation
+        return None
+
+    def _from_guest_agent(self, vm_id) -> Optional[str]:
+        """Read the first IPv4 address reported by the QEMU guest agent"""
+        agent_info = self.proxmox.nodes(self.node).qemu(vm_id).agent.get('network-get-interfaces')
+        if not agent_info:
+            return None
+        for iface in agent_info.get('result', []):
+            if iface.get('name') in ['eth0', 'ens18']:
+                for ip_addr in iface.get('ip-addresses', []):
+                    if ip_addr.get('ip-address-type') == 'ipv4' and _usable_ipv4(ip_addr.get('ip-address')):
+                        return ip_addr.get('ip-address')
+        return None
+
+    def _guest_mac(self, vm_id, deployment_type: str) -> Optional[str]:
+        """Read the MAC address of net0 from the guest configuration"""
+        guest = self.proxmox.nodes(self.node).lxc(vm_id) if deployment_type == 'lxc' else self.proxmox.nodes(self.node).qemu(vm_id)
+        match = MAC_PATTERN.search(guest.config.get().get('net0', ''))
+        return match.group(1).lower() if match else None
+
+    def _from_leases(self, mac: Optional[str]) -> Optional[str]:
+        """Look the guest MAC up in the DHCP lease table"""
+        if not mac or not self.leases_file.exists():
+            return None
+        return parse_leases(self.leases_file.read_text(errors='replace')).get(mac)
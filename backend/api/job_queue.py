@@ -0,0 +1,253 @@
+"""
+Deployment Job Queue
+Runs long deployment pipelines on a bounded pool of background workers
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the deployment queue cannot accept another job"""
+
+
+class DeploymentJobQueue:
+    """
+    Bounded job queue served by a fixed pool of worker threads
+
+    Created once at import time and bound to an application with init_app().
+    Workers are started lazily on the first submit() so that importing the
+    app (or forking server workers) does not spawn threads.
+
+    Jobs submitted with a key are owned by this process from submit() until
+    they finish: owns() answers for this process, and the callbacks
+    registered with on_renew() are handed the owned keys every
+    DEPLOY_LEASE_INTERVAL seconds so other processes can tell too.
+    """
+
+    def __init__(self, app=None):
+        """Initialize the queue, optionally binding it to an application"""
+        self.app = None
+        self.num_workers = 4
+        self.max_size = 500
+        self._queue: Optional[queue.Queue] = None
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self._owned: Dict[str, int] = {}
+        self._renew_callbacks: List[Callable[[List[str]], None]] = []
+        self.lease_interval = 30.0
+        self._renewer: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._closed = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Bind the queue to a Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.num_workers = max(1, int(app.config.get('DEPLOY_WORKERS', 4)))
+        self.max_size = max(1, int(app.config.get('DEPLOY_QUEUE_SIZE', 500)))
+        self.lease_interval = float(app.config.get('DEPLOY_LEASE_INTERVAL', 30))
+        self._queue = queue.Queue(maxsize=self.max_size)
+        self._workers = []
+        self._owned = {}
+        self._closed = False
+        app.extensions['deployment_queue'] = self
+
+    def submit(self, func: Callable[..., Any], *args, key: Optional[str] = None, **kwargs) -> int:
+        """
+        Enqueue a job without blocking the caller
+
+        Args:
+            func: Callable to run inside an application context
+            *args: Positional arguments for func
+            key: Identifier this process owns while the job is queued or
+                running (e.g. the deployment id)
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Number of jobs waiting in the queue after this one
+
+        Raises:
+            QueueFullError: If the queue is at capacity or shutting down
+        """
+        if self._queue is None:
+            raise RuntimeError("DeploymentJobQueue is not bound to an application")
+
+        self._ensure_workers()
+
+        # Queued and owned under the lock, so a worker cannot release the key first
+        with self._lock:
+            if self._closed:
+                raise QueueFullError("Deployment queue is shutting down")
+            try:
+                self._queue.put_nowait((func, args, kwargs, key))
+            except queue.Full:
+                raise QueueFullError(f"Deployment queue is full ({self.max_size} jobs pending)")
+            if key is not None:
+                self._owned[key] = self._owned.get(key, 0) + 1
+
+        return self._queue.qsize()
+
+    def owns(self, key: str) -> bool:
+        """
+        Check whether a job with this key is queued or running in this process
+
+        Args:
+            key: Key passed to submit()
+
+        Returns:
+            True while such a job has not finished
+        """
+        with self._lock:
+            return key in self._owned
+
+    def on_renew(self, callback: Callable[[List[str]], None]):
+        """
+        Register a callback renewing the leases of the owned keys
+
+        Called every DEPLOY_LEASE_INTERVAL seconds inside an application
+        context, and only while this process owns at least one key.
+
+        Args:
+            callback: Receives the list of owned keys
+        """
+        if callback not in self._renew_callbacks:
+            self._renew_callbacks.append(callback)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get queue statistics
+
+        Returns:
+            Dictionary with pending, active and worker counts
+        """
+        return {
+            'pending': self._queue.qsize() if self._queue else 0,
+            'active': self._active,
+            'workers': len(self._workers),
+            'capacity': self.max_size
+        }
+
+    def join(self):
+        """Block until every queued job has been processed"""
+        if self._queue is not None:
+            self._queue.join()
+
+    def shutdown(self, wait: bool = True) -> int:
+        """
+        Stop accepting jobs and stop all worker threads
+
+        Jobs still waiting in the queue are dropped, not run: their keys are
+        released, so a dropped deployment stays PENDING and can be retried
+        once its lease expires. Only the jobs already running are waited for.
+
+        Args:
+            wait: Wait for workers to finish their current job
+
+        Returns:
+            Number of queued jobs dropped
+        """
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        self._stopping.set()
+
+        dropped = 0
+        while True:
+            try:
+                _, _, _, key = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._own(key, -1)
+            self._queue.task_done()
+            dropped += 1
+        if dropped:
+            logger.warning(f"Dropped {dropped} queued job(s) on shutdown")
+
+        for _ in workers:
+            try:
+                self._queue.put_nowait((None, (), {}, None))
+            except queue.Full:
+                # Only possible if something bypassed submit(); daemon workers die with the process
+                logger.warning("Deployment queue full during shutdown, not every worker was signalled")
+                break
+        if wait:
+            for worker in workers:
+                worker.join()
+        return dropped
+
+    def _ensure_workers(self):
+        """Start the worker pool on first use"""
+        if len(self._workers) >= self.num_workers:
+            return
+        with self._lock:
+            while len(self._workers) < self.num_workers:
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"deploy-worker-{len(self._workers) + 1}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+            if self._renew_callbacks and (self._renewer is None or not self._renewer.is_alive()):
+                self._stopping.clear()
+                self._renewer = threading.Thread(target=self._renew_loop, name='deploy-lease-renewer', daemon=True)
+                self._renewer.start()
+            logger.info(f"Started {self.num_workers} deployment workers (queue capacity {self.max_size})")
+
+    def _own(self, key: Optional[str], delta: int):
+        """Add or release one job's claim on a key"""
+        if key is None:
+            return
+        with self._lock:
+            count = self._owned.get(key, 0) + delta
+            if count > 0:
+                self._owned[key] = count
+            else:
+                self._owned.pop(key, None)
+
+    def _renew_loop(self):
+        """Hand the owned keys to the renew callbacks until shutdown"""
+        while not self._stopping.wait(self.lease_interval):
+            with self._lock:
+                keys = list(self._owned)
+            if not keys:
+                continue
+            for callback in self._renew_callbacks:
+                try:
+                    with self.app.app_context():
+                        callback(keys)
+                except Exception as e:
+                    logger.warning(f"Renewing leases of {len(keys)} job(s) failed: {e}")
+
+    def _worker_loop(self):
+        """Process jobs until a shutdown sentinel is received"""
+        while True:
+            func, args, kwargs, key = self._queue.get()
+            try:
+                if func is None:
+                    return
+                with self._lock:
+                    self._active += 1
+                try:
+                    with self.app.app_context():
+                        func(*args, **kwargs)
+                except Exception as e:
+                    logger.error(f"Deployment job {getattr(func, '__name__', func)} failed: {e}", exc_info=True)
+                finally:
+                    with self._lock:
+                        self._active -= 1
+                    self._own(key, -1)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,242 @@
+"""
+Live Output
+Bounded, tail-able buffers for command output streamed during deployments
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OutputBuffer:
+    """
+    Fixed-size ring buffer of command output
+
+    Bytes are addressed by their absolute offset since the buffer was opened,
+    so a client can keep asking for "everything after offset N". Once more
+    than max_bytes have been written the oldest bytes are dropped and reads
+    from before the retained window report truncated=True.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024, sinks: Optional[List[Callable[[bytes], None]]] = None):
+        """
+        Initialize the buffer
+
+        Args:
+            max_bytes: Number of most recent bytes retained
+            sinks: Extra callables receiving every chunk written
+        """
+        self.max_bytes = max_bytes
+        self.sinks = list(sinks or [])
+        self._data = bytearray()
+        self._start = 0  # Absolute offset of self._data[0]
+        self._closed = False
+        self._changed = threading.Condition()
+
+    @property
+    def end(self) -> int:
+        """Absolute offset one past the last byte written"""
+        return self._start + len(self._data)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, data: bytes):
+        """
+        Append a chunk of output
+
+        Args:
+            data: Raw bytes read from the command channel
+        """
+        if not data:
+            return
+        with self._changed:
+            self._data += data
+            overflow = len(self._data) - self.max_bytes
+            if overflow > 0:
+                del self._data[:overflow]
+                self._start += overflow
+            self._changed.notify_all()
+
+        for sink in self.sinks:
+            try:
+                sink(data)
+            except Exception as e:
+                logger.debug(f"Output sink failed: {e}")
+
+    def close(self):
+        """Mark the output as complete and wake up waiting readers"""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    def read(self, since: int = 0, wait: float = 0) -> Dict[str, Any]:
+        """
+        Read output written after an offset
+
+        Args:
+            since: Absolute offset already seen by the caller
+            wait: Seconds to wait for new output if there is none yet
+
+        Returns:
+            Dictionary with data (bytes), offset (next since), truncated and closed
+        """
+        with self._changed:
+            if wait > 0 and since >= self.end and not self._closed:
+                self._changed.wait_for(lambda: self.end > since or self._closed, timeout=wait)
+
+            truncated = since < self._start
+            begin = max(since, self._start) - self._start
+            return {
+                'data': bytes(self._data[begin:]),
+                'offset': self.end,
+                'truncated': truncated,
+                'closed': self._closed
+            }
+
+    def tail(self, size: int) -> bytes:
+        """
+        Get the last bytes written
+
+        Args:
+            size: Maximum number of bytes
+
+        Returns:
+            Up to size most recent bytes
+        """
+        with self._changed:
+            return bytes(self._data[-size:])
+
+
+class LiveOutput:
+    """
+    Registry of per-deployment output buffers
+
+    Buffers of finished deployments are kept so the last output can still be
+    tailed, up to a retention count, oldest evicted first. Follows the Flask
+    extension pattern.
+    """
+
+    def __init__(self, app=None):
+        """Initialize the registry, optionally binding it to an application"""
+        self.max_bytes = 256 * 1024
+        self.retain = 50
+        self._buffers: 'OrderedDict[str, OutputBuffer]' = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Bind the registry to a Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.max_bytes = int(app.config.get('DEPLOY_OUTPUT_BUFFER_BYTES', 256 * 1024))
+        self.retain = int(app.config.get('DEPLOY_OUTPUT_RETAIN', 50))
+        app.extensions['live_output'] = self
+
+    def open(self, deployment_id: str, sinks: Optional[List[Callable[[bytes], None]]] = None) -> OutputBuffer:
+        """
+        Start a fresh buffer for a deployment
+
+        Args:
+            deployment_id: Deployment identifier
+            sinks: Extra callables receiving every chunk written
+
+        Returns:
+            The new OutputBuffer
+        """
+        buffer = OutputBuffer(self.max_bytes, sinks)
+        with self._lock:
+            self._buffers.pop(deployment_id, None)
+            self._buffers[deployment_id] = buffer
+            finished = [key for key, buf in self._buffers.items() if buf.closed]
+            for key in finished[:max(0, len(finished) - self.retain)]:
+                del self._buffers[key]
+        return buffer
+
+    def get(self, deployment_id: str) -> Optional[OutputBuffer]:
+        """
+        Get the buffer of a deployment
+
+        Args:
+            deployment_id: Deployment identifier
+
+        Returns:
+            OutputBuffer or None if no output was captured
+        """
+        with self._lock:
+            return self._buffers.get(deployment_id)
+
+
+class LineLogger:
+    """Log sink that forwards complete lines of output to a logger at DEBUG level"""
+
+    def __init__(self, log: logging.Logger, prefix: str, max_line: int = 500):
+        self.log = log
+        self.prefix = prefix
+        self.max_line = max_line
+        self._partial = b''
+
+    def __call__(self, data: bytes):
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()[-self.max_line:]
+        for line in lines:
+            text = line.rstrip(b'\r').decode(errors='replace')[:self.max_line]
+            if text:
+                self.log.debug(f"{self.prefix}{text}")
+
+
+def stream_command(ssh, command: str, output: Optional[OutputBuffer] = None, chunk_size: int = 32768) -> Dict[str, Any]:
+    """
+    Run a command over SSH, streaming its output as it arrives
+
+    Output is read off the channel continuously, so the remote side never
+    blocks on a full SSH window, and nothing beyond the ring buffer is kept
+    in memory.
+
+    Args:
+        ssh: Connected paramiko.SSHClient
+        command: Shell command
+        output: Buffer receiving the output (a private one is used if omitted)
+        chunk_size: Maximum bytes per read
+
+    Returns:
+        Dictionary with exit_status, seconds and tail (last output as text)
+    """
+    output = output or OutputBuffer()
+    start_offset = output.end
+    start = time.monotonic()
+
+    channel = ssh.get_transport().open_session()
+    try:
+        channel.get_pty()
+        channel.exec_command(command)
+
+        while True:
+            data = channel.recv(chunk_size)
+            if not data:
+                break
+            output.write(data)
+
+        # A pty merges stderr into stdout; drain anything left just in case
+        while channel.recv_stderr_ready():
+            output.write(channel.recv_stderr(chunk_size))
+
+        exit_status = channel.recv_exit_status()
+    finally:
+        channel.close()
+
+    written = output.end - start_offset
+    return {
+        'exit_status': exit_status,
+        'seconds': round(time.monotonic() - start, 3),
+        'tail': output.tail(min(written, 2000)).decode(errors='replace') if written else ''
+    }
@@ -0,0 +1,385 @@
+"""
+Package Cache
+Provisions an nginx caching proxy for apt, npm and pip and points guests at it
+"""
+
+import logging
+import shutil
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from flask import current_app
+from backend.api.terraform_manager import TerraformManager
+from backend.api.live_output import LineLogger
+from backend.extensions import db, inventory, live_output
+from backend.models.package_cache import PackageCache
+from backend.utils.validators import RESERVED_NAME_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Terraform workdir and log name; deployment names cannot take the reserved prefix
+CACHE_NAME = f"{RESERVED_NAME_PREFIX}package-cache"
+
+# Files guest_commands() writes on a guest
+GUEST_CONFIG_FILES = ('/etc/apt/apt.conf.d/01paas-package-cache', '/etc/pip.conf', '/root/.npmrc')
+
+# Plain-HTTP apt mirrors served through the cache; other repositories stay direct
+APT_HOSTS = ('archive.ubuntu.com', 'security.ubuntu.com', 'deb.debian.org', 'security.debian.org')
+
+# nginx cache statuses where the response body came from local disk
+CACHED_STATUSES = ('HIT', 'STALE', 'UPDATING', 'REVALIDATED')
+
+NGINX_CONF = r"""
+proxy_cache_path /var/cache/paas levels=1:2 keys_zone=packages:64m max_size=__MAX_SIZE__ inactive=90d use_temp_path=off;
+
+log_format package_cache '$time_iso8601 $cache_section $upstream_cache_status $body_bytes_sent';
+
+map $host $apt_allowed {
+    default 0;
+__APT_HOSTS__
+}
+
+map $uri $cache_section {
+    ~^/npm/ npm;
+    ~^/pypi/ pip;
+    default apt;
+}
+
+server {
+    listen __PORT__ default_server;
+    resolver __RESOLVER__ valid=300s;
+
+    access_log /var/log/nginx/package-cache.log package_cache;
+    proxy_cache packages;
+    proxy_cache_lock on;
+    proxy_cache_use_stale error timeout updating;
+    proxy_http_version 1.1;
+    proxy_ssl_server_name on;
+    add_header X-Cache-Status $upstream_cache_status;
+
+    # apt: requests arrive as a forward proxy (Acquire::http::Proxy::<host>)
+    location ~ ^/(ubuntu|debian|debian-security)/dists/ {
+        if ($apt_allowed = 0) { return 403; }
+        proxy_pass http://$host$uri$is_args$args;
+        proxy_cache_key $host$uri;
+        proxy_cache_valid 200 5m;
+    }
+
+    location / {
+        if ($apt_allowed = 0) { return 403; }
+        proxy_pass http://$host$uri$is_args$args;
+        proxy_cache_key $host$uri;
+        proxy_cache_valid 200 90d;
+    }
+
+    # npm: package metadata changes, tarballs never do
+    location /npm/ {
+        proxy_pass https://registry.npmjs.org/;
+        proxy_set_header Host registry.npmjs.org;
+        proxy_cache_key npm$uri$http_accept;
+        proxy_cache_valid 200 10m;
+    }
+
+    location ~ ^/npm/.+/-/.+\.tgz$ {
+        rewrite ^/npm/(.*)$ /$1 break;
+        proxy_pass https://registry.npmjs.org;
+        proxy_set_header Host registry.npmjs.org;
+        proxy_cache_key npm$uri;
+        proxy_cache_valid 200 90d;
+    }
+
+    # pip: index pages link to files.pythonhosted.org; rewrite those links to this cache
+    location ^~ /pypi/simple/ {
+        proxy_pass https://pypi.org/simple/;
+        proxy_set_header Host pypi.org;
+        proxy_set_header Accept-Encoding "";
+        proxy_cache_key pypi$uri$http_accept;
+        proxy_cache_valid 200 10m;
+        sub_filter 'https://files.pythonhosted.org/packages/' '/pypi/packages/';
+        sub_filter_once off;
+        sub_filter_types *;
+    }
+
+    location ^~ /pypi/packages/ {
+        proxy_pass https://files.pythonhosted.org/packages/;
+        proxy_set_header Host files.pythonhosted.org;
+        proxy_cache_key pypi$uri;
+        proxy_cache_valid 200 90d;
+    }
+
+    location = /_stats.json {
+        access_log off;
+        alias /var/lib/paas-cache/stats.json;
+    }
+}
+"""
+
+# Summarizes the current and previous access log into /_stats.json every minute
+STATS_SCRIPT = r"""#!/bin/sh
+cat /var/log/nginx/package-cache.log.1 /var/log/nginx/package-cache.log 2>/dev/null | awk -v now="$(date +%s)" '
+{ key = $2 " " $3; n[key]++; b[key] += $4 }
+END {
+    printf "{\"generated_at\": %d, \"entries\": [", now
+    sep = ""
+    for (key in n) {
+        split(key, part, " ")
+        printf "%s{\"section\": \"%s\", \"status\": \"%s\", \"requests\": %d, \"bytes\": %.0f}", sep, part[1], part[2], n[key], b[key]
+        sep = ", "
+    }
+    print "]}"
+}' > /var/lib/paas-cache/stats.json.tmp && mv /var/lib/paas-cache/stats.json.tmp /var/lib/paas-cache/stats.json
+"""
+
+
+def guest_commands(cache_url: Optional[str]) -> List[str]:
+    """
+    Build the commands that point a guest's package managers at the cache
+
+    Each run overwrites the same files, so clones of a golden image pick up
+    the current cache address; without a cache the files are removed, so a
+    retried deployment doesn't keep using a cache that has since gone away.
+
+    Args:
+        cache_url: Base URL of the cache, e.g. http://10.0.0.5:3142, or None
+
+    Returns:
+        List of shell commands
+    """
+    if not cache_url:
+        return [f"rm -f {' '.join(GUEST_CONFIG_FILES)}"]
+
+    host = urlparse(cache_url).hostname
+    apt_lines = ''.join(f'Acquire::http::Proxy::{apt_host} \\"{cache_url}/\\";\\n' for apt_host in APT_HOSTS)
+    return [
+        f'printf "{apt_lines}" > /etc/apt/apt.conf.d/01paas-package-cache && '
+        f"printf '[global]\\nindex-url = {cache_url}/pypi/simple/\\ntrusted-host = {host}\\n' > /etc/pip.conf && "
+        f"printf 'registry={cache_url}/npm/\\n' > /root/.npmrc"
+    ]
+
+
+def cache_setup_commands(port: int, max_size: str) -> List[str]:
+    """
+    Build the commands that turn a stock guest into the package cache
+
+    Args:
+        port: Port nginx listens on
+        max_size: nginx proxy_cache max_size, e.g. '40g'
+
+    Returns:
+        List of shell commands
+    """
+    wait_for_lock = "while fuser /var/lib/dpkg/lock-frontend >/dev/null 2>&1; do sleep 2; done"
+    apt_hosts = '\n'.join(f"    {apt_host} 1;" for apt_host in APT_HOSTS)
+    conf = (
+        NGINX_CONF
+        .replace('__MAX_SIZE__', max_size)
+        .replace('__PORT__', str(port))
+        .replace('__APT_HOSTS__', apt_hosts)
+    )
+    return [
+        f"export DEBIAN_FRONTEND=noninteractive && {wait_for_lock} && apt-get update -y && "
+        f"{wait_for_lock} && apt-get install -y nginx cron",
+        "mkdir -p /var/cache/paas /var/lib/paas-cache && chown www-data /var/cache/paas && "
+        "echo '{\"entries\": []}' > /var/lib/paas-cache/stats.json",
+        f"cat > /etc/nginx/conf.d/package-cache.conf <<'PAAS_EOF'{conf}PAAS_EOF",
+        # nginx needs an explicit resolver for proxy_pass with variables
+        "sed -i \"s/__RESOLVER__/$(awk '/^nameserver/ {print $2; exit}' /etc/resolv.conf)/\" /etc/nginx/conf.d/package-cache.conf && "
+        "rm -f /etc/nginx/sites-enabled/default",
+        f"cat > /usr/local/bin/paas-cache-stats <<'PAAS_EOF'\n{STATS_SCRIPT}PAAS_EOF\n"
+        "chmod +x /usr/local/bin/paas-cache-stats && "
+        "echo '* * * * * root /usr/local/bin/paas-cache-stats' > /etc/cron.d/paas-cache-stats",
+        "nginx -t && systemctl enable nginx cron && systemctl restart nginx cron"
+    ]
+
+
+def summarize_stats(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn the cache's per-status counters into hit ratios
+
+    Args:
+        raw: Parsed /_stats.json from the cache guest
+
+    Returns:
+        Per-section (apt, npm, pip) and total requests, hits, hit_ratio,
+        bytes served and bytes served from cache (WAN bytes saved)
+    """
+    sections: Dict[str, Dict[str, Any]] = {}
+    for entry in raw.get('entries', []):
+        section = sections.setdefault(entry['section'], {
+            'requests': 0, 'hits': 0, 'bytes': 0, 'bytes_from_cache': 0
+        })
+        section['requests'] += entry['requests']
+        section['bytes'] += entry['bytes']
+        if entry['status'] in CACHED_STATUSES:
+            section['hits'] += entry['requests']
+            section['bytes_from_cache'] += entry['bytes']
+
+    total = {'requests': 0, 'hits': 0, 'bytes': 0, 'bytes_from_cache': 0}
+    for section in sections.values():
+        for key in total:
+            total[key] += section[key]
+    for counters in list(sections.values()) + [total]:
+        counters['hit_ratio'] = round(counters['hits'] / counters['requests'], 3) if counters['requests'] else None
+
+    return {
+        'generated_at': raw.get('generated_at'),
+        'sections': sections,
+        'total': total
+    }
+
+
+def fetch_stats(cache_url: str) -> Dict[str, Any]:
+    """
+    Read the hit counters from the cache guest
+
+    Args:
+        cache_url: Base URL of the cache
+
+    Returns:
+        Output of summarize_stats()
+    """
+    # Kept off the startup import path; only this admin endpoint needs an HTTP client
+    import requests
+
+    response = requests.get(f"{cache_url}/_stats.json", timeout=5)
+    response.raise_for_status()
+    return summarize_stats(response.json())
+
+
+def queue_provision() -> Tuple[PackageCache, bool]:
+    """
+    Record a package cache provisioning and hand it to the deployment workers
+
+    Returns:
+        (cache, queued): the new record, or the existing ready or
+        provisioning cache with queued=False
+
+    Raises:
+        QueueFullError: If the deployment queue is full
+    """
+    from backend.extensions import job_queue
+
+    existing = PackageCache.latest()
+    if existing and existing.status in ('provisioning', 'ready'):
+        return existing, False
+
+    cache = PackageCache(status='provisioning', port=current_app.config.get('PACKAGE_CACHE_PORT', 3142))
+    db.session.add(cache)
+    db.session.commit()
+
+    try:
+        job_queue.submit(provision_package_cache, cache.id)
+    except Exception as e:
+        cache.status = 'failed'
+        cache.error_message = str(e)
+        db.session.commit()
+        raise
+
+    logger.info(f"Queued package cache provisioning {cache.id}")
+    return cache, True
+
+
+def provision_package_cache(cache_id: int):
+    """
+    Provision the cache guest and install the caching proxy on it
+
+    Executed by a background worker inside an application context. The
+    guest keeps its Terraform working directory under CACHE_NAME, so
+    destroy_package_cache() can remove it like a deployment.
+
+    Args:
+        cache_id: PackageCache identifier
+    """
+    cache = db.session.get(PackageCache, cache_id)
+    if not cache:
+        logger.error(f"Package cache {cache_id} not found, dropping job")
+        return
+
+    terraform_manager = TerraformManager()
+    output = live_output.open(f"package-cache-{cache.id}", sinks=[LineLogger(logger, f"[{CACHE_NAME}] ")])
+
+    try:
+        # The framework only sets Terraform tags and the port variable
+        framework = next(iter(current_app.config['SUPPORTED_FRAMEWORKS']))
+        tf_config = terraform_manager.generate_config(
+            deployment_type='lxc',
+            framework=framework,
+            name=CACHE_NAME,
+            resources={
+                'cores': current_app.config.get('PACKAGE_CACHE_CORES', 2),
+                'memory': current_app.config.get('PACKAGE_CACHE_MEMORY', 1024),
+                'disk': current_app.config.get('PACKAGE_CACHE_DISK', 50)
+            },
+            deployment_id=f"package-cache-{cache.id}",
+            use_golden_image=False
+        )
+
+        result = terraform_manager.apply(CACHE_NAME, tf_config, output=output)
+        if not result['success']:
+            raise Exception(f"Cache provisioning failed: {result.get('error')}")
+        cache.vm_id = result['vm_id']
+        cache.ip_address = result['ip_address']
+        db.session.commit()
+
+        commands = cache_setup_commands(cache.port, current_app.config.get('PACKAGE_CACHE_MAX_SIZE', '40g'))
+        setup = terraform_manager.run_commands(cache.ip_address, commands, output=output)
+        if not setup['success']:
+            raise Exception(f"Cache setup failed: {setup.get('error')}")
+
+        cache.status = 'ready'
+        cache.ready_at = datetime.utcnow()
+        db.session.commit()
+        inventory.invalidate()
+        logger.info(f"Package cache ready at {cache.url}")
+
+    except Exception as e:
+        logger.error(f"Package cache provisioning failed: {e}", exc_info=True)
+        db.session.rollback()
+        cache.status = 'failed'
+        cache.error_message = str(e)
+        db.session.commit()
+
+    finally:
+        output.close()
+
+
+def destroy_package_cache(cache: PackageCache) -> Dict[str, Any]:
+    """
+    Destroy the cache guest; deployments go back to the public mirrors
+
+    Args:
+        cache: PackageCache to remove
+
+    Returns:
+        Dictionary with success status
+    """
+    terraform_manager = TerraformManager()
+    if (terraform_manager.state_dir / CACHE_NAME / 'terraform.tfvars.json').exists():
+        result = terraform_manager.destroy(CACHE_NAME)
+        if not result['success']:
+            return result
+    else:
+        shutil.rmtree(terraform_manager.state_dir / CACHE_NAME, ignore_errors=True)
+
+    cache.status = 'deleted'
+    db.session.commit()
+    inventory.invalidate()
+    return {
+        'success': True
+    }
+
+
+def active_cache_url() -> Optional[str]:
+    """
+    Get the cache URL guests should use
+
+    Returns:
+        PACKAGE_CACHE_URL if set (an externally run cache), else the ready
+        platform cache, else None; always None when PACKAGE_CACHE_ENABLED is off
+    """
+    if not current_app.config.get('PACKAGE_CACHE_ENABLED', True):
+        return None
+    if current_app.config.get('PACKAGE_CACHE_URL'):
+        return current_app.config['PACKAGE_CACHE_URL'].rstrip('/')
+    cache = PackageCache.active()
+    return cache.url if cache else None
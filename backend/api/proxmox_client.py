@@ -0,0 +1,140 @@
+"""
+Proxmox API Client
+Shared, thread-safe Proxmox API connection reused across requests and workers
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple
+from flask import current_app
+from proxmoxer import ProxmoxAPI
+from proxmoxer.core import AuthenticationError, ResourceException
+
+logger = logging.getLogger(__name__)
+
+_clients_lock = threading.Lock()
+_clients: Dict[Tuple[str, str, str], ProxmoxAPI] = {}
+
+
+def parse_proxmox_host(proxmox_url: str) -> str:
+    """
+    Extract the host name from a Proxmox API URL
+
+    Args:
+        proxmox_url: URL such as https://192.168.1.100:8006/api2/json
+
+    Returns:
+        Host part of the URL
+    """
+    if '://' in proxmox_url:
+        return proxmox_url.split('://')[1].split(':')[0].split('/')[0]
+    return proxmox_url.split(':')[0]
+
+
+def _client_key(config) -> Tuple[str, str, str]:
+    """Identify a client by host and credentials"""
+    return (
+        parse_proxmox_host(config['PROXMOX_URL']),
+        config['PROXMOX_USER'],
+        config['PROXMOX_PASSWORD']
+    )
+
+
+def _connect(config) -> ProxmoxAPI:
+    """
+    Log in to Proxmox and tune the underlying HTTP session
+
+    proxmoxer keeps the auth ticket on the client and renews it before it
+    expires, so the /access/ticket round trip happens once per client rather
+    than once per request. The session is given a connection pool sized for
+    concurrent API requests and deployment workers, with keep-alive.
+    """
+    from requests.adapters import HTTPAdapter
+    from requests.packages.urllib3.exceptions import InsecureRequestWarning
+    import requests
+
+    # Suppress SSL warnings
+    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+
+    host, user, password = _client_key(config)
+    logger.info(f"Connecting to Proxmox at {host} as {user}")
+
+    proxmox = ProxmoxAPI(
+        host,
+        user=user,
+        password=password,
+        verify_ssl=False,
+        timeout=config.get('PROXMOX_TIMEOUT', 10)
+    )
+
+    pool_size = config.get('PROXMOX_POOL_SIZE', 16)
+    session = proxmox._store['session']
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    return proxmox
+
+
+def get_proxmox(config=None) -> ProxmoxAPI:
+    """
+    Get the shared Proxmox API client, logging in on first use
+
+    Args:
+        config: Configuration mapping (defaults to current_app.config)
+
+    Returns:
+        Authenticated ProxmoxAPI instance
+    """
+    config = config if config is not None else current_app.config
+    key = _client_key(config)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _connect(config)
+            _clients[key] = client
+        return client
+
+
+def reset_proxmox(config=None):
+    """
+    Drop the cached client so the next call logs in again
+
+    Args:
+        config: Configuration mapping (defaults to current_app.config)
+    """
+    config = config if config is not None else current_app.config
+    with _clients_lock:
+        _clients.pop(_client_key(config), None)
+
+
+def _is_auth_error(error: Exception) -> bool:
+    """Check whether Proxmox rejected the cached ticket"""
+    if isinstance(error, AuthenticationError):
+        return True
+    return isinstance(error, ResourceException) and error.status_code == 401
+
+
+def with_proxmox(func: Callable[[ProxmoxAPI], Any], config=None) -> Any:
+    """
+    Run func against the shared client, re-authenticating once if needed
+
+    Args:
+        func: Callable receiving the ProxmoxAPI client
+        config: Configuration mapping (defaults to current_app.config)
+
+    Returns:
+        Whatever func returns
+    """
+    config = config if config is not None else current_app.config
+    try:
+        return func(get_proxmox(config))
+    except Exception as e:
+        if not _is_auth_error(e):
+            raise
+        logger.warning(f"Proxmox ticket rejected, logging in again: {e}")
+        reset_proxmox(config)
+        return func(get_proxmox(config))
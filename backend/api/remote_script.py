@@ -0,0 +1,228 @@
+"""
+Remote Script
+Renders deployment commands into one resumable shell script and follows its step markers
+"""
+
+import hashlib
+import logging
+import shlex
+from typing import Callable, Iterable, List, Optional
+from backend.api.live_output import OutputBuffer
+from backend.api.stage_events import StageTimer
+
+logger = logging.getLogger(__name__)
+
+# Lines the script prints around every step: "@@paas-step <index> start|skip|end <exit status>"
+STEP_MARKER = b'@@paas-step '
+
+
+def step_keys(commands: List[str]) -> List[str]:
+    """
+    Get the completion key of every step
+
+    Each key covers the step and all steps before it, so changing one
+    command re-runs it and everything after it.
+
+    Args:
+        commands: Shell commands in order
+
+    Returns:
+        One hex key per command
+    """
+    keys = []
+    digest = hashlib.sha256()
+    for command in commands:
+        digest.update(command.encode() + b'\0')
+        keys.append(digest.copy().hexdigest()[:16])
+    return keys
+
+
+def render_script(
+    commands: List[str],
+    state_dir: str,
+    keys: Optional[List[Optional[str]]] = None,
+    completed: Iterable[str] = ()
+) -> str:
+    """
+    Render commands into a bash script that can be re-run after a failure
+
+    Every command runs in its own subshell, like a separate exec_command
+    would, and stops the script on a non-zero exit status. Completed steps
+    leave a marker file in state_dir and are skipped on the next run; the
+    directory is removed once every step has succeeded.
+
+    Args:
+        commands: Shell commands in order
+        state_dir: Guest directory for the script and its completion markers
+        keys: Completion key per command, None for steps that run every time
+            (defaults to step_keys(commands))
+        completed: Keys already recorded as done elsewhere (the deployment's
+            checkpoints); skipped without looking for a marker file
+
+    Returns:
+        Script source
+    """
+    state = shlex.quote(state_dir)
+    lines = [
+        '#!/bin/bash',
+        '# Deployment steps; completed steps are skipped when the script is run again',
+        f'STATE={state}',
+        'mkdir -p "$STATE"',
+        "marker() { printf '\\n@@paas-step %s\\n' \"$*\"; }",
+        ''
+    ]
+
+    completed = set(completed)
+    for index, (command, key) in enumerate(zip(commands, keys or step_keys(commands)), start=1):
+        if key in completed:
+            lines += [f'marker {index} skip', '']
+            continue
+        if key is None:
+            lines += [
+                f'marker {index} start',
+                '(',
+                command,
+                ')',
+                'status=$?',
+                f'marker {index} end $status',
+                '[ "$status" -eq 0 ] || exit "$status"',
+                ''
+            ]
+            continue
+        lines += [
+            f'if [ -e "$STATE/{key}.done" ]; then',
+            f'  marker {index} skip',
+            'else',
+            f'  marker {index} start',
+            '  (',
+            command,
+            '  )',
+            '  status=$?',
+            f'  marker {index} end $status',
+            '  [ "$status" -eq 0 ] || exit "$status"',
+            f'  touch "$STATE/{key}.done"',
+            'fi',
+            ''
+        ]
+
+    lines.append('rm -rf "$STATE"')
+    return '\n'.join(lines) + '\n'
+
+
+class StepTracker:
+    """
+    Output sink that follows a running script's step markers
+
+    Marker lines are stripped from the output and replaced with the usual
+    ">>> [i/n] command" headers; every step is recorded as a 'command' stage
+    with its exit status, and steps skipped on a re-run as 'skipped'.
+    """
+
+    def __init__(
+        self,
+        commands: List[str],
+        output: OutputBuffer,
+        stages: StageTimer,
+        on_step: Optional[Callable[[int, str], None]] = None,
+        keys: Optional[List[Optional[str]]] = None
+    ):
+        """
+        Initialize the tracker
+
+        Args:
+            commands: Commands the script was rendered from
+            output: Buffer receiving the command output without markers
+            stages: Timer recording one stage per step
+            on_step: Called with (index, step key) for every completed or skipped keyed step
+            keys: Keys the script was rendered with (defaults to step_keys(commands))
+        """
+        self.commands = commands
+        self.keys = keys or step_keys(commands)
+        self.on_step = on_step
+        self.output = output
+        self.stages = stages
+        self.completed = 0
+        self.skipped = 0
+        self.failed: Optional[dict] = None
+        self._current: Optional[tuple] = None  # (index, started, output offset)
+        self._held = b''
+        self._blank = b''
+        self._midline = False
+
+    def __call__(self, data: bytes):
+        """Receive a chunk of raw script output"""
+        data, self._held = self._held + data, b''
+        while data:
+            newline = data.find(b'\n')
+            line = data if newline < 0 else data[:newline + 1]
+
+            if self._midline:
+                self.output.write(line)
+                self._midline = newline < 0
+            elif line in (b'\n', b'\r\n'):
+                # Markers are printed after a newline; only keep it if no marker follows
+                self.output.write(self._blank)
+                self._blank = line
+            elif line.startswith(STEP_MARKER) or (newline < 0 and STEP_MARKER.startswith(line)):
+                if newline < 0:
+                    # Possibly a marker cut in half by the channel, wait for the rest
+                    self._held = line
+                    return
+                self._blank = b''
+                self._marker(line.decode(errors='replace').split()[1:])
+            else:
+                self.output.write(self._blank + line)
+                self._blank = b''
+                self._midline = newline < 0
+
+            data = data[len(line):]
+
+    def abort(self, error: str):
+        """Record the step that was running when the connection failed"""
+        if self._current:
+            index, started, _ = self._current
+            self.stages.record(
+                'command', started, status='failed', index=index,
+                command=self.commands[index - 1][:100], error=error[:500]
+            )
+            self._current = None
+
+    def _marker(self, fields: List[str]):
+        """Handle one parsed "<index> <event> [status]" marker"""
+        index, event = int(fields[0]), fields[1]
+        command = self.commands[index - 1]
+        total = len(self.commands)
+
+        if event == 'skip':
+            self.skipped += 1
+            self.output.write(f">>> [{index}/{total}] {command[:100]} (already done)\n".encode())
+            self.stages.record('command', self.stages.now(), status='skipped', index=index, command=command[:100])
+            if self.on_step and self.keys[index - 1]:
+                self.on_step(index, self.keys[index - 1])
+
+        elif event == 'start':
+            logger.info(f"Executing command {index}/{total}: {command[:100]}...")
+            self.output.write(f">>> [{index}/{total}] {command[:100]}\n".encode())
+            self._current = (index, self.stages.now(), self.output.end)
+
+        elif event == 'end' and self._current:
+            _, started, offset = self._current
+            self._current = None
+            exit_status = int(fields[2])
+            seconds = self.stages.record(
+                'command',
+                started,
+                status='ok' if exit_status == 0 else 'failed',
+                index=index,
+                command=command[:100],
+                exit_status=exit_status
+            )
+            if exit_status == 0:
+                self.completed += 1
+                logger.info(f"Command {index}/{total} finished in {seconds}s")
+                if self.on_step and self.keys[index - 1]:
+                    self.on_step(index, self.keys[index - 1])
+            else:
+                written = self.output.end - offset
+                tail = self.output.tail(min(written, 2000)).decode(errors='replace') if written > 0 else ''
+                self.failed = {'index': index, 'exit_status': exit_status, 'tail': tail}
@@ -3,13 +3,25 @@ API Routes for PaaS Platform
 Handles deployment requests and infrastructure management
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 import logging
 from backend.api.terraform_manager import TerraformManager
+from backend.api.deployment_pipeline import resume_point, run_deployment
+from backend.api.golden_images import queue_build
+from backend.api.package_cache import active_cache_url, destroy_package_cache, fetch_stats, queue_provision
+from backend.api.job_queue import QueueFullError
+from backend.api.proxmox_client import get_proxmox
+from backend.api.deployment_log import parse_since
+from backend.api.events import EVENT_FIELDS
 from backend.utils.validators import validate_deployment_request
 from backend.models.deployment import Deployment, DeploymentStatus
-from backend.extensions import db
-from datetime import datetime
+from backend.models.deployment_checkpoint import STEP_PREFIX, DeploymentCheckpoint
+from backend.models.deployment_event import DeploymentEvent
+from backend.models.golden_image import GoldenImage
+from backend.models.package_cache import PackageCache
+from backend.extensions import db, job_queue, inventory, jump_hosts, live_output, deployment_events, stage_events, stats_cache, stream_slots, vm_ids
+from backend.utils.helpers import parse_bool_arg
+from datetime import datetime, timedelta
 
 # Create blueprint
 api_bp = Blueprint('api', __name__)
@@ -46,7 +58,10 @@ def get_frameworks():
 @api_bp.route('/deploy', methods=['POST'])
 def deploy_application():
     """
-    Deploy a new application
+    Queue a new application deployment
+    
+    The deployment is provisioned and deployed by a background worker;
+    poll GET /api/deployments/<id> to follow its status.
     
     Request body:
         - deployment_type: 'vm' or 'lxc'
@@ -56,7 +71,7 @@ def deploy_application():
         - resources: CPU, memory, disk configuration
     
     Returns:
-        JSON response with deployment status and details
+        202 JSON response with the queued deployment id
     """
     deployment = None
     try:
@@ -102,76 +117,32 @@ def deploy_application():
         db.session.add(deployment)
         db.session.commit()
         
-        logger.info(f"Starting automated deployment: {name} (ID: {deployment.id})")
-        logger.info(f"Framework: {framework}, Type: {deployment_type}, Repo: {github_url}")
-        
-        # Initialize Terraform manager
-        terraform_manager = get_terraform_manager()
-        
-        # Generate Terraform configuration
-        logger.info(f"Generating Terraform configuration...")
-        tf_config = terraform_manager.generate_config(
-            deployment_type=deployment_type,
-            framework=framework,
-            name=name,
-            resources=resources
-        )
-        
-        # Apply Terraform configuration to provision infrastructure
-        logger.info(f"Provisioning {deployment_type.upper()} infrastructure on Proxmox...")
-        deployment.status = DeploymentStatus.PROVISIONING
-        db.session.commit()
-        
-        result = terraform_manager.apply(name, tf_config)
-        
-        if result['success']:
-            deployment.status = DeploymentStatus.DEPLOYING
-            deployment.ip_address = result.get('ip_address')
-            deployment.vm_id = result.get('vm_id')
-            db.session.commit()
-            
-            logger.info(f"Infrastructure provisioned: {deployment_type.upper()} ID {deployment.vm_id}, IP {deployment.ip_address}")
-            logger.info(f"Deploying application via SSH...")
-            
-            # Deploy application directly via SSH
-            deploy_result = terraform_manager.deploy_application(
-                ip_address=deployment.ip_address,
-                framework=framework,
-                github_url=github_url,
-                env_vars=env_vars
-            )
-            
-            if deploy_result['success']:
-                deployment.status = DeploymentStatus.RUNNING
-                deployment.deployed_at = datetime.utcnow()
-                db.session.commit()
-                
-                logger.info(f"Application deployed successfully on {deployment.ip_address}")
-                
-                return jsonify({
-                    'success': True,
-                    'message': 'Application deployed successfully',
-                    'deployment': {
-                        'id': deployment.id,
-                        'name': deployment.name,
-                        'ip_address': deployment.ip_address,
-                        'vm_id': deployment.vm_id,
-                        'status': deployment.status.value,
-                        'framework': framework,
-                        'access_url': deploy_result.get('access_url')
-                    }
-                })
-            else:
-                deployment.status = DeploymentStatus.FAILED
-                deployment.error_message = deploy_result.get('error')
-                db.session.commit()
-                raise Exception(f"Application deployment failed: {deploy_result.get('error')}")
-        
-        else:
+        # Hand the provision -> deploy stages to the background workers
+        try:
+            queue_depth = job_queue.submit(run_deployment, deployment.id, key=deployment.id, env_vars=env_vars)
+        except QueueFullError as e:
+            logger.warning(f"Rejecting deployment {name}: {e}")
             deployment.status = DeploymentStatus.FAILED
-            deployment.error_message = result.get('error')
+            deployment.error_message = str(e)
             db.session.commit()
-            raise Exception(f"Infrastructure provisioning failed: {result.get('error')}")
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 503
+        
+        logger.info(f"Queued deployment {name} (ID: {deployment.id}), {queue_depth} job(s) waiting")
+        
+        return jsonify({
+            'success': True,
+            'message': 'Deployment queued',
+            'deployment': {
+                'id': deployment.id,
+                'name': deployment.name,
+                'status': deployment.status.value,
+                'framework': framework
+            },
+            'queue_depth': queue_depth
+        }), 202
     
     except Exception as e:
         logger.error(f"Deployment error: {e}", exc_info=True)
@@ -193,16 +164,50 @@ def deploy_application():
 @api_bp.route('/deployments', methods=['GET'])
 def list_deployments():
     """
-    List all deployments
+    List deployments, newest first, one page at a time
+    
+    Query parameters: limit (default 50, max 500), cursor (next_cursor of
+    the previous page), status (comma-separated), type, framework,
+    include_deleted and fields (comma-separated projection). Soft-deleted
+    deployments are left out unless asked for.
     
     Returns:
         JSON response with list of deployments
     """
     try:
-        deployments = Deployment.get_all()
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        statuses = [v for v in request.args.get('status', '').split(',') if v]
+        fields = [v for v in request.args.get('fields', '').split(',') if v]
+        
+        valid_statuses = {status.value for status in DeploymentStatus}
+        invalid = [v for v in statuses if v not in valid_statuses]
+        if invalid:
+            return jsonify({
+                'success': False,
+                'error': f"Invalid status: {', '.join(invalid)}"
+            }), 400
+        
+        try:
+            deployments, next_cursor = Deployment.list_page(
+                limit=limit,
+                cursor=request.args.get('cursor') or None,
+                statuses=statuses,
+                deployment_type=request.args.get('type') or None,
+                framework=request.args.get('framework') or None,
+                include_deleted=parse_bool_arg(request.args.get('include_deleted')),
+                fields=fields
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
         return jsonify({
             'success': True,
-            'deployments': [d.to_dict() for d in deployments]
+            'deployments': deployments,
+            'count': len(deployments),
+            'next_cursor': next_cursor
         })
     except Exception as e:
         logger.error(f"Error listing deployments: {e}")
@@ -212,6 +217,79 @@ def list_deployments():
         }), 500
 
 
+def _streams_busy():
+    """503 response for a stream or long-poll refused for lack of a slot"""
+    response = jsonify({
+        'success': False,
+        'error': f"Too many open streams ({stream_slots.limit}), retry in {stream_slots.retry_after}s"
+    })
+    response.headers['Retry-After'] = str(stream_slots.retry_after)
+    return response, 503
+
+
+@api_bp.route('/deployments/events', methods=['GET'])
+def stream_deployment_events():
+    """
+    Stream deployment status changes as Server-Sent Events
+    
+    Each committed transition (pending -> provisioning -> deploying ->
+    running/failed, deletions) is pushed as an ``event: status`` frame.
+    Reconnecting clients send Last-Event-ID and get the events they missed.
+    Every open stream holds a request thread, so beyond STREAM_LIMIT streams
+    the request is turned away with 503 and Retry-After.
+    
+    Returns:
+        text/event-stream response
+    """
+    if not stream_slots.acquire():
+        return _streams_busy()
+    
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    
+    response = Response(
+        stream_with_context(deployment_events.stream(last_event_id)),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+    response.call_on_close(stream_slots.release)
+    return response
+
+
+@api_bp.route('/deployments/stages', methods=['GET'])
+def get_stage_durations():
+    """
+    Duration percentiles per pipeline stage
+    
+    Aggregates successful deployment_events rows from the last ?days=<n>
+    days (default 30) into count, p50, p95 and max seconds per stage.
+    
+    Returns:
+        JSON response with per-stage duration statistics
+    """
+    try:
+        days = request.args.get('days', 30, type=int)
+        if days <= 0:
+            return jsonify({
+                'success': False,
+                'error': 'days must be a positive integer'
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'days': days,
+            'stages': DeploymentEvent.stage_percentiles(days=days)
+        })
+    except Exception as e:
+        logger.error(f"Error computing stage durations: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @api_bp.route('/deployments/<deployment_id>', methods=['GET'])
 def get_deployment(deployment_id):
     """
@@ -272,6 +350,8 @@ def delete_deployment(deployment_id):
             deployment.status = DeploymentStatus.DELETED
             deployment.deleted_at = datetime.utcnow()
             db.session.commit()
+            inventory.invalidate()
+            vm_ids.release(deployment.vm_id)
             
             return jsonify({
                 'success': True,
@@ -293,6 +373,11 @@ def get_deployment_logs(deployment_id):
     """
     Get deployment logs
     
+    Returns the newest part of the log by default. Pass ?offset=<n> from the
+    previous response to fetch only bytes appended since, ?tail=<bytes> for
+    the end of the log, or ?since=<ISO time or epoch> for lines logged after
+    a point in time.
+    
     Args:
         deployment_id: Deployment identifier
     
@@ -307,14 +392,27 @@ def get_deployment_logs(deployment_id):
                 'error': 'Deployment not found'
             }), 404
         
+        try:
+            offset = request.args.get('offset', type=int)
+            tail = request.args.get('tail', type=int)
+            since = parse_since(request.args.get('since'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': f'Invalid since parameter: {e}'
+            }), 400
+        
         # Initialize Terraform manager
         terraform_manager = get_terraform_manager()
         
-        logs = terraform_manager.get_logs(deployment.name)
+        chunk = terraform_manager.get_logs(deployment.name, offset=offset, tail=tail, since=since)
         
         return jsonify({
             'success': True,
-            'logs': logs
+            'logs': chunk['data'].decode(errors='replace'),
+            'offset': chunk['offset'],
+            'size': chunk['size'],
+            'truncated': chunk['truncated']
         })
     except Exception as e:
         logger.error(f"Error fetching logs: {e}")
@@ -324,18 +422,211 @@ def get_deployment_logs(deployment_id):
         }), 500
 
 
+@api_bp.route('/deployments/<deployment_id>/output', methods=['GET'])
+def get_deployment_output(deployment_id):
+    """
+    Tail live command output of a deployment
+    
+    Pass ?offset=<offset> from the previous response to get only new output
+    (a byte offset, as on /logs) and ?wait=<seconds> (max 25) to long-poll
+    until something arrives. A long-poll holds a request thread, so beyond
+    STREAM_LIMIT open streams it is turned away with 503 and Retry-After.
+    
+    Args:
+        deployment_id: Deployment identifier
+    
+    Returns:
+        JSON response with output after the offset and the next offset
+    """
+    try:
+        deployment = Deployment.get_by_id(deployment_id)
+        if not deployment:
+            return jsonify({
+                'success': False,
+                'error': 'Deployment not found'
+            }), 404
+        
+        offset = max(0, request.args.get('offset', 0, type=int))
+        wait = min(max(0.0, request.args.get('wait', 0, type=float)), 25.0)
+        
+        buffer = live_output.get(deployment.id)
+        if buffer is None:
+            return jsonify({
+                'success': True,
+                'output': '',
+                'offset': 0,
+                'truncated': False,
+                'running': False
+            })
+        
+        if wait and not stream_slots.acquire():
+            return _streams_busy()
+        try:
+            chunk = buffer.read(offset, wait=wait)
+        finally:
+            if wait:
+                stream_slots.release()
+        
+        return jsonify({
+            'success': True,
+            'output': chunk['data'].decode(errors='replace'),
+            'offset': chunk['offset'],
+            'truncated': chunk['truncated'],
+            'running': not chunk['closed']
+        })
+    except Exception as e:
+        logger.error(f"Error fetching output: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/deployments/<deployment_id>/timeline', methods=['GET'])
+def get_deployment_timeline(deployment_id):
+    """
+    Get the recorded pipeline stages of a deployment
+    
+    Events are written in batches, so a running deployment's newest stage
+    can show up here a fraction of a second after it finished. The
+    checkpoints and resume_from show where a retry would pick up.
+    
+    Args:
+        deployment_id: Deployment identifier
+    
+    Returns:
+        JSON response with the stage events in order
+    """
+    try:
+        deployment = Deployment.get_by_id(deployment_id)
+        if not deployment:
+            return jsonify({
+                'success': False,
+                'error': 'Deployment not found'
+            }), 404
+        
+        events = [event.to_dict() for event in DeploymentEvent.timeline(deployment.id)]
+        checkpoints = DeploymentCheckpoint.for_deployment(deployment.id)
+        
+        return jsonify({
+            'success': True,
+            'deployment_id': deployment.id,
+            'status': deployment.status.value,
+            'events': events,
+            'count': len(events),
+            'checkpoints': [checkpoint.to_dict() for checkpoint in checkpoints],
+            'resume_from': resume_point({checkpoint.stage: checkpoint.detail for checkpoint in checkpoints})
+        })
+    except Exception as e:
+        logger.error(f"Error fetching timeline: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/deployments/<deployment_id>/retry', methods=['POST'])
+def retry_deployment(deployment_id):
+    """
+    Retry a failed deployment from its first incomplete stage
+    
+    The reserved VM ID, the provisioned guest and the remote steps that
+    already succeeded on it are reused; see run_deployment(). Environment
+    variables are not stored, so pass env_vars again if the deployment had
+    any. A deployment left pending, provisioning or deploying by a worker
+    crash or restart can be retried once no server process has renewed its
+    lease for DEPLOY_LEASE_TIMEOUT seconds.
+    
+    Request body (optional):
+        - env_vars: Environment variables for the application
+    
+    Args:
+        deployment_id: Deployment identifier
+    
+    Returns:
+        202 JSON response with the stage the retry resumes at
+    """
+    try:
+        deployment = Deployment.get_by_id(deployment_id)
+        if not deployment:
+            return jsonify({
+                'success': False,
+                'error': 'Deployment not found'
+            }), 404
+        
+        previous = deployment.status
+        lease_expired_before = datetime.utcnow() - timedelta(seconds=current_app.config.get('DEPLOY_LEASE_TIMEOUT', 120))
+        if job_queue.owns(deployment.id) or not Deployment.claim_retry(deployment.id, lease_expired_before):
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'error': f"Only failed or interrupted deployments can be retried (status: {previous.value})"
+            }), 409
+        
+        data = request.get_json(silent=True) or {}
+        checkpoints = DeploymentCheckpoint.for_deployment(deployment.id)
+        db.session.commit()
+        db.session.refresh(deployment)
+        
+        # The claim was a bulk UPDATE, which the session hooks do not see
+        event = {field: getattr(deployment, field) for field in EVENT_FIELDS}
+        event.update(status=deployment.status.value, previous=previous.value)
+        deployment_events.publish(event)
+        
+        try:
+            queue_depth = job_queue.submit(run_deployment, deployment.id, key=deployment.id, env_vars=data.get('env_vars', {}))
+        except QueueFullError as e:
+            logger.warning(f"Rejecting retry of {deployment.name}: {e}")
+            deployment.status = DeploymentStatus.FAILED
+            deployment.error_message = str(e)
+            db.session.commit()
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 503
+        
+        resume_from = resume_point({checkpoint.stage: checkpoint.detail for checkpoint in checkpoints})
+        logger.info(f"Queued retry of {deployment.name} (ID: {deployment.id}) from {resume_from}")
+        
+        return jsonify({
+            'success': True,
+            'message': 'Deployment retry queued',
+            'deployment': {
+                'id': deployment.id,
+                'name': deployment.name,
+                'status': deployment.status.value
+            },
+            'resume_from': resume_from,
+            'completed_steps': sum(1 for checkpoint in checkpoints if checkpoint.stage.startswith(STEP_PREFIX)),
+            'checkpoints': [checkpoint.to_dict() for checkpoint in checkpoints],
+            'queue_depth': queue_depth
+        }), 202
+    
+    except Exception as e:
+        logger.error(f"Error retrying deployment: {e}", exc_info=True)
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @api_bp.route('/stats', methods=['GET'])
 def get_statistics():
     """
     Get platform statistics
     
+    Served from a short-TTL cache that every status change invalidates.
+    
     Returns:
         JSON response with platform statistics
     """
     try:
-        total_deployments = Deployment.count_all()
-        running_deployments = Deployment.count_by_status(DeploymentStatus.RUNNING)
-        failed_deployments = Deployment.count_by_status(DeploymentStatus.FAILED)
+        stats = stats_cache.get(Deployment.aggregate_stats)
+        
+        total_deployments = stats['total']
+        running_deployments = stats['by_status'][DeploymentStatus.RUNNING.value]
+        failed_deployments = stats['by_status'][DeploymentStatus.FAILED.value]
         
         return jsonify({
             'success': True,
@@ -343,7 +634,12 @@ def get_statistics():
                 'total_deployments': total_deployments,
                 'running_deployments': running_deployments,
                 'failed_deployments': failed_deployments,
-                'success_rate': (running_deployments / total_deployments * 100) if total_deployments > 0 else 0
+                'success_rate': (running_deployments / total_deployments * 100) if total_deployments > 0 else 0,
+                'by_status': stats['by_status'],
+                'by_framework': stats['by_framework'],
+                'by_type': stats['by_type'],
+                'durations': stats['durations'],
+                'cache_age': stats['cache_age']
             }
         })
     except Exception as e:
@@ -354,78 +650,254 @@ def get_statistics():
         }), 500
 
 
+@api_bp.route('/diagnostics', methods=['GET'])
+def get_diagnostics():
+    """
+    Get the internal state of this server process's shared components
+    
+    Counters are per process; with several server workers each answers
+    for itself.
+    
+    Returns:
+        JSON response with one section per component
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'diagnostics': {
+                'vm_ids': vm_ids.stats(),
+                'jump_hosts': jump_hosts.stats(),
+                'stage_events': stage_events.stats(),
+                'deployment_events': deployment_events.stats()
+            }
+        })
+    except Exception as e:
+        logger.error(f"Error fetching diagnostics: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/golden-images', methods=['GET'])
+def list_golden_images():
+    """
+    List golden image builds, newest first
+    
+    Returns:
+        JSON response with the images and the setup version each language is at
+    """
+    try:
+        terraform_manager = get_terraform_manager()
+        languages = sorted({f['language'] for f in current_app.config['SUPPORTED_FRAMEWORKS'].values()})
+        
+        return jsonify({
+            'success': True,
+            'images': [image.to_dict() for image in GoldenImage.list_all()],
+            'current_versions': {language: terraform_manager.bake_version(language) for language in languages}
+        })
+    except Exception as e:
+        logger.error(f"Error listing golden images: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/golden-images', methods=['POST'])
+def build_golden_image():
+    """
+    Queue a golden image build
+    
+    Request body:
+        - language: Framework language ('nodejs', 'python', 'php')
+        - deployment_type: 'vm' or 'lxc'
+        - force: Rebuild even if a template for the current setup exists
+    
+    Returns:
+        202 JSON response with the queued build, or 200 with the existing
+        ready image or build in progress
+    """
+    try:
+        data = request.get_json() or {}
+        language = data.get('language')
+        deployment_type = data.get('deployment_type', 'lxc')
+        
+        languages = {f['language'] for f in current_app.config['SUPPORTED_FRAMEWORKS'].values()}
+        if language not in languages:
+            return jsonify({
+                'success': False,
+                'error': f"language must be one of: {', '.join(sorted(languages))}"
+            }), 400
+        if deployment_type not in ('vm', 'lxc'):
+            return jsonify({
+                'success': False,
+                'error': "deployment_type must be 'vm' or 'lxc'"
+            }), 400
+        
+        try:
+            image, queued = queue_build(language, deployment_type, force=bool(data.get('force')))
+        except QueueFullError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'queued': queued,
+            'image': image.to_dict()
+        }), 202 if queued else 200
+    
+    except Exception as e:
+        logger.error(f"Error queueing golden image build: {e}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/package-cache', methods=['GET'])
+def get_package_cache():
+    """
+    Get the package cache guests use and its hit ratios
+    
+    Returns:
+        JSON response with the cache record, the URL guests are pointed at
+        and per-ecosystem (apt, npm, pip) hit ratios and bytes saved
+    """
+    try:
+        cache = PackageCache.latest()
+        url = active_cache_url()
+        
+        stats, stats_error = None, None
+        if url:
+            try:
+                stats = fetch_stats(url)
+            except Exception as e:
+                stats_error = str(e)
+        
+        return jsonify({
+            'success': True,
+            'cache': cache.to_dict() if cache else None,
+            'url': url,
+            'stats': stats,
+            'stats_error': stats_error
+        })
+    except Exception as e:
+        logger.error(f"Error fetching package cache: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/package-cache', methods=['POST'])
+def provision_package_cache():
+    """
+    Queue provisioning of the package cache guest
+    
+    Returns:
+        202 JSON response with the queued cache, or 200 with the existing one
+    """
+    try:
+        try:
+            cache, queued = queue_provision()
+        except QueueFullError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'queued': queued,
+            'cache': cache.to_dict()
+        }), 202 if queued else 200
+    
+    except Exception as e:
+        logger.error(f"Error queueing package cache: {e}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/package-cache', methods=['DELETE'])
+def delete_package_cache():
+    """
+    Destroy the package cache guest; new deployments use the public mirrors
+    
+    Returns:
+        JSON response with deletion status
+    """
+    try:
+        cache = PackageCache.latest()
+        if not cache:
+            return jsonify({
+                'success': False,
+                'error': 'No package cache'
+            }), 404
+        if cache.status == 'provisioning':
+            return jsonify({
+                'success': False,
+                'error': 'Package cache is still being provisioned'
+            }), 409
+        
+        result = destroy_package_cache(cache)
+        if not result['success']:
+            raise Exception(f"Failed to destroy package cache: {result.get('error')}")
+        vm_ids.release(cache.vm_id)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Package cache deleted'
+        })
+    
+    except Exception as e:
+        logger.error(f"Error deleting package cache: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @api_bp.route('/proxmox/resources', methods=['GET'])
 def get_proxmox_resources():
     """
     Get all VMs and LXC containers from Proxmox
     
+    Served from the cluster inventory snapshot; pass ?fresh=1 for a live read.
+    
     Returns:
         JSON response with Proxmox resources
     """
     try:
-        from proxmoxer import ProxmoxAPI
-        import requests
-        from requests.packages.urllib3.exceptions import InsecureRequestWarning
-        requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-        
-        proxmox_url = current_app.config['PROXMOX_URL']
-        
-        # Parse host from URL
-        if '://' in proxmox_url:
-            host = proxmox_url.split('://')[1].split(':')[0]
-        else:
-            host = proxmox_url.split(':')[0]
-        
-        # Connect to Proxmox API
-        proxmox = ProxmoxAPI(
-            host,
-            user=current_app.config['PROXMOX_USER'],
-            password=current_app.config['PROXMOX_PASSWORD'],
-            verify_ssl=False,
-            timeout=10
-        )
-        
         node = current_app.config['PROXMOX_NODE']
-        resources = []
         
-        # Get QEMU VMs
-        try:
-            qemu_vms = proxmox.nodes(node).qemu.get()
-            for vm in qemu_vms:
-                resources.append({
-                    'vmid': vm.get('vmid'),
-                    'name': vm.get('name', f"VM-{vm.get('vmid')}"),
-                    'type': 'vm',
-                    'status': vm.get('status'),
-                    'cpu': vm.get('cpus', 0),
-                    'memory': vm.get('maxmem', 0) // (1024 * 1024),  # Convert to MB
-                    'disk': vm.get('maxdisk', 0) // (1024 * 1024 * 1024),  # Convert to GB
-                    'uptime': vm.get('uptime', 0)
-                })
-        except Exception as e:
-            logger.warning(f"Could not fetch QEMU VMs: {e}")
+        guests = inventory.guests(node, fresh=parse_bool_arg(request.args.get('fresh')))
         
-        # Get LXC containers
-        try:
-            lxc_containers = proxmox.nodes(node).lxc.get()
-            for ct in lxc_containers:
-                resources.append({
-                    'vmid': ct.get('vmid'),
-                    'name': ct.get('name', f"CT-{ct.get('vmid')}"),
-                    'type': 'lxc',
-                    'status': ct.get('status'),
-                    'cpu': ct.get('cpus', 0),
-                    'memory': ct.get('maxmem', 0) // (1024 * 1024),  # Convert to MB
-                    'disk': ct.get('maxdisk', 0) // (1024 * 1024 * 1024),  # Convert to GB
-                    'uptime': ct.get('uptime', 0)
-                })
-        except Exception as e:
-            logger.warning(f"Could not fetch LXC containers: {e}")
+        resources = []
+        for guest in guests:
+            is_lxc = guest.get('type') == 'lxc'
+            resources.append({
+                'vmid': guest.get('vmid'),
+                'name': guest.get('name', f"{'CT' if is_lxc else 'VM'}-{guest.get('vmid')}"),
+                'type': 'lxc' if is_lxc else 'vm',
+                'status': guest.get('status'),
+                'cpu': guest.get('maxcpu', 0),
+                'memory': guest.get('maxmem', 0) // (1024 * 1024),  # Convert to MB
+                'disk': guest.get('maxdisk', 0) // (1024 * 1024 * 1024),  # Convert to GB
+                'uptime': guest.get('uptime', 0)
+            })
         
         return jsonify({
             'success': True,
             'resources': resources,
-            'count': len(resources)
+            'count': len(resources),
+            'snapshot_age': inventory.age()
         })
         
     except Exception as e:
@@ -448,27 +920,7 @@ def sync_proxmox_resources():
         JSON response with sync results
     """
     try:
-        from proxmoxer import ProxmoxAPI
-        import requests
-        from requests.packages.urllib3.exceptions import InsecureRequestWarning
-        requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-        
-        proxmox_url = current_app.config['PROXMOX_URL']
-        
-        # Parse host from URL
-        if '://' in proxmox_url:
-            host = proxmox_url.split('://')[1].split(':')[0]
-        else:
-            host = proxmox_url.split(':')[0]
-        
-        # Connect to Proxmox API
-        proxmox = ProxmoxAPI(
-            host,
-            user=current_app.config['PROXMOX_USER'],
-            password=current_app.config['PROXMOX_PASSWORD'],
-            verify_ssl=False,
-            timeout=10
-        )
+        proxmox = get_proxmox()
         
         node = current_app.config['PROXMOX_NODE']
         
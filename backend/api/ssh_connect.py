@@ -0,0 +1,233 @@
+"""
+SSH Connect
+Readiness probing and key-authenticated sessions to freshly provisioned guests
+"""
+
+import logging
+import random
+import socket
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SSHWaitTimeout(Exception):
+    """Raised when the guest does not accept SSH before the deadline"""
+
+
+def read_banner(sock, timeout: float) -> bool:
+    """
+    Check that the peer speaks SSH by reading its identification string
+
+    Args:
+        sock: Connected socket or paramiko channel
+        timeout: Seconds to wait for the banner
+
+    Returns:
+        True if the peer sent an ``SSH-`` banner
+    """
+    sock.settimeout(timeout)
+    data = b''
+    while len(data) < 4:
+        chunk = sock.recv(4 - len(data))
+        if not chunk:
+            return False
+        data += chunk
+    return data == b'SSH-'
+
+
+class SSHConnector:
+    """
+    Wait for sshd on a guest, then open one authenticated session
+
+    Readiness is checked with a TCP connect plus banner read, which costs a
+    single round trip and no key exchange. Probes back off exponentially with
+    jitter up to a deadline. When a jump transport is given, probes and the
+    final session all ride direct-tcpip channels over that one transport; if
+    it dies while probing, renew_jump is asked for a replacement.
+    """
+
+    def __init__(
+        self,
+        ip_address: str,
+        username: str,
+        key_filename: str,
+        port: int = 22,
+        jump_transport=None,
+        renew_jump: Optional[Callable[[], Any]] = None,
+        timeout: float = 300,
+        probe_timeout: float = 3,
+        initial_delay: float = 0.5,
+        max_delay: float = 5.0,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the connector
+
+        Args:
+            ip_address: Guest IP address
+            username: SSH user on the guest
+            key_filename: Private key used for authentication
+            port: SSH port on the guest
+            jump_transport: Optional paramiko Transport to tunnel through
+            renew_jump: Optional callable returning a live transport once jump_transport died
+            timeout: Overall deadline in seconds
+            probe_timeout: Socket timeout for a single probe
+            initial_delay: First backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay
+            sleep: Sleep function (overridable for tests)
+        """
+        self.ip_address = ip_address
+        self.username = username
+        self.key_filename = key_filename
+        self.port = port
+        self.jump_transport = jump_transport
+        self.renew_jump = renew_jump
+        self.timeout = timeout
+        self.probe_timeout = probe_timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+
+    def _open_socket(self):
+        """Open a raw stream to the guest's SSH port"""
+        if self.jump_transport is not None:
+            return self.jump_transport.open_channel(
+                'direct-tcpip',
+                (self.ip_address, self.port),
+                ('127.0.0.1', 0),
+                timeout=self.probe_timeout
+            )
+        return socket.create_connection((self.ip_address, self.port), timeout=self.probe_timeout)
+
+    def probe(self) -> bool:
+        """
+        Check once whether sshd answers on the guest
+
+        Returns:
+            True if the port is open and the peer sent an SSH banner
+        """
+        sock = None
+        try:
+            sock = self._open_socket()
+            return read_banner(sock, self.probe_timeout)
+        except Exception as e:
+            logger.debug(f"SSH probe to {self.ip_address}:{self.port} failed: {e}")
+            return False
+        finally:
+            if sock is not None:
+                try:
+                    sock.close()
+                except Exception:
+                    pass
+
+    def _check_jump(self):
+        """Replace the jump transport if it is no longer active"""
+        if self.jump_transport is None or self.jump_transport.is_active() or self.renew_jump is None:
+            return
+        logger.warning(f"Jump transport died while waiting for SSH on {self.ip_address}; leasing a new one")
+        self.jump_transport = self.renew_jump()
+
+    def _backoff(self, attempt: int, deadline: float) -> bool:
+        """Sleep before the next attempt; return False once the deadline passed"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        delay = min(self.max_delay, self.initial_delay * (2 ** (attempt - 1)))
+        self.sleep(min(random.uniform(delay / 2, delay), remaining))
+        return True
+
+    def connect(self) -> Dict[str, Any]:
+        """
+        Wait for sshd and open an authenticated session
+
+        A full login is only attempted after a probe succeeded. If the login
+        itself fails (e.g. cloud-init has not installed the key yet) probing
+        resumes until the deadline.
+
+        Returns:
+            Dictionary with client (paramiko.SSHClient), attempts, logins and seconds
+
+        Raises:
+            SSHWaitTimeout: If no session could be opened before the deadline
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        attempt = 0
+        logins = 0
+        last_error = None
+
+        while True:
+            attempt += 1
+            try:
+                self._check_jump()
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Could not lease a new jump transport: {e}")
+            if self.probe():
+                logins += 1
+                try:
+                    client = self._login()
+                    seconds = round(time.monotonic() - start, 3)
+                    logger.info(
+                        f"SSH session to {self.ip_address} ready after {attempt} probe(s), "
+                        f"{logins} login(s), {seconds}s"
+                    )
+                    return {'client': client, 'attempts': attempt, 'logins': logins, 'seconds': seconds}
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"SSH login to {self.ip_address} failed after successful probe: {e}")
+
+            if not self._backoff(attempt, deadline):
+                break
+
+        detail = f": {last_error}" if last_error else ""
+        raise SSHWaitTimeout(
+            f"SSH on {self.ip_address} not ready within {self.timeout}s ({attempt} probes, {logins} logins){detail}"
+        )
+
+    def _login(self):
+        """Open a key-authenticated paramiko session"""
+        import paramiko
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        sock = self._open_socket() if self.jump_transport is not None else None
+        try:
+            client.connect(
+                self.ip_address,
+                port=self.port,
+                username=self.username,
+                key_filename=self.key_filename,
+                sock=sock,
+                timeout=10,
+                look_for_keys=False,
+                allow_agent=False
+            )
+        except Exception:
+            client.close()
+            if sock is not None:
+                sock.close()
+            raise
+        return client
+
+
+def open_jump_client(host: str, username: str, password: str, timeout: float = 10):
+    """
+    Log in to the SSH jump host
+
+    Args:
+        host: Jump host address
+        username: Jump host user
+        password: Jump host password
+
+    Returns:
+        Connected paramiko.SSHClient
+    """
+    import paramiko
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(host, username=username, password=password, timeout=timeout)
+    return client
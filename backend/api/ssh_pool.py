@@ -0,0 +1,202 @@
+"""
+SSH Jump Host Pool
+Process-wide pool of authenticated jump-host transports shared by deployments
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+from backend.api.ssh_connect import open_jump_client
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledTransport:
+    """Book-keeping for one logged-in jump-host connection"""
+
+    def __init__(self, client):
+        self.client = client
+        self.leases = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def transport(self):
+        return self.client.get_transport()
+
+    def is_healthy(self) -> bool:
+        """Check that the transport is still up"""
+        transport = self.transport
+        return transport is not None and transport.is_active()
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
+class JumpLease:
+    """One deployment's hold on a pooled jump-host transport"""
+
+    def __init__(self, pool: 'JumpHostPool', pooled: _PooledTransport):
+        self._pool = pool
+        self._pooled = pooled
+
+    @property
+    def transport(self):
+        """Currently leased paramiko Transport"""
+        return self._pooled.transport
+
+    def renew(self):
+        """
+        Swap a transport that died for a healthy one
+
+        The dead transport is evicted from the pool and the lease moves to
+        the least-loaded live transport, logging in again if none is left.
+
+        Returns:
+            Active paramiko Transport
+        """
+        dead = self._pooled
+        self._pooled = self._pool._checkout()
+        self._pool._checkin(dead)
+        return self.transport
+
+
+class JumpHostPool:
+    """
+    Shared, keep-alive SSH connections to the jump host
+
+    Each deployment leases a transport and opens its direct-tcpip channels
+    on it; SSH multiplexes many channels per transport, so concurrent
+    deployments share a handful of logins instead of one each. Transports
+    are health-checked on lease, kept alive with SSH keepalives and closed
+    once they have been idle past the idle timeout.
+    """
+
+    def __init__(self, app=None, connect: Callable[..., Any] = open_jump_client):
+        """Initialize the pool, optionally binding it to an application"""
+        self.app = None
+        self.max_size = 4
+        self.max_leases = 8
+        self.keepalive = 30
+        self.idle_timeout = 300
+        self._connect = connect
+        self._pool: List[_PooledTransport] = []
+        self._opening = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Bind the pool to a Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.max_size = max(1, int(app.config.get('SSH_JUMP_POOL_SIZE', 4)))
+        self.max_leases = max(1, int(app.config.get('SSH_JUMP_MAX_LEASES', 8)))
+        self.keepalive = int(app.config.get('SSH_JUMP_KEEPALIVE', 30))
+        self.idle_timeout = float(app.config.get('SSH_JUMP_IDLE_TIMEOUT', 300))
+        app.extensions['jump_host_pool'] = self
+
+    def _open(self) -> _PooledTransport:
+        """Log in to the jump host and enable keepalives"""
+        config = self.app.config
+        host = config['SSH_JUMP_HOST']
+        logger.info(f"Opening pooled SSH connection to jump host {host}")
+        client = self._connect(host, config.get('SSH_JUMP_USER', 'root'), config.get('SSH_JUMP_PASSWORD', ''))
+        pooled = _PooledTransport(client)
+        if self.keepalive > 0:
+            pooled.transport.set_keepalive(self.keepalive)
+        return pooled
+
+    def _evict(self):
+        """Drop dead transports and close idle ones (caller holds the lock)"""
+        now = time.monotonic()
+        keep = []
+        for pooled in self._pool:
+            if not pooled.is_healthy():
+                logger.info("Dropping dead jump-host transport")
+                pooled.close()
+            elif pooled.leases == 0 and now - pooled.last_used > self.idle_timeout:
+                logger.info("Closing idle jump-host transport")
+                pooled.close()
+            else:
+                keep.append(pooled)
+        self._pool = keep
+
+    def _checkout(self) -> _PooledTransport:
+        """Pick the least-loaded healthy transport, opening one if useful"""
+        with self._changed:
+            while True:
+                self._evict()
+                candidates = [p for p in self._pool if p.leases < self.max_leases]
+                if candidates or (self._pool and len(self._pool) + self._opening >= self.max_size):
+                    pooled = min(candidates or self._pool, key=lambda p: p.leases)
+                    pooled.leases += 1
+                    return pooled
+                if len(self._pool) + self._opening < self.max_size:
+                    self._opening += 1
+                    break
+                # Every slot is still logging in; wait for one to land
+                self._changed.wait()
+
+        # Log in outside the lock so a slow handshake does not block other leases
+        pooled = None
+        try:
+            pooled = self._open()
+            pooled.leases += 1
+            return pooled
+        finally:
+            with self._changed:
+                self._opening -= 1
+                if pooled is not None:
+                    self._pool.append(pooled)
+                self._changed.notify_all()
+
+    def _checkin(self, pooled: _PooledTransport):
+        with self._lock:
+            pooled.leases -= 1
+            pooled.last_used = time.monotonic()
+            self._evict()
+
+    @contextmanager
+    def lease(self):
+        """
+        Borrow a jump-host transport for the duration of a deployment
+
+        Yields:
+            JumpLease whose transport direct-tcpip channels are opened on
+        """
+        held = JumpLease(self, self._checkout())
+        try:
+            yield held
+        finally:
+            self._checkin(held._pooled)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics
+
+        Returns:
+            Dictionary with open transports and active leases
+        """
+        with self._lock:
+            return {
+                'transports': len(self._pool),
+                'leases': sum(p.leases for p in self._pool),
+                'max_size': self.max_size
+            }
+
+    def close(self):
+        """Close every pooled transport"""
+        with self._lock:
+            for pooled in self._pool:
+                pooled.close()
+            self._pool = []
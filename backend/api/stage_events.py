@@ -0,0 +1,195 @@
+"""
+Deployment Stage Events
+Times pipeline stages and writes them to the deployment_events table in batches
+"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """
+    Record stage boundaries of one deployment run
+
+    Offsets come from time.monotonic() relative to the start of the run, so
+    durations are unaffected by wall-clock adjustments. Every finished stage
+    is handed to the sink (normally StageEventWriter.record); the timer
+    never blocks on the database.
+    """
+
+    def __init__(
+        self,
+        deployment_id: Optional[str] = None,
+        sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the timer
+
+        Args:
+            deployment_id: Deployment the events belong to
+            sink: Callable receiving each event row (events are only kept in memory if omitted)
+            clock: Monotonic clock, injectable for tests
+        """
+        self.deployment_id = deployment_id
+        self.sink = sink
+        self.clock = clock
+        self.origin = clock()
+        self.events: List[Dict[str, Any]] = []
+
+    def now(self) -> float:
+        """Current monotonic time, to be passed back to record()"""
+        return self.clock()
+
+    def record(self, stage: str, started: float, status: str = 'ok', **detail) -> float:
+        """
+        Record a stage that began at `started` and ends now
+
+        Args:
+            stage: Stage name
+            started: Value of now() when the stage began
+            status: 'ok' or 'failed'
+            **detail: Extra JSON-serializable details
+
+        Returns:
+            Duration in seconds, rounded to milliseconds
+        """
+        duration = round(self.clock() - started, 3)
+        row = {
+            'deployment_id': self.deployment_id,
+            'stage': stage,
+            'status': status,
+            'offset_seconds': round(started - self.origin, 3),
+            'duration_seconds': duration,
+            'created_at': datetime.utcnow(),
+            'detail': detail or None
+        }
+        self.events.append(row)
+        if self.sink and self.deployment_id:
+            self.sink(row)
+        return duration
+
+
+class StageEventWriter:
+    """
+    Batch writer for deployment_events rows
+
+    record() only appends to an in-memory queue; a background thread
+    inserts whatever has accumulated every flush interval (or as soon as a
+    batch fills) with one executemany INSERT, so the pipeline pays no
+    database round trip per stage. The thread starts on the first record().
+    """
+
+    def __init__(self, app=None):
+        """Initialize the writer, optionally binding it to an application"""
+        self.app = None
+        self.flush_interval = 0.5
+        self.batch_size = 100
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self.written = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Bind the writer to a Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.flush_interval = float(app.config.get('DEPLOYMENT_TIMELINE_FLUSH_INTERVAL', 0.5))
+        self.batch_size = max(1, int(app.config.get('DEPLOYMENT_TIMELINE_BATCH_SIZE', 100)))
+        app.extensions['stage_events'] = self
+
+    def record(self, row: Dict[str, Any]):
+        """
+        Queue one event row for the next batch
+
+        Args:
+            row: Column values of a DeploymentEvent
+        """
+        self._queue.put(row)
+        self._ensure_thread()
+        self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write every queued row now, in the calling thread
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        # Rows only leave the queue under the lock, so a flush also waits
+        # for a batch the background thread is writing
+        with self._write_lock:
+            while True:
+                rows = self._drain()
+                if not rows:
+                    return written
+                self._write(rows)
+                written += len(rows)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get writer statistics
+
+        Returns:
+            Dictionary with pending and written row counts
+        """
+        return {'pending': self._queue.qsize(), 'written': self.written}
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='stage-event-writer', daemon=True)
+                self._thread.start()
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        rows = []
+        while len(rows) < self.batch_size:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # Let the batch fill up unless it already has
+            if self._queue.qsize() < self.batch_size:
+                time.sleep(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to write deployment events: {e}")
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        from backend.extensions import db
+        from backend.models.deployment_event import DeploymentEvent
+
+        with self.app.app_context():
+            try:
+                db.session.execute(DeploymentEvent.__table__.insert(), rows)
+                db.session.commit()
+                self.written += len(rows)
+            except Exception:
+                db.session.rollback()
+                raise
+            finally:
+                db.session.remove()
@@ -0,0 +1,82 @@
+"""
+Stats Cache
+Short-lived cache of the aggregate deployment statistics served by /api/stats
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCache:
+    """
+    TTL cache in front of Deployment.aggregate_stats()
+
+    The index and dashboard pages poll /api/stats; within the TTL they share
+    one computed result, and concurrent misses share one query. Any committed
+    status change (see DeploymentEvents) invalidates the cache immediately.
+    """
+
+    def __init__(self, app=None):
+        """Initialize the cache, optionally binding it to an application"""
+        self.ttl = 10.0
+        self._value: Optional[Dict[str, Any]] = None
+        self._computed_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Bind the cache to a Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.ttl = float(app.config.get('STATS_CACHE_TTL', 10))
+        app.extensions['stats_cache'] = self
+
+    def get(self, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the statistics, computing them if the cached copy is missing or expired
+
+        Args:
+            compute: Callable running the aggregate queries
+
+        Returns:
+            Statistics dictionary with cache_age in seconds
+        """
+        value = self._fresh_value()
+        if value is not None:
+            return value
+
+        with self._lock:
+            value = self._fresh_value()
+            if value is not None:
+                return value
+
+            generation = self._generation
+            result = compute()
+            # Keep the result only if nothing changed while it was computed
+            if generation == self._generation:
+                self._value = result
+                self._computed_at = time.monotonic()
+            return dict(result, cache_age=0.0)
+
+    def _fresh_value(self) -> Optional[Dict[str, Any]]:
+        value, computed_at = self._value, self._computed_at
+        if value is None:
+            return None
+        age = time.monotonic() - computed_at
+        if age > self.ttl:
+            return None
+        return dict(value, cache_age=round(age, 3))
+
+    def invalidate(self, *args):
+        """Drop the cached statistics (usable as an event callback)"""
+        self._generation += 1
+        self._value = None
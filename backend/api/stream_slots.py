@@ -0,0 +1,55 @@
+"""
+Stream Slots
+Caps how many request threads long-lived responses (SSE, long-poll) may hold
+"""
+
+import threading
+
+
+class StreamSlots:
+    """
+    Counting limit on open streaming responses in this process
+
+    An SSE stream or a long-poll keeps its request thread busy for as long
+    as it is open. Capping them below GUNICORN_THREADS keeps threads free for
+    the rest of the API; a request that gets no slot is answered with 503
+    and a Retry-After of STREAM_RETRY_AFTER seconds.
+    """
+
+    def __init__(self, app=None):
+        """Initialize the limit, optionally binding it to an application"""
+        self.limit = 24
+        self.retry_after = 15
+        self._in_use = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Bind the limit to a Flask application
+
+        Args:
+            app: Flask application instance
+        """
+        self.limit = max(0, int(app.config.get('STREAM_LIMIT', 24)))
+        self.retry_after = int(app.config.get('STREAM_RETRY_AFTER', 15))
+        app.extensions['stream_slots'] = self
+
+    def acquire(self) -> bool:
+        """
+        Take a slot without waiting
+
+        Returns:
+            True if a slot was taken; release() it when the response ends
+        """
+        with self._lock:
+            if self._in_use >= self.limit:
+                return False
+            self._in_use += 1
+            return True
+
+    def release(self):
+        """Give back a slot taken with acquire()"""
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
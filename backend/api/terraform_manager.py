@@ -3,31 +3,92 @@ Terraform Manager
 Handles Terraform configuration generation and execution
 """
 
+import io
 import os
 import json
+import hashlib
 import logging
 from pathlib import Path
 from python_terraform import Terraform, IsFlagged
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 from flask import current_app
 import uuid
-from proxmoxer import ProxmoxAPI
+from backend.api.proxmox_client import get_proxmox
+from backend.api.ip_waiter import IPWaiter
+from backend.api.ssh_connect import SSHConnector
+from backend.api.live_output import OutputBuffer, stream_command
+from backend.api.remote_script import StepTracker, render_script, step_keys
+from backend.api.deployment_log import LOG_FILE_NAME, read_log
+from backend.api.stage_events import StageTimer
+from backend.extensions import db, jump_hosts, vm_ids
+from backend.models.golden_image import GoldenImage
+import shutil
+import threading
+from contextlib import nullcontext
 import time
 import re
 
 logger = logging.getLogger(__name__)
 
+# Terraform files copied into every per-deployment working directory
+TERRAFORM_CONFIG_GLOBS = ('*.tf', '.terraform.lock.hcl')
+
+# Shared, initialized .terraform data directories live under <terraform_dir>/INIT_DIR_NAME/<fingerprint>
+INIT_DIR_NAME = '.terraform-init'
+INIT_MARKER = '.fingerprint'
+_init_lock = threading.Lock()
+
+# Process-wide limit on concurrent terraform applies (see TERRAFORM_MAX_PARALLEL)
+_apply_slots_lock = threading.Lock()
+_apply_slots: Optional[threading.BoundedSemaphore] = None
+_apply_slots_size = 0
+
+
+def _get_apply_slots(limit: int) -> threading.BoundedSemaphore:
+    """
+    Get the shared semaphore bounding concurrent applies
+    
+    Args:
+        limit: Maximum number of applies allowed to run at once
+    
+    Returns:
+        Process-wide BoundedSemaphore sized to limit
+    """
+    global _apply_slots, _apply_slots_size
+    with _apply_slots_lock:
+        if _apply_slots is None or _apply_slots_size != limit:
+            _apply_slots = threading.BoundedSemaphore(limit)
+            _apply_slots_size = limit
+        return _apply_slots
+
 
 class TerraformManager:
     """Manages Terraform operations for infrastructure provisioning"""
     
-    def __init__(self, terraform_dir=None, state_dir=None):
+    def __init__(self, terraform_dir=None, state_dir=None, max_parallel=None, plugin_cache_dir=None):
         """Initialize Terraform manager"""
+        from flask import has_app_context
         if terraform_dir is None:
             from flask import current_app
             terraform_dir = Path(current_app.config['TERRAFORM_DIR'])
             state_dir = Path(current_app.config['TERRAFORM_STATE_DIR'])
         
+        if max_parallel is None:
+            max_parallel = current_app.config.get('TERRAFORM_MAX_PARALLEL', 4) if has_app_context() else 4
+        self.max_parallel = max(1, int(max_parallel))
+        
+        # Process-wide provider plugin cache shared by every terraform init
+        if plugin_cache_dir is None and has_app_context():
+            plugin_cache_dir = current_app.config.get('TERRAFORM_PLUGIN_CACHE_DIR')
+        if plugin_cache_dir and 'TF_PLUGIN_CACHE_DIR' not in os.environ:
+            plugin_cache_dir = Path(plugin_cache_dir).absolute()
+            plugin_cache_dir.mkdir(parents=True, exist_ok=True)
+            os.environ['TF_PLUGIN_CACHE_DIR'] = str(plugin_cache_dir)
+        
+        # Optional Terraform debug logging; it goes to stderr, which lands in the deployment log
+        if has_app_context() and current_app.config.get('TERRAFORM_LOG_LEVEL') and 'TF_LOG' not in os.environ:
+            os.environ['TF_LOG'] = current_app.config['TERRAFORM_LOG_LEVEL']
+        
         self.terraform_dir = Path(terraform_dir) if terraform_dir else Path('./terraform')
         self.state_dir = Path(state_dir) if state_dir else Path('./terraform/states')
         self.ssh_keys_dir = Path('./ssh_keys')
@@ -44,11 +105,140 @@ class TerraformManager:
         elif project_tf.exists():
             terraform_exe = str(project_tf.absolute())
         
+        self.terraform_exe = terraform_exe
+        
+        # Shared config directory (only used for legacy workspace-based state)
         self.tf = Terraform(
             working_dir=str(self.terraform_dir),
             terraform_bin_path=terraform_exe
         )
     
+    def _prepare_workdir(self, deployment_name: str) -> Path:
+        """
+        Create an isolated Terraform working directory for a deployment
+        
+        Each deployment gets its own copy of the Terraform configuration and
+        keeps its local state next to it, so concurrent applies never share
+        a selected workspace or .terraform/environment file.
+        
+        Args:
+            deployment_name: Name of the deployment
+        
+        Returns:
+            Path to the deployment working directory
+        """
+        workdir = self.state_dir / deployment_name
+        workdir.mkdir(parents=True, exist_ok=True)
+        
+        for pattern in TERRAFORM_CONFIG_GLOBS:
+            for source in self.terraform_dir.glob(pattern):
+                shutil.copy2(source, workdir / source.name)
+        
+        return workdir
+    
+    def _config_fingerprint(self) -> str:
+        """
+        Hash the Terraform configuration and provider lock file
+        
+        Returns:
+            Short hex digest that changes whenever init must be re-run
+        """
+        digest = hashlib.sha256()
+        for pattern in TERRAFORM_CONFIG_GLOBS:
+            for path in sorted(self.terraform_dir.glob(pattern)):
+                digest.update(path.name.encode())
+                digest.update(b'\0')
+                digest.update(path.read_bytes())
+        return digest.hexdigest()[:16]
+    
+    def _ensure_initialized(self) -> Dict[str, Any]:
+        """
+        Run terraform init once per configuration fingerprint
+        
+        The first caller for a fingerprint initializes a shared directory
+        (downloading providers into the plugin cache); every later apply
+        reuses its .terraform data without running init again. The directory
+        is initialized under a temporary name and renamed into place, so a
+        partially initialized directory is never reused, even across processes.
+        
+        Returns:
+            Dictionary with fingerprint, cache_hit, seconds and data_dir
+        """
+        start = time.monotonic()
+        fingerprint = self._config_fingerprint()
+        init_dir = self.terraform_dir / INIT_DIR_NAME / fingerprint
+        
+        with _init_lock:
+            cache_hit = init_dir.is_dir()
+            if not cache_hit:
+                logger.info(f"Running terraform init for configuration {fingerprint}")
+                staging_dir = init_dir.with_name(f"{fingerprint}.{uuid.uuid4().hex[:8]}")
+                staging_dir.mkdir(parents=True)
+                for pattern in TERRAFORM_CONFIG_GLOBS:
+                    for source in self.terraform_dir.glob(pattern):
+                        shutil.copy2(source, staging_dir / source.name)
+                
+                return_code, stdout, stderr = self._terraform_for(staging_dir).init(
+                    capture_output=True
+                )
+                
+                if return_code != 0:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+                    raise Exception(f"Terraform init failed: {stderr}")
+                
+                (staging_dir / '.terraform').mkdir(exist_ok=True)
+                (staging_dir / '.terraform' / INIT_MARKER).write_text(fingerprint)
+                try:
+                    os.replace(staging_dir, init_dir)
+                except OSError:
+                    # Another process finished initializing the same fingerprint first
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+        
+        seconds = round(time.monotonic() - start, 3)
+        logger.info(f"Terraform init for {fingerprint}: {'cache hit' if cache_hit else 'initialized'} in {seconds}s")
+        
+        return {
+            'fingerprint': fingerprint,
+            'cache_hit': cache_hit,
+            'seconds': seconds,
+            'data_dir': init_dir / '.terraform'
+        }
+    
+    def _seed_workdir(self, workdir: Path, init_info: Dict[str, Any]):
+        """
+        Copy the shared .terraform data into a deployment working directory
+        
+        Provider binaries in the data directory are symlinks into the plugin
+        cache where the platform supports it, so the copy is cheap.
+        
+        Args:
+            workdir: Deployment working directory
+            init_info: Result of _ensure_initialized()
+        """
+        data_dir = workdir / '.terraform'
+        marker = data_dir / INIT_MARKER
+        if marker.exists() and marker.read_text() == init_info['fingerprint']:
+            return
+        
+        if data_dir.exists():
+            shutil.rmtree(data_dir)
+        shutil.copytree(init_info['data_dir'], data_dir, symlinks=True)
+    
+    def _terraform_for(self, workdir: Path) -> Terraform:
+        """
+        Get a Terraform wrapper bound to a deployment working directory
+        
+        Args:
+            workdir: Deployment working directory
+        
+        Returns:
+            Terraform instance running commands in workdir
+        """
+        return Terraform(
+            working_dir=str(workdir),
+            terraform_bin_path=self.terraform_exe
+        )
+    
     def _ensure_ssh_keypair(self) -> tuple[Path, Path]:
         """
         Ensure SSH keypair exists, generate if needed
@@ -82,7 +272,11 @@ class TerraformManager:
         deployment_type: str,
         framework: str,
         name: str,
-        resources: Dict[str, Any]
+        resources: Dict[str, Any],
+        deployment_id: Optional[str] = None,
+        use_golden_image: bool = True,
+        vm_id: Optional[int] = None,
+        golden_image_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Generate Terraform configuration for deployment
@@ -92,21 +286,29 @@ class TerraformManager:
             framework: Framework identifier
             name: Deployment name
             resources: Resource specifications (CPU, memory, disk)
+            deployment_id: Deployment the reserved VM ID is recorded for
+            use_golden_image: Clone from the language's golden image if one is ready
+            vm_id: ID already reserved for the deployment (a new one is allocated if omitted)
+            golden_image_id: Clone from exactly this golden image, e.g. when resuming
         
         Returns:
-            Dictionary containing Terraform configuration
+            Dictionary containing Terraform configuration; 'golden_image' is
+            the template cloned from, or None for a stock OS install
         """
+        allocated = None
         try:
-            # Generate unique VM ID
-            vm_id = self._generate_vm_id()
-            
             # Get framework configuration
             framework_config = current_app.config['SUPPORTED_FRAMEWORKS'].get(framework)
             if not framework_config:
                 raise ValueError(f"Unsupported framework: {framework}")
             
-            # Sanitize name for hostname (DNS compliant: replace underscores with hyphens)
-            sanitized_name = name.replace('_', '-').lower()
+            # Reserve a unique VM ID, unless resuming with the one reserved before
+            if vm_id is None:
+                vm_id = allocated = vm_ids.allocate(deployment_id)
+            
+            # Sanitize name for hostname (DNS compliant: replace underscores with hyphens,
+            # no leading or trailing hyphen, e.g. for the reserved _paas- infrastructure names)
+            sanitized_name = name.replace('_', '-').strip('-').lower()
             
             # Ensure SSH keypair exists
             private_key_path, public_key_path = self._ensure_ssh_keypair()
@@ -156,72 +358,88 @@ class TerraformManager:
                 tf_vars['vm_template'] = current_app.config.get('VM_TEMPLATE', 'ubuntu-22-cloudinit')
                 tf_vars['iso_image'] = current_app.config['VM_ISOS'].get('ubuntu-22.04', '')
             
+            # Clone from a golden image whose baked setup matches the current commands
+            golden_image = None
+            if golden_image_id is not None:
+                golden_image = db.session.get(GoldenImage, golden_image_id)
+            elif use_golden_image and current_app.config.get('GOLDEN_IMAGES_ENABLED', True):
+                language = framework_config['language']
+                golden_image = GoldenImage.current(language, deployment_type, self.bake_version(language))
+            if golden_image:
+                tf_vars['clone_template_id'] = golden_image.vm_id
+                tf_vars['clone_node'] = golden_image.node or tf_vars['proxmox_node']
+                tf_vars['clone_full'] = not current_app.config.get('GOLDEN_IMAGE_LINKED_CLONE', True)
+                logger.info(f"Cloning {name} from golden image {golden_image.vm_id} ({golden_image.language} {golden_image.version})")
+            
             return {
                 'variables': tf_vars,
-                'deployment_type': deployment_type
+                'deployment_type': deployment_type,
+                'golden_image': golden_image.to_dict() if golden_image else None
             }
         
         except Exception as e:
             logger.error(f"Error generating Terraform config: {e}")
+            # Nothing will be provisioned with it; don't hold the ID until the reservation expires
+            if allocated is not None:
+                vm_ids.release(allocated)
             raise
     
-    def apply(self, deployment_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    def apply(
+        self,
+        deployment_name: str,
+        config: Dict[str, Any],
+        output: Optional[OutputBuffer] = None,
+        stages: Optional[StageTimer] = None
+    ) -> Dict[str, Any]:
         """
         Apply Terraform configuration to create infrastructure
         
         Args:
             deployment_name: Name of the deployment
             config: Terraform configuration
+            output: Optional buffer receiving Terraform stdout/stderr
+            stages: Optional timer recording terraform_init/plan/apply and ip_acquired
         
         Returns:
             Dictionary with success status and deployment details
         """
+        stages = stages or StageTimer()
+        slots = _get_apply_slots(self.max_parallel)
+        slots.acquire()
+        # Stage in progress, recorded as failed if an exception escapes it
+        stage, stage_start = 'terraform_init', stages.now()
         try:
             logger.info(f"Applying Terraform for {deployment_name}")
             
-            # Create state directory for this deployment
-            deployment_state_dir = self.state_dir / deployment_name
-            deployment_state_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Initialize Terraform
-            return_code, stdout, stderr = self.tf.init(
-                capture_output=True
-            )
-            
-            if return_code != 0:
-                raise Exception(f"Terraform init failed: {stderr}")
+            # Isolated working directory (config copy + local state) for this deployment
+            deployment_state_dir = self._prepare_workdir(deployment_name)
+            tf = self._terraform_for(deployment_state_dir)
             
-            # Create or select workspace for this deployment
-            # Check if workspace exists
-            return_code, stdout, stderr = self.tf.cmd('workspace', 'list', capture_output=True)
-            workspace_exists = deployment_name in (stdout.decode() if isinstance(stdout, bytes) else stdout)
+            # Per-stage durations in seconds, reported with the result
+            timings = {}
             
-            if not workspace_exists:
-                # Create new workspace
-                logger.info(f"Creating Terraform workspace: {deployment_name}")
-                return_code, stdout, stderr = self.tf.cmd('workspace', 'new', deployment_name, capture_output=True)
-                if return_code != 0:
-                    raise Exception(f"Failed to create workspace: {stderr}")
-            else:
-                # Select existing workspace
-                logger.info(f"Selecting Terraform workspace: {deployment_name}")
-                return_code, stdout, stderr = self.tf.cmd('workspace', 'select', deployment_name, capture_output=True)
-                if return_code != 0:
-                    raise Exception(f"Failed to select workspace: {stderr}")
+            # Initialize Terraform (once per configuration, shared by all deployments)
+            init_info = self._ensure_initialized()
+            timings['init'] = init_info['seconds']
+            self._seed_workdir(deployment_state_dir, init_info)
+            self._record(output, f"terraform init ({'cached' if init_info['cache_hit'] else 'ran'}, {init_info['fingerprint']})")
+            stages.record(stage, stage_start, cache_hit=init_info['cache_hit'])
+            stage, stage_start = 'terraform_plan', stages.now()
             
             # Prepare variables file
             var_file = deployment_state_dir / 'terraform.tfvars.json'
             with open(var_file, 'w') as f:
                 json.dump(config['variables'], f, indent=2)
             
-            # Convert to relative path from terraform directory
-            relative_var_file = var_file.relative_to(self.terraform_dir).as_posix()
+            # Variables file lives in the working directory
+            relative_var_file = var_file.name
             
             # Plan
-            return_code, stdout, stderr = self.tf.plan(
+            return_code, stdout, stderr = tf.plan(
                 var_file=relative_var_file,
                 capture_output=True
             )
+            self._record(output, 'terraform plan', stdout, stderr)
             
             # Terraform plan returns 0 for no changes, 2 for changes planned, 1 for error
             if return_code == 1:
@@ -236,14 +454,16 @@ class TerraformManager:
                     resource_addr = "proxmox_lxc.deployment_lxc[0]" if config['deployment_type'] == 'lxc' else "proxmox_vm_qemu.deployment_vm[0]"
                     
                     logger.info(f"Removing {resource_addr} from state...")
-                    self.tf.cmd('state', 'rm', resource_addr, capture_output=True)
+                    _, rm_stdout, rm_stderr = tf.cmd('state', 'rm', resource_addr, capture_output=True)
+                    self._record(output, f"terraform state rm {resource_addr}", rm_stdout, rm_stderr)
                     
                     # Retry plan
                     logger.info("Retrying Terraform plan...")
-                    return_code, stdout, stderr = self.tf.plan(
+                    return_code, stdout, stderr = tf.plan(
                         var_file=relative_var_file,
                         capture_output=True
                     )
+                    self._record(output, 'terraform plan (retry)', stdout, stderr)
                     
                     if return_code == 1:
                         # If still failing, raise error
@@ -257,14 +477,17 @@ class TerraformManager:
                     logger.error(f"STDERR: {error_msg}")
                     raise Exception(f"Terraform plan failed: {error_msg}\nOutput: {stdout_msg}")
             
+            timings['plan'] = stages.record(stage, stage_start, changes=return_code == 2)
             logger.info(f"Terraform plan succeeded. Resources to {'add' if return_code == 2 else 'maintain'}")
             
             # Apply
-            return_code, stdout, stderr = self.tf.apply(
+            stage, stage_start = 'terraform_apply', stages.now()
+            return_code, stdout, stderr = tf.apply(
                 var_file=relative_var_file,
                 skip_plan=True,
                 capture_output=True
             )
+            self._record(output, 'terraform apply', stdout, stderr)
             
             if return_code != 0:
                 error_msg = stderr.decode() if isinstance(stderr, bytes) else stderr
@@ -274,8 +497,11 @@ class TerraformManager:
                 logger.error(f"STDERR: {error_msg}")
                 raise Exception(f"Terraform apply failed: {error_msg}\nOutput: {stdout_msg}")
             
+            timings['apply'] = stages.record(stage, stage_start)
+            
             # Get outputs
-            outputs = self.tf.output(json=IsFlagged)
+            stage, stage_start = 'ip_acquired', stages.now()
+            outputs = tf.output(json=IsFlagged)
             
             vm_id = outputs.get('vm_id', {}).get('value')
             ip_address = outputs.get('ip_address', {}).get('value')
@@ -283,24 +509,40 @@ class TerraformManager:
             # If IP is not resolved (for LXC with DHCP), get it from Proxmox
             # Check for various "pending" states from Terraform output
             if ip_address in ['Check Proxmox Console', 'pending', 'Pending (Check Dashboard)', None] or not ip_address:
-                logger.info(f"IP not in outputs (value: {ip_address}), fetching from Proxmox for VM/LXC ID {vm_id}")
-                ip_address = self._get_ip_from_proxmox(vm_id, config['deployment_type'])
+                logger.info(f"IP not in outputs (value: {ip_address}), waiting for VM/LXC ID {vm_id} to report one")
+                ip_info = self._wait_for_ip(vm_id, config['deployment_type'])
+                ip_address = ip_info['ip']
+                timings['ip_wait'] = ip_info['seconds']
+                stages.record(stage, stage_start, source=ip_info['source'], attempts=ip_info['attempts'])
+            else:
+                timings['ip_wait'] = 0.0
+                stages.record(stage, stage_start, source='terraform')
             
-            logger.info(f"Terraform applied successfully for {deployment_name}. IP: {ip_address}")
+            logger.info(f"Terraform applied successfully for {deployment_name}. IP: {ip_address}, timings: {timings}")
             
             return {
                 'success': True,
                 'ip_address': ip_address,
                 'vm_id': vm_id,
-                'outputs': outputs
+                'outputs': outputs,
+                'init': {
+                    'fingerprint': init_info['fingerprint'],
+                    'cache_hit': init_info['cache_hit'],
+                    'seconds': init_info['seconds']
+                },
+                'timings': timings
             }
         
         except Exception as e:
             logger.error(f"Error applying Terraform: {e}")
+            stages.record(stage, stage_start, status='failed', error=str(e)[:500])
             return {
                 'success': False,
                 'error': str(e)
             }
+        
+        finally:
+            slots.release()
     
     def destroy(self, deployment_name: str) -> Dict[str, Any]:
         """
@@ -321,37 +563,24 @@ class TerraformManager:
             if not var_file.exists():
                 raise Exception(f"No Terraform state found for {deployment_name}")
             
-            # Select the workspace for this deployment
-            logger.info(f"Selecting Terraform workspace: {deployment_name}")
-            return_code, stdout, stderr = self.tf.cmd('workspace', 'select', deployment_name, capture_output=True)
-            if return_code != 0:
-                raise Exception(f"Failed to select workspace: {stderr}")
-            
-            # Convert to relative path
-            relative_var_file = var_file.relative_to(self.terraform_dir).as_posix()
-            
-            # Destroy using direct command to ensure -auto-approve is used (not deprecated -force)
-            return_code, stdout, stderr = self.tf.cmd(
-                'destroy',
-                f'-var-file={relative_var_file}',
-                '-auto-approve',
-                capture_output=True
-            )
-            
-            if return_code != 0:
-                raise Exception(f"Terraform destroy failed: {stderr}")
-            
-            logger.info(f"Infrastructure destroyed for {deployment_name}")
-            
-            # Switch back to default workspace
-            self.tf.cmd('workspace', 'select', 'default', capture_output=True)
-            
-            # Delete the workspace
-            logger.info(f"Deleting Terraform workspace: {deployment_name}")
-            self.tf.cmd('workspace', 'delete', deployment_name, capture_output=True)
+            if any(deployment_state_dir.glob('*.tf')):
+                # Isolated working directory: state lives next to the config copy
+                tf = self._terraform_for(deployment_state_dir)
+                return_code, stdout, stderr = tf.cmd(
+                    'destroy',
+                    f'-var-file={var_file.name}',
+                    '-auto-approve',
+                    capture_output=True
+                )
+                
+                if return_code != 0:
+                    raise Exception(f"Terraform destroy failed: {stderr}")
+                
+                logger.info(f"Infrastructure destroyed for {deployment_name}")
+            else:
+                self._destroy_legacy_workspace(deployment_name, var_file)
             
             # Clean up state directory
-            import shutil
             shutil.rmtree(deployment_state_dir)
             
             return {
@@ -365,163 +594,318 @@ class TerraformManager:
                 'error': str(e)
             }
     
+    def _destroy_legacy_workspace(self, deployment_name: str, var_file: Path):
+        """
+        Destroy a deployment created before per-deployment working directories
+        
+        Those deployments keep their state in a named workspace of the shared
+        Terraform directory.
+        
+        Args:
+            deployment_name: Name of the deployment (and of its workspace)
+            var_file: Path to the deployment variables file
+        """
+        # Select the workspace for this deployment
+        logger.info(f"Selecting Terraform workspace: {deployment_name}")
+        return_code, stdout, stderr = self.tf.cmd('workspace', 'select', deployment_name, capture_output=True)
+        if return_code != 0:
+            raise Exception(f"Failed to select workspace: {stderr}")
+        
+        # Convert to relative path
+        relative_var_file = var_file.relative_to(self.terraform_dir).as_posix()
+        
+        # Destroy using direct command to ensure -auto-approve is used (not deprecated -force)
+        return_code, stdout, stderr = self.tf.cmd(
+            'destroy',
+            f'-var-file={relative_var_file}',
+            '-auto-approve',
+            capture_output=True
+        )
+        
+        if return_code != 0:
+            raise Exception(f"Terraform destroy failed: {stderr}")
+        
+        logger.info(f"Infrastructure destroyed for {deployment_name}")
+        
+        # Switch back to default workspace
+        self.tf.cmd('workspace', 'select', 'default', capture_output=True)
+        
+        # Delete the workspace
+        logger.info(f"Deleting Terraform workspace: {deployment_name}")
+        self.tf.cmd('workspace', 'delete', deployment_name, capture_output=True)
+    
     def deploy_application(
         self,
         ip_address: str,
         framework: str,
         github_url: str,
-        env_vars: Optional[Dict[str, str]] = None
+        env_vars: Optional[Dict[str, str]] = None,
+        output: Optional[OutputBuffer] = None,
+        stages: Optional[StageTimer] = None,
+        baked: bool = False,
+        package_cache_url: Optional[str] = None,
+        on_step: Optional[Callable[[int, str], None]] = None,
+        completed_steps: Optional[list] = None
     ) -> Dict[str, Any]:
         """
         Deploy application on provisioned infrastructure via SSH
         
         Supports SSH jump host (routing through Proxmox) for cross-network deployments.
+        Command output is streamed into the given buffer as it is produced.
         
         Args:
             ip_address: IP address of the VM/LXC
             framework: Framework identifier
             github_url: GitHub repository URL
             env_vars: Optional environment variables for the application
+            output: Optional ring buffer receiving live command output
+            stages: Optional timer recording ssh_ready and one command stage per command
+            baked: The guest was cloned from a golden image, skip system setup
+            package_cache_url: Route apt/npm/pip downloads through this cache
+            on_step: Called with (index, step key) after each command succeeds
+            completed_steps: Step keys already completed on this guest, skipped
         
         Returns:
             Dictionary with success status
         """
         try:
-            logger.info(f"Deploying application from {github_url} on {ip_address}")
-            
-            import paramiko
-            import time
+            logger.info(f"Deploying application from {github_url} on {ip_address}{' (golden image)' if baked else ''}")
             
             # Get framework config
             framework_config = current_app.config['SUPPORTED_FRAMEWORKS'].get(framework)
             if not framework_config:
                 raise ValueError(f"Unsupported framework: {framework}")
             
+            # Build deployment commands based on framework
+            commands = self._build_deployment_commands(framework, framework_config, github_url, env_vars, baked=baked)
+            
+            # Point apt, npm and pip at the platform cache (or away from a gone one) on every
+            # attempt, outside the resumable steps, so the cache coming or going doesn't reset them
+            from backend.api.package_cache import guest_commands
+            preamble = guest_commands(package_cache_url)
+        
+        except Exception as e:
+            logger.error(f"Error deploying application: {e}", exc_info=True)
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        
+        result = self.run_commands(
+            ip_address, commands, output=output, stages=stages,
+            on_step=on_step, preamble=preamble, completed_steps=completed_steps
+        )
+        if not result['success']:
+            return result
+        
+        logger.info(f"Application deployed successfully on {ip_address}")
+        
+        return {
+            'success': True,
+            'message': 'Application deployed successfully',
+            'access_url': f"http://{ip_address}:{framework_config['port']}"
+        }
+    
+    def run_commands(
+        self,
+        ip_address: str,
+        commands: list,
+        output: Optional[OutputBuffer] = None,
+        stages: Optional[StageTimer] = None,
+        on_step: Optional[Callable[[int, str], None]] = None,
+        preamble: Optional[list] = None,
+        completed_steps: Optional[list] = None
+    ) -> Dict[str, Any]:
+        """
+        Run shell commands on a guest over SSH, stopping at the first failure
+        
+        Args:
+            ip_address: IP address of the VM/LXC
+            commands: Shell commands, run one after another
+            output: Optional ring buffer receiving live command output
+            stages: Optional timer recording ssh_ready and one command stage per command
+            on_step: Called with (index, step key) after each command succeeds
+            preamble: Idempotent setup commands run first on every attempt; they have
+                no step key, are never skipped and don't affect the keys of commands
+            completed_steps: Keys (see remote_script.step_keys) of commands already
+                completed on this guest, e.g. from deployment checkpoints; skipped
+        
+        Returns:
+            Dictionary with success status
+        """
+        preamble = list(preamble or [])
+        keys = [None] * len(preamble) + step_keys(commands)
+        commands = preamble + list(commands)
+        completed = set(completed_steps or ())
+        ssh = None
+        stages = stages or StageTimer()
+        stage, stage_start = 'ssh_ready', stages.now()
+        try:
             # SSH credentials - use key-based auth
             ssh_user = current_app.config.get('SSH_USER', 'root')
             private_key_path, _ = self._ensure_ssh_keypair()
             
-            # Check if jump host is configured
+            # Check if jump host is configured; deployments share pooled, keep-alive transports
             jump_host = current_app.config.get('SSH_JUMP_HOST', '')
-            
-            # Wait for SSH to be ready
-            logger.info(f"Waiting for SSH to be ready on {ip_address}")
-            max_retries = 30
-            ssh = None
-            
-            for i in range(max_retries):
-                try:
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    
-                    if jump_host:
-                        # Use Proxmox as SSH jump host
-                        logger.info(f"Using SSH jump host: {jump_host}")
-                        jump_user = current_app.config.get('SSH_JUMP_USER', 'root')
-                        jump_password = current_app.config.get('SSH_JUMP_PASSWORD', '')
-                        
-                        # Connect to jump host (Proxmox)
-                        jump_client = paramiko.SSHClient()
-                        jump_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                        jump_client.connect(
-                            jump_host,
-                            username=jump_user,
-                            password=jump_password,
-                            timeout=10
-                        )
-                        
-                        # Create a channel to the target through the jump host
-                        jump_transport = jump_client.get_transport()
-                        dest_addr = (ip_address, 22)
-                        local_addr = ('127.0.0.1', 0)
-                        channel = jump_transport.open_channel('direct-tcpip', dest_addr, local_addr)
-                        
-                        # Connect to target VM through the channel
-                        ssh.connect(
-                            ip_address,
-                            username=ssh_user,
-                            key_filename=str(private_key_path),
-                            sock=channel,
-                            timeout=10,
-                            look_for_keys=False,
-                            allow_agent=False
-                        )
-                        logger.info(f"SSH connection established to {ip_address} via jump host {jump_host}")
-                    else:
-                        # Direct connection (same network)
-                        ssh.connect(
-                            ip_address, 
-                            username=ssh_user, 
-                            key_filename=str(private_key_path),
-                            timeout=10,
-                            look_for_keys=False,
-                            allow_agent=False
-                        )
-                        logger.info(f"SSH connection established to {ip_address} (direct)")
-                    break
-                except Exception as e:
-                    if i == max_retries - 1:
-                        raise Exception(f"SSH connection failed after {max_retries} attempts: {e}")
-                    logger.warning(f"SSH connection attempt {i+1} failed: {e}")
-                    time.sleep(10)
-            
-            # Build deployment commands based on framework
-            commands = self._build_deployment_commands(framework, framework_config, github_url, env_vars)
-            
-            # Execute commands
-            for idx, cmd in enumerate(commands):
-                logger.info(f"Executing command {idx+1}/{len(commands)}: {cmd[:100]}...")
-                stdin, stdout, stderr = ssh.exec_command(cmd, get_pty=True)
-                exit_status = stdout.channel.recv_exit_status()
-                
-                output = stdout.read().decode()
-                error = stderr.read().decode()
+            if jump_host:
+                logger.info(f"Using SSH jump host: {jump_host}")
+            
+            with (jump_hosts.lease() if jump_host else nullcontext()) as jump_lease:
+                # Wait for SSH to be ready
+                logger.info(f"Waiting for SSH to be ready on {ip_address}")
+                connector = SSHConnector(
+                    ip_address,
+                    username=ssh_user,
+                    key_filename=str(private_key_path),
+                    jump_transport=jump_lease.transport if jump_lease else None,
+                    renew_jump=jump_lease.renew if jump_lease else None,
+                    timeout=current_app.config.get('SSH_WAIT_TIMEOUT', 300),
+                    probe_timeout=current_app.config.get('SSH_PROBE_TIMEOUT', 3),
+                    initial_delay=current_app.config.get('SSH_WAIT_INITIAL_DELAY', 0.5),
+                    max_delay=current_app.config.get('SSH_WAIT_MAX_DELAY', 5)
+                )
+                connection = connector.connect()
+                ssh = connection['client']
+                stages.record(stage, stage_start, attempts=connection['attempts'])
+                stage = None
+                logger.info(f"SSH connection established to {ip_address} ({'via jump host ' + jump_host if jump_host else 'direct'})")
                 
-                if exit_status != 0:
-                    logger.error(f"Command failed with exit code {exit_status}: {error}")
-                    raise Exception(f"Deployment command failed: {error}")
-                
-                logger.info(f"Command output: {output[:200]}...")
-            
-            ssh.close()
-            logger.info(f"Application deployed successfully on {ip_address}")
+                # Execute commands, streaming output instead of buffering it until exit
+                output = output or OutputBuffer(current_app.config.get('DEPLOY_OUTPUT_BUFFER_BYTES', 256 * 1024))
+                if current_app.config.get('DEPLOY_BATCH_SCRIPT', True):
+                    self._run_script(ssh, commands, keys, completed, output, stages, on_step)
+                else:
+                    self._run_each(ssh, commands, keys, completed, output, stages, on_step)
             
             return {
-                'success': True,
-                'message': 'Application deployed successfully',
-                'access_url': f"http://{ip_address}:{framework_config['port']}"
+                'success': True
             }
         
         except Exception as e:
-            logger.error(f"Error deploying application: {e}", exc_info=True)
+            logger.error(f"Error running commands on {ip_address}: {e}", exc_info=True)
+            if stage:
+                stages.record(stage, stage_start, status='failed', error=str(e)[:500])
             return {
                 'success': False,
                 'error': str(e)
             }
+        
+        finally:
+            if ssh:
+                ssh.close()
     
-    def _build_deployment_commands(
-        self,
-        framework: str,
-        framework_config: Dict[str, Any],
-        github_url: str,
-        env_vars: Optional[Dict[str, str]] = None
-    ) -> list:
-        """Build deployment commands based on framework type"""
+    def _run_script(
+        self, ssh, commands: list, keys: list, completed: set,
+        output: OutputBuffer, stages: StageTimer, on_step=None
+    ):
+        """
+        Run commands as one uploaded script in a single SSH channel
         
-        language = framework_config['language']
-        port = framework_config['port']
+        The script is rendered by backend.api.remote_script, uploaded over
+        SFTP and executed once; its step markers are turned back into one
+        command stage per step. Steps in completed, and steps an earlier,
+        failed run left a marker for on the guest, are skipped.
+        
+        Raises:
+            Exception: If a step fails or the script exits abnormally
+        """
+        state_dir = current_app.config.get('DEPLOY_SCRIPT_DIR', '/var/lib/paas-deploy')
+        script_path = f"{state_dir}/run.sh"
+        
+        stage_start = stages.now()
+        sftp = ssh.open_sftp()
+        try:
+            try:
+                sftp.mkdir(state_dir, mode=0o700)
+            except IOError:
+                pass  # Left behind by an earlier run that failed
+            sftp.putfo(io.BytesIO(render_script(commands, state_dir, keys, completed).encode()), script_path)
+            sftp.chmod(script_path, 0o700)
+        finally:
+            sftp.close()
+        stages.record('script_upload', stage_start, steps=len(commands))
+        
+        tracker = StepTracker(commands, output, stages, on_step=on_step, keys=keys)
+        try:
+            result = stream_command(ssh, f"bash {script_path}", OutputBuffer(4096, sinks=[tracker]))
+        except Exception as e:
+            tracker.abort(str(e))
+            raise
+        
+        if tracker.skipped:
+            logger.info(f"Resumed script: skipped {tracker.skipped} completed steps")
+        if tracker.failed:
+            logger.error(f"Command {tracker.failed['index']} failed with exit code {tracker.failed['exit_status']}: {tracker.failed['tail']}")
+            raise Exception(f"Deployment command failed: {tracker.failed['tail']}")
+        if result['exit_status'] != 0:
+            tracker.abort(f"Script exited with {result['exit_status']}")
+            raise Exception(f"Deployment script exited with code {result['exit_status']}: {result['tail']}")
+    
+    def _run_each(
+        self, ssh, commands: list, keys: list, completed: set,
+        output: OutputBuffer, stages: StageTimer, on_step=None
+    ):
+        """
+        Run commands one exec_command channel at a time, skipping those in completed
+        
+        Raises:
+            Exception: If a command fails
+        """
+        for idx, cmd in enumerate(commands):
+            if keys[idx] in completed:
+                output.write(f"\n>>> [{idx+1}/{len(commands)}] {cmd[:100]} (already done)\n".encode())
+                stages.record('command', stages.now(), status='skipped', index=idx + 1, command=cmd[:100])
+                continue
+            logger.info(f"Executing command {idx+1}/{len(commands)}: {cmd[:100]}...")
+            output.write(f"\n>>> [{idx+1}/{len(commands)}] {cmd[:100]}\n".encode())
+            stage_start = stages.now()
+            try:
+                result = stream_command(ssh, cmd, output)
+            except Exception as e:
+                stages.record('command', stage_start, status='failed', index=idx + 1, command=cmd[:100], error=str(e)[:500])
+                raise
+            stages.record(
+                'command',
+                stage_start,
+                status='ok' if result['exit_status'] == 0 else 'failed',
+                index=idx + 1,
+                command=cmd[:100],
+                exit_status=result['exit_status']
+            )
+            
+            if result['exit_status'] != 0:
+                logger.error(f"Command failed with exit code {result['exit_status']}: {result['tail']}")
+                raise Exception(f"Deployment command failed: {result['tail']}")
+            
+            logger.info(f"Command {idx+1}/{len(commands)} finished in {result['seconds']}s")
+            if on_step and keys[idx]:
+                on_step(idx + 1, keys[idx])
+    
+    def build_bake_commands(self, language: str) -> list:
+        """
+        Build the system setup commands for a framework language
+        
+        These are the same for every deployment of the language, so golden
+        images run them once at build time (see backend.api.golden_images).
+        
+        Args:
+            language: Framework language ('nodejs', 'python', 'php')
+        
+        Returns:
+            List of shell commands
+        """
         commands = []
         
         # Helper to wait for apt lock
         wait_for_lock = "while fuser /var/lib/dpkg/lock >/dev/null 2>&1 || fuser /var/lib/apt/lists/lock >/dev/null 2>&1 || fuser /var/lib/dpkg/lock-frontend >/dev/null 2>&1; do echo 'Waiting for apt lock...'; sleep 2; done"
         
-        # Step 1: Update system and install base dependencies
+        # Step 1: Update system and install base dependencies (dos2unix fixes CRLF checkouts)
         base_cmd = (
             f"export DEBIAN_FRONTEND=noninteractive && "
             f"{wait_for_lock} && "
             f"apt-get update -y && "
             f"{wait_for_lock} && "
-            f"apt-get install -y apt-utils git curl wget build-essential"
+            f"apt-get install -y apt-utils git curl wget build-essential dos2unix"
         )
         commands.append(base_cmd)
         
@@ -553,13 +937,45 @@ class TerraformManager:
             )
             commands.append(php_cmd)
         
+        return commands
+    
+    def bake_version(self, language: str) -> str:
+        """
+        Get the version of a language's setup commands
+        
+        Args:
+            language: Framework language
+        
+        Returns:
+            Short hash of the commands from build_bake_commands()
+        """
+        digest = hashlib.sha256('\n'.join(self.build_bake_commands(language)).encode())
+        return digest.hexdigest()[:12]
+    
+    def _build_deployment_commands(
+        self,
+        framework: str,
+        framework_config: Dict[str, Any],
+        github_url: str,
+        env_vars: Optional[Dict[str, str]] = None,
+        baked: bool = False
+    ) -> list:
+        """Build deployment commands based on framework type; baked skips the system setup"""
+        
+        language = framework_config['language']
+        port = framework_config['port']
+        commands = []
+        
+        # Steps 1-2: System packages, unless the guest was cloned from a golden image
+        if not baked:
+            commands.extend(self.build_bake_commands(language))
+        
         # Step 3: Create app directory and clone repository
         commands.append('rm -rf /opt/app && mkdir -p /opt/app')
         commands.append(f'git clone --depth 1 {github_url} /opt/app')
         
         # Step 3.5: Fix Windows line endings (CRLF -> LF) for repos created on Windows
         commands.append(
-            'apt-get install -y dos2unix && '
             'find /opt/app -type f \\( -name "*.js" -o -name "*.py" -o -name "*.sh" -o -name "*.json" -o -name "*.txt" -o -name "*.md" -o -name "*.html" -o -name "*.css" -o -name "*.yml" -o -name "*.yaml" -o -name "*.env*" -o -name "Dockerfile*" -o -name "*.ts" -o -name "*.tsx" -o -name "*.jsx" \\) -exec dos2unix {} \\; 2>/dev/null || true'
         )
         
@@ -697,224 +1113,71 @@ class TerraformManager:
         
         return commands
     
-    def get_logs(self, deployment_name: str) -> str:
+    def log_path(self, deployment_name: str) -> Path:
         """
-        Get Terraform logs for a deployment
+        Get the path of a deployment's log file
         
         Args:
             deployment_name: Name of the deployment
         
         Returns:
-            Log content as string
+            Path inside the deployment working directory
         """
-        try:
-            log_file = self.state_dir / deployment_name / 'terraform.log'
-            if log_file.exists():
-                with open(log_file, 'r') as f:
-                    return f.read()
-            return "No logs available"
-        
-        except Exception as e:
-            logger.error(f"Error reading logs: {e}")
-            return f"Error reading logs: {str(e)}"
+        return self.state_dir / deployment_name / LOG_FILE_NAME
+    
+    @staticmethod
+    def _record(output: Optional[OutputBuffer], title: str, stdout=None, stderr=None):
+        """Write a Terraform command's output to the deployment output, if any"""
+        if output is None:
+            return
+        output.write(f"\n>>> {title}\n".encode())
+        for stream in (stdout, stderr):
+            if stream:
+                output.write(stream.encode(errors='replace') if isinstance(stream, str) else stream)
     
-    def _get_ip_from_proxmox(self, vm_id: str, deployment_type: str, max_retries: int = 10) -> str:
+    def get_logs(
+        self,
+        deployment_name: str,
+        offset: Optional[int] = None,
+        tail: Optional[int] = None,
+        since: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Get IP address from Proxmox API for a VM or LXC container
+        Get a range of the deployment log (Terraform and SSH command output)
         
         Args:
-            vm_id: VM or LXC container ID
-            deployment_type: 'vm' or 'lxc'
-            max_retries: Maximum number of retry attempts
+            deployment_name: Name of the deployment
+            offset: Byte offset to continue from
+            tail: Number of trailing bytes to return
+            since: Timestamp (see deployment_log.parse_since) to start at
         
         Returns:
-            IP address as string
+            Dictionary with data (bytes), offset, size and truncated
         """
-        try:
-            from requests.packages.urllib3.exceptions import InsecureRequestWarning
-            import requests
-            
-            # Suppress SSL warnings
-            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-            
-            proxmox_url = current_app.config['PROXMOX_URL']
-            
-            # Simple parsing logic
-            if '://' in proxmox_url:
-                host = proxmox_url.split('://')[1].split(':')[0]
-            else:
-                host = proxmox_url.split(':')[0]
-                
-            proxmox_host = host
-            
-            # Connect to Proxmox API
-            proxmox = ProxmoxAPI(
-                proxmox_host,
-                user=current_app.config['PROXMOX_USER'],
-                password=current_app.config['PROXMOX_PASSWORD'],
-                verify_ssl=False,
-                timeout=5
-            )
-            
-            node = current_app.config['PROXMOX_NODE']
-            
-            # Retry getting IP address (may take a moment after container creation)
-            for attempt in range(max_retries):
-                try:
-                    if deployment_type == 'lxc':
-                        # Get LXC network interfaces
-                        interfaces = proxmox.nodes(node).lxc(vm_id).interfaces.get()
-                        
-                        # Ensure interfaces is a list
-                        if not interfaces:
-                            if attempt < max_retries - 1:
-                                time.sleep(3)
-                            continue
-
-                        # Look for eth0 with inet address
-                        for interface in interfaces:
-                            if interface.get('name') == 'eth0' and 'inet' in interface:
-                                ip = interface['inet'].split('/')[0]  # Remove CIDR notation
-                                if ip and ip != '0.0.0.0':
-                                    logger.info(f"Found LXC IP: {ip} for container {vm_id}")
-                                    return ip
-                    else:
-                        # Get VM network interfaces (for QEMU VMs)
-                        try:
-                            agent_info = proxmox.nodes(node).qemu(vm_id).agent.get('network-get-interfaces')
-                        except Exception:
-                            # Agent might not be running yet
-                            agent_info = None
-
-                        if not agent_info or not agent_info.get('result'):
-                            if attempt < max_retries - 1:
-                                time.sleep(3)
-                            continue
-
-                        interfaces = agent_info.get('result', [])
-                        
-                        # Look for network interface with IP
-                        for iface in interfaces:
-                            if iface.get('name') in ['eth0', 'ens18']:
-                                for ip_addr in iface.get('ip-addresses', []):
-                                    if ip_addr.get('ip-address-type') == 'ipv4':
-                                        ip = ip_addr.get('ip-address')
-                                        if ip and not ip.startswith('127.'):
-                                            logger.info(f"Found VM IP: {ip} for VM {vm_id}")
-                                            return ip
-                    
-                    # If no IP found, wait and retry
-                    if attempt < max_retries - 1:
-                        logger.info(f"IP not ready yet for {deployment_type} {vm_id}, retry {attempt + 1}/{max_retries}")
-                        time.sleep(3)
-                    
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"Error getting IP (attempt {attempt + 1}): {e}")
-                        time.sleep(3)
-                    else:
-                        raise
-            
-            raise Exception(f"Could not retrieve IP address for {deployment_type} {vm_id} after {max_retries} attempts")
-        
-        except Exception as e:
-            logger.error(f"Error getting IP from Proxmox: {e}")
-            raise
+        return read_log(self.log_path(deployment_name), offset=offset, tail=tail, since=since)
     
-    def _generate_vm_id(self) -> int:
-        """
-        Generate a unique VM ID by checking both Proxmox and the database
-        
-        Returns:
-            Unique VM ID (100-999 range for safety)
+    def _wait_for_ip(self, vm_id, deployment_type: str) -> Dict[str, Any]:
         """
-        import random
-        from backend.models.deployment import Deployment
+        Wait for a VM or LXC container to obtain an IP address
         
-        # Get VM IDs from the database
-        db_vm_ids = set(Deployment.get_used_vm_ids())
-        
-        # Get VM IDs from Proxmox
-        proxmox_vm_ids = set()
-        try:
-            proxmox_vm_ids = self._get_proxmox_vm_ids()
-        except Exception as e:
-            logger.warning(f"Could not fetch VM IDs from Proxmox: {e}")
-        
-        # Combine all used IDs
-        used_ids = db_vm_ids.union(proxmox_vm_ids)
-        
-        # Generate unique ID
-        max_attempts = 100
-        for _ in range(max_attempts):
-            vm_id = random.randint(100, 999)
-            if vm_id not in used_ids:
-                logger.info(f"Generated unique VM ID: {vm_id}")
-                return vm_id
-        
-        # If we can't find a random ID, use sequential search
-        for vm_id in range(100, 1000):
-            if vm_id not in used_ids:
-                logger.info(f"Generated sequential VM ID: {vm_id}")
-                return vm_id
-        
-        raise Exception("No available VM IDs in range 100-999")
-    
-    def _get_proxmox_vm_ids(self) -> set:
-        """
-        Get all existing VM/LXC IDs from Proxmox
+        Args:
+            vm_id: VM or LXC container ID
+            deployment_type: 'vm' or 'lxc'
         
         Returns:
-            Set of VM IDs currently in use on Proxmox
+            Dictionary with ip, source, attempts and seconds
         """
         try:
-            from requests.packages.urllib3.exceptions import InsecureRequestWarning
-            import requests
-            
-            # Suppress SSL warnings
-            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-            
-            proxmox_url = current_app.config['PROXMOX_URL']
-            
-            # Parse host from URL
-            if '://' in proxmox_url:
-                host = proxmox_url.split('://')[1].split(':')[0]
-            else:
-                host = proxmox_url.split(':')[0]
-            
-            # Connect to Proxmox API
-            proxmox = ProxmoxAPI(
-                host,
-                user=current_app.config['PROXMOX_USER'],
-                password=current_app.config['PROXMOX_PASSWORD'],
-                verify_ssl=False,
-                timeout=5
+            waiter = IPWaiter(
+                get_proxmox(),
+                current_app.config['PROXMOX_NODE'],
+                timeout=current_app.config.get('IP_WAIT_TIMEOUT', 180),
+                initial_delay=current_app.config.get('IP_WAIT_INITIAL_DELAY', 0.5),
+                max_delay=current_app.config.get('IP_WAIT_MAX_DELAY', 5.0),
+                leases_file=current_app.config.get('DHCP_LEASES_FILE') or None
             )
-            
-            node = current_app.config['PROXMOX_NODE']
-            vm_ids = set()
-            
-            # Get QEMU VMs
-            try:
-                qemu_vms = proxmox.nodes(node).qemu.get()
-                for vm in qemu_vms:
-                    if 'vmid' in vm:
-                        vm_ids.add(int(vm['vmid']))
-            except Exception as e:
-                logger.warning(f"Could not fetch QEMU VMs: {e}")
-            
-            # Get LXC containers
-            try:
-                lxc_containers = proxmox.nodes(node).lxc.get()
-                for ct in lxc_containers:
-                    if 'vmid' in ct:
-                        vm_ids.add(int(ct['vmid']))
-            except Exception as e:
-                logger.warning(f"Could not fetch LXC containers: {e}")
-            
-            logger.info(f"Found {len(vm_ids)} existing VM/LXC IDs in Proxmox")
-            return vm_ids
-            
+            return waiter.wait(vm_id, deployment_type)
+        
         except Exception as e:
-            logger.error(f"Error fetching VM IDs from Proxmox: {e}")
-            return set()
+            logger.error(f"Error getting IP from Proxmox: {e}")
+            raise
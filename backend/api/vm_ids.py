@@ -0,0 +1,315 @@
+"""
+VM ID Allocator
+Hands out Proxmox guest IDs from an in-memory bitmap backed by database reservations
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+WORD_BITS = 64
+FULL_WORD = (1 << WORD_BITS) - 1
+
+
+class VMIDExhaustedError(Exception):
+    """Raised when every ID in the configured range is in use"""
+
+
+class IDBitmap:
+    """
+    Two-level bitmap over an inclusive integer range
+
+    One bit per ID in 64-bit words, plus a summary integer with one bit per
+    word that still has a free ID. Finding a free ID is a lowest-set-bit
+    lookup in the summary and then in that word, independent of how many
+    IDs are taken. 100k IDs fit in about 12 KB.
+    """
+
+    def __init__(self, start: int, end: int):
+        """
+        Create an empty bitmap
+
+        Args:
+            start: First ID of the range
+            end: Last ID of the range (inclusive)
+        """
+        if end < start:
+            raise ValueError(f"Invalid ID range {start}-{end}")
+        self.start = start
+        self.end = end
+        self.size = end - start + 1
+        self.used = 0
+
+        word_count = -(-self.size // WORD_BITS)
+        self._words = [0] * word_count
+        self._free_words = (1 << word_count) - 1
+
+        # Bits past the end of the range in the last word are never free
+        padding = word_count * WORD_BITS - self.size
+        if padding:
+            self._words[-1] = FULL_WORD ^ ((1 << (WORD_BITS - padding)) - 1)
+
+    def __contains__(self, vm_id: int) -> bool:
+        """Whether the ID is inside the range and taken"""
+        if not self.start <= vm_id <= self.end:
+            return False
+        word, bit = divmod(vm_id - self.start, WORD_BITS)
+        return bool(self._words[word] >> bit & 1)
+
+    def add(self, vm_id: int) -> bool:
+        """
+        Mark an ID as taken
+
+        Args:
+            vm_id: ID to mark; IDs outside the range are ignored
+
+        Returns:
+            True if the ID was free before
+        """
+        if not self.start <= vm_id <= self.end:
+            return False
+        word, bit = divmod(vm_id - self.start, WORD_BITS)
+        value = self._words[word]
+        if value >> bit & 1:
+            return False
+        value |= 1 << bit
+        self._words[word] = value
+        if value == FULL_WORD:
+            self._free_words &= ~(1 << word)
+        self.used += 1
+        return True
+
+    def discard(self, vm_id: int):
+        """
+        Mark an ID as free
+
+        Args:
+            vm_id: ID to free; IDs outside the range are ignored
+        """
+        if vm_id not in self:
+            return
+        word, bit = divmod(vm_id - self.start, WORD_BITS)
+        self._words[word] &= ~(1 << bit)
+        self._free_words |= 1 << word
+        self.used -= 1
+
+    def take_lowest(self) -> Optional[int]:
+        """
+        Take the lowest free ID
+
+        Returns:
+            The ID, now marked as taken, or None if the range is full
+        """
+        if not self._free_words:
+            return None
+        word = (self._free_words & -self._free_words).bit_length() - 1
+        free_bits = ~self._words[word] & FULL_WORD
+        bit = (free_bits & -free_bits).bit_length() - 1
+        vm_id = self.start + word * WORD_BITS + bit
+        self.add(vm_id)
+        return vm_id
+
+
+class VMIDAllocator:
+    """
+    Collision-free guest ID allocation shared by all deployment workers
+
+    The bitmap is rebuilt from deployment rows, live reservations and the
+    cached cluster inventory every VM_ID_SYNC_INTERVAL seconds, not on each
+    deployment. Within a process the bitmap alone prevents two threads from
+    picking the same ID; across server processes the reservation row's
+    primary key does, and a lost race just moves on to the next free bit.
+    Reservations expire after VM_ID_RESERVATION_TTL, which returns the IDs
+    of abandoned runs to the pool on the next sync.
+    """
+
+    def __init__(self, app=None, inventory=None):
+        """Initialize the allocator, optionally binding it to an application"""
+        self.app = None
+        self.inventory = inventory
+        self.start = 100
+        self.end = 99999
+        self.ttl = 3600
+        self.sync_interval = 300
+        self._bitmap: Optional[IDBitmap] = None
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, inventory)
+
+    def init_app(self, app, inventory=None):
+        """
+        Bind the allocator to a Flask application
+
+        Args:
+            app: Flask application instance
+            inventory: ClusterInventory whose snapshot lists existing guests
+        """
+        # Registers the tables the allocator reads with the metadata
+        from backend.models import deployment, vm_id_reservation  # noqa: F401
+
+        self.app = app
+        self.inventory = inventory or self.inventory
+        self.start = int(app.config.get('VM_ID_RANGE_START', 100))
+        self.end = int(app.config.get('VM_ID_RANGE_END', 99999))
+        self.ttl = float(app.config.get('VM_ID_RESERVATION_TTL', 3600))
+        self.sync_interval = float(app.config.get('VM_ID_SYNC_INTERVAL', 300))
+        self._bitmap = None
+        app.extensions['vm_id_allocator'] = self
+
+    def allocate(self, deployment_id: Optional[str] = None) -> int:
+        """
+        Reserve a free guest ID
+
+        Must be called inside an application context.
+
+        Args:
+            deployment_id: Deployment the ID is for (recorded on the reservation)
+
+        Returns:
+            Reserved VM/LXC ID
+
+        Raises:
+            VMIDExhaustedError: If no ID in the range is free
+        """
+        resynced = False
+        while True:
+            with self._lock:
+                if self._bitmap is None or time.monotonic() - self._synced_at >= self.sync_interval:
+                    self._sync_locked()
+                    resynced = True
+                vm_id = self._bitmap.take_lowest()
+                if vm_id is None and not resynced:
+                    # Expired reservations and deleted guests may have freed IDs since the last sync
+                    self._sync_locked()
+                    resynced = True
+                    vm_id = self._bitmap.take_lowest()
+
+            if vm_id is None:
+                raise VMIDExhaustedError(f"No available VM IDs in range {self.start}-{self.end}")
+
+            if self._reserve(vm_id, deployment_id):
+                logger.info(f"Reserved VM ID {vm_id} for deployment {deployment_id}")
+                return vm_id
+
+            # Taken by another server process; its bit stays set here
+            logger.debug(f"VM ID {vm_id} already reserved elsewhere, trying the next one")
+
+    def release(self, vm_id: Optional[int]):
+        """
+        Return an ID to the pool right away instead of waiting for expiry
+
+        Args:
+            vm_id: ID whose guest no longer exists
+        """
+        if vm_id is None:
+            return
+        from backend.extensions import db
+        from backend.models.vm_id_reservation import VMIDReservation
+
+        with db.engine.begin() as connection:
+            connection.execute(VMIDReservation.__table__.delete().where(VMIDReservation.vm_id == vm_id))
+        with self._lock:
+            if self._bitmap is not None:
+                self._bitmap.discard(vm_id)
+
+    def sync(self):
+        """Rebuild the bitmap now. Must be called inside an application context"""
+        with self._lock:
+            self._sync_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get allocator statistics
+
+        Returns:
+            Dictionary with the range, used and free counts and the bitmap age
+        """
+        with self._lock:
+            bitmap = self._bitmap
+            return {
+                'range': [self.start, self.end],
+                'used': bitmap.used if bitmap else None,
+                'free': bitmap.size - bitmap.used if bitmap else None,
+                'synced_age': round(time.monotonic() - self._synced_at, 3) if bitmap else None
+            }
+
+    def _sync_locked(self):
+        """Rebuild the bitmap from the database and the inventory snapshot"""
+        from backend.extensions import db
+        from backend.models.deployment import Deployment
+        from backend.models.golden_image import GoldenImage
+        from backend.models.package_cache import PackageCache
+        from backend.models.vm_id_reservation import VMIDReservation
+
+        now = datetime.utcnow()
+        table = VMIDReservation.__table__
+        with db.engine.begin() as connection:
+            connection.execute(table.delete().where(table.c.expires_at <= now))
+            reserved = connection.execute(db.select(table.c.vm_id)).scalars().all()
+
+        bitmap = IDBitmap(self.start, self.end)
+        self._mark(bitmap, reserved)
+        self._mark(bitmap, Deployment.get_used_vm_ids())
+        # Templates and the cache guest hold their IDs past any reservation
+        self._mark(bitmap, GoldenImage.get_used_vm_ids())
+        self._mark(bitmap, PackageCache.get_used_vm_ids())
+        self._mark(bitmap, self._inventory_ids())
+
+        self._bitmap = bitmap
+        self._synced_at = time.monotonic()
+        logger.info(f"VM ID bitmap synced: {bitmap.used} of {bitmap.size} IDs in use ({len(reserved)} reserved)")
+
+    def _inventory_ids(self) -> Iterable[int]:
+        """Guest IDs from the cluster inventory snapshot"""
+        if self.inventory is None:
+            return []
+        try:
+            return [int(guest['vmid']) for guest in self.inventory.guests() if 'vmid' in guest]
+        except Exception as e:
+            logger.warning(f"Could not read guest IDs from the cluster inventory: {e}")
+            return []
+
+    @staticmethod
+    def _mark(bitmap: IDBitmap, vm_ids: Iterable[int]):
+        for vm_id in vm_ids:
+            bitmap.add(int(vm_id))
+
+    def _reserve(self, vm_id: int, deployment_id: Optional[str]) -> bool:
+        """
+        Insert the reservation row in its own transaction
+
+        Returns:
+            False if another process holds the ID (reservation or deployment row)
+        """
+        from sqlalchemy.exc import IntegrityError
+        from backend.extensions import db
+        from backend.models.deployment import Deployment, DeploymentStatus
+        from backend.models.vm_id_reservation import VMIDReservation
+
+        now = datetime.utcnow()
+        table = VMIDReservation.__table__
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(table.delete().where(table.c.vm_id == vm_id, table.c.expires_at <= now))
+                in_use = connection.execute(
+                    db.select(Deployment.id).where(
+                        Deployment.vm_id == vm_id,
+                        Deployment.status != DeploymentStatus.DELETED
+                    ).limit(1)
+                ).first()
+                if in_use is not None:
+                    return False
+                connection.execute(table.insert().values(
+                    vm_id=vm_id,
+                    deployment_id=deployment_id,
+                    reserved_at=now,
+                    expires_at=now + timedelta(seconds=self.ttl)
+                ))
+            return True
+        except IntegrityError:
+            return False
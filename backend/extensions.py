@@ -1,14 +1,33 @@
 """
 Database extensions initialization
-Initializes SQLAlchemy and other Flask extensions
+Initializes SQLAlchemy, the deployment job queue and other Flask extensions
 """
 
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from backend.api.job_queue import DeploymentJobQueue
+from backend.api.inventory import ClusterInventory
+from backend.api.ssh_pool import JumpHostPool
+from backend.api.live_output import LiveOutput
+from backend.api.events import DeploymentEvents
+from backend.api.stats_cache import StatsCache
+from backend.api.stream_slots import StreamSlots
+from backend.api.stage_events import StageEventWriter
+from backend.api.vm_ids import VMIDAllocator
+from backend.utils.database import configure_sqlite, engine_options
+from backend.utils.migrate import LazyMigrate
 
 # Initialize extensions
 db = SQLAlchemy()
-migrate = Migrate()
+migrate = LazyMigrate()  # Alembic is imported only by `flask db` commands
+job_queue = DeploymentJobQueue()
+inventory = ClusterInventory()
+jump_hosts = JumpHostPool()
+live_output = LiveOutput()
+deployment_events = DeploymentEvents()
+stats_cache = StatsCache()
+stream_slots = StreamSlots()
+stage_events = StageEventWriter()
+vm_ids = VMIDAllocator()
 
 
 def init_extensions(app):
@@ -18,5 +37,22 @@ def init_extensions(app):
     Args:
         app: Flask application instance
     """
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_sqlite(engine, app.config)
     migrate.init_app(app, db)
+    job_queue.init_app(app)
+    # Imported here: the models import db from this module
+    from backend.models.deployment import Deployment
+    job_queue.on_renew(Deployment.renew_leases)
+    inventory.init_app(app)
+    jump_hosts.init_app(app)
+    live_output.init_app(app)
+    deployment_events.init_app(app, db.session)
+    stats_cache.init_app(app)
+    deployment_events.on_change(stats_cache.invalidate)
+    stream_slots.init_app(app)
+    stage_events.init_app(app)
+    vm_ids.init_app(app, inventory)
@@ -5,10 +5,12 @@ Represents a deployment in the PaaS platform using SQLAlchemy ORM
 
 from enum import Enum
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import uuid
-import json
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import validates
 from backend.extensions import db
+from backend.utils.helpers import decode_cursor, encode_cursor
 
 
 class DeploymentStatus(Enum):
@@ -22,24 +24,89 @@ class DeploymentStatus(Enum):
     DELETED = 'deleted'
 
 
+# Statuses a deployment holds while a worker is running its pipeline
+IN_FLIGHT_STATUSES = (DeploymentStatus.PENDING, DeploymentStatus.PROVISIONING, DeploymentStatus.DEPLOYING)
+
+
+# Field names accepted by Deployment.list_page(fields=...), in to_dict() order
+LIST_FIELDS = (
+    'id',
+    'name',
+    'deployment_type',
+    'framework',
+    'github_url',
+    'resources',
+    'status',
+    'created_at',
+    'deployed_at',
+    'deleted_at',
+    'ip_address',
+    'vm_id',
+    'error_message'
+)
+
+
+def _serialize_field(field: str, value: Any) -> Any:
+    """Convert a loaded column value into its to_dict() representation"""
+    if field == 'resources':
+        return value or {}
+    if isinstance(value, DeploymentStatus):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _seconds_between(start, end):
+    """SQL expression for the number of seconds between two datetime columns"""
+    if db.engine.dialect.name == 'postgresql':
+        return func.extract('epoch', end - start)
+    # SQLite stores datetimes as text; julianday() turns them into fractional days
+    return (func.julianday(end) - func.julianday(start)) * 86400.0
+
+
 class Deployment(db.Model):
     """Deployment model class using SQLAlchemy"""
     
     __tablename__ = 'deployments'
+    __table_args__ = (
+        # Kept in sync with migrations/versions/5f028bdae3da_add_deployment_status_indexes.py
+        db.Index('ix_deployments_status_created_at', 'status', 'created_at'),
+        db.Index('ix_deployments_created_at_id', 'created_at', 'id'),
+        db.Index(
+            'ix_deployments_vm_id_active',
+            'vm_id',
+            sqlite_where=text("status != 'deleted'"),
+            postgresql_where=text("status != 'deleted'")
+        ),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(100), nullable=False, index=True)
     deployment_type = db.Column(db.String(10), nullable=False)  # 'vm' or 'lxc'
     framework = db.Column(db.String(50), nullable=False)
     github_url = db.Column(db.String(500), nullable=False)
-    resources_json = db.Column(db.Text, nullable=True)  # JSON string for resources
-    status = db.Column(db.String(20), nullable=False, default='pending')
+    resources = db.Column(db.JSON(none_as_null=True), nullable=True)  # Decoded once when the row loads
+    # Stored as the plain value ('running'); loads as a DeploymentStatus
+    status = db.Column(
+        db.Enum(
+            DeploymentStatus,
+            native_enum=False,
+            length=20,
+            values_callable=lambda statuses: [status.value for status in statuses],
+            validate_strings=True
+        ),
+        nullable=False,
+        default=DeploymentStatus.PENDING
+    )
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     deployed_at = db.Column(db.DateTime, nullable=True)
     deleted_at = db.Column(db.DateTime, nullable=True)
     ip_address = db.Column(db.String(45), nullable=True)  # IPv4 or IPv6
     vm_id = db.Column(db.Integer, nullable=True)
     error_message = db.Column(db.Text, nullable=True)
+    # Renewed while a server process has the run queued or running (see claim_retry)
+    heartbeat_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
     
     def __init__(
         self,
@@ -71,37 +138,14 @@ class Deployment(db.Model):
         self.deployment_type = deployment_type
         self.framework = framework
         self.github_url = github_url
-        self.resources = resources  # Uses property setter
-        self.status = status  # Uses property setter
+        self.resources = resources
+        self.status = status
         self.created_at = created_at
     
-    @property
-    def resources(self) -> Dict[str, Any]:
-        """Get resources as dictionary"""
-        if self.resources_json:
-            return json.loads(self.resources_json)
-        return {}
-    
-    @resources.setter
-    def resources(self, value: Dict[str, Any]):
-        """Set resources from dictionary"""
-        self.resources_json = json.dumps(value) if value else None
-    
-    @property
-    def status(self) -> DeploymentStatus:
-        """Get status as enum"""
-        return DeploymentStatus(self._status) if self._status else DeploymentStatus.PENDING
-    
-    @status.setter
-    def status(self, value):
-        """Set status from enum or string"""
-        if isinstance(value, DeploymentStatus):
-            self._status = value.value
-        else:
-            self._status = value
-    
-    # Override the status column to use _status internally
-    _status = db.Column('status', db.String(20), nullable=False, default='pending')
+    @validates('status')
+    def _coerce_status(self, key: str, value) -> DeploymentStatus:
+        """Accept a DeploymentStatus or its string value"""
+        return value if isinstance(value, DeploymentStatus) else DeploymentStatus(value)
     
     def save(self):
         """Save the deployment to database"""
@@ -126,8 +170,8 @@ class Deployment(db.Model):
             'deployment_type': self.deployment_type,
             'framework': self.framework,
             'github_url': self.github_url,
-            'resources': self.resources,
-            'status': self.status.value if isinstance(self.status, DeploymentStatus) else self.status,
+            'resources': self.resources or {},
+            'status': self.status.value if self.status else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'deployed_at': self.deployed_at.isoformat() if self.deployed_at else None,
             'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None,
@@ -180,8 +224,7 @@ class Deployment(db.Model):
         Returns:
             Number of deployments with the specified status
         """
-        status_value = status.value if isinstance(status, DeploymentStatus) else status
-        return cls.query.filter_by(_status=status_value).count()
+        return cls.query.filter_by(status=DeploymentStatus(status)).count()
     
     @classmethod
     def filter_by_status(cls, status: DeploymentStatus) -> List['Deployment']:
@@ -194,8 +237,7 @@ class Deployment(db.Model):
         Returns:
             List of deployments with the specified status
         """
-        status_value = status.value if isinstance(status, DeploymentStatus) else status
-        return cls.query.filter_by(_status=status_value).all()
+        return cls.query.filter_by(status=DeploymentStatus(status)).all()
     
     @classmethod
     def delete_by_id(cls, deployment_id: str) -> bool:
@@ -215,6 +257,167 @@ class Deployment(db.Model):
             return True
         return False
     
+    @classmethod
+    def claim_retry(cls, deployment_id: str, lease_expired_before: datetime) -> bool:
+        """
+        Move a retryable deployment back to PENDING in one conditional UPDATE
+        
+        Failed deployments are retryable, and so are deployments stuck in
+        PENDING/PROVISIONING/DEPLOYING whose lease (heartbeat_at) expired:
+        no server process has renewed it since its worker died or the server
+        restarted. Callers check their own job queue first. Of two concurrent
+        retries only one gets the row, which leaves it leased again. The
+        UPDATE bypasses the session, so no status event is published and
+        loaded instances must be refreshed; the caller commits.
+        
+        Args:
+            deployment_id: Deployment identifier
+            lease_expired_before: In-flight deployments last renewed before this are retryable
+        
+        Returns:
+            True if this call claimed the deployment
+        """
+        interrupted = and_(
+            cls.status.in_(IN_FLIGHT_STATUSES),
+            or_(cls.heartbeat_at.is_(None), cls.heartbeat_at < lease_expired_before)
+        )
+        claimed = cls.query.filter(
+            cls.id == deployment_id,
+            or_(cls.status == DeploymentStatus.FAILED, interrupted)
+        ).update(
+            {'status': DeploymentStatus.PENDING, 'error_message': None, 'heartbeat_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        return claimed == 1
+    
+    @classmethod
+    def renew_leases(cls, deployment_ids: List[str]):
+        """
+        Mark in-flight deployments as still owned by a server process and commit
+        
+        Args:
+            deployment_ids: Deployments queued or running in this process
+        """
+        cls.query.filter(
+            cls.id.in_(deployment_ids),
+            cls.status.in_(IN_FLIGHT_STATUSES)
+        ).update({'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+    
+    @classmethod
+    def list_page(
+        cls,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        deployment_type: Optional[str] = None,
+        framework: Optional[str] = None,
+        include_deleted: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of deployments, newest first
+        
+        Uses keyset pagination on (created_at, id), so every page costs the
+        same regardless of how deep the client has paged. Only the columns
+        behind the requested fields are selected.
+        
+        Args:
+            limit: Maximum number of rows
+            cursor: next_cursor from the previous page
+            statuses: Only these status values
+            deployment_type: Only 'vm' or 'lxc'
+            framework: Only this framework
+            include_deleted: Include soft-deleted rows when no status filter is given
+            fields: Field names to return (see LIST_FIELDS), all if omitted
+        
+        Returns:
+            Tuple of (list of dictionaries, cursor for the next page or None)
+        
+        Raises:
+            ValueError: For unknown fields or a malformed cursor
+        """
+        fields = list(fields) if fields else list(LIST_FIELDS)
+        unknown = [field for field in fields if field not in LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        
+        columns = [getattr(cls, field) for field in fields]
+        query = db.session.query(cls.created_at, cls.id, *columns)
+        
+        if statuses:
+            query = query.filter(cls.status.in_(statuses))
+        elif not include_deleted:
+            query = query.filter(cls.status != DeploymentStatus.DELETED.value)
+        if deployment_type:
+            query = query.filter(cls.deployment_type == deployment_type)
+        if framework:
+            query = query.filter(cls.framework == framework)
+        
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                cursor_created_at, cursor_id = datetime.fromisoformat(values[0]), str(values[1])
+            except (IndexError, TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            query = query.filter(or_(
+                cls.created_at < cursor_created_at,
+                and_(cls.created_at == cursor_created_at, cls.id < cursor_id)
+            ))
+        
+        rows = query.order_by(cls.created_at.desc(), cls.id.desc()).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][0].isoformat(), rows[-1][1]])
+        
+        return [
+            {field: _serialize_field(field, value) for field, value in zip(fields, row[2:])}
+            for row in rows
+        ], next_cursor
+    
+    @classmethod
+    def aggregate_stats(cls) -> Dict[str, Any]:
+        """
+        Compute dashboard statistics with two aggregate queries
+        
+        One GROUP BY (status, framework, deployment_type) yields every
+        breakdown; a second query averages the time from creation to a
+        successful deployment in SQL.
+        
+        Returns:
+            Dictionary with total, by_status, by_framework, by_type and durations
+        """
+        rows = db.session.query(
+            cls.status, cls.framework, cls.deployment_type, func.count()
+        ).group_by(cls.status, cls.framework, cls.deployment_type).all()
+        
+        by_status = {status.value: 0 for status in DeploymentStatus}
+        by_framework: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        for status, framework, deployment_type, count in rows:
+            by_status[status.value] += count
+            by_framework[framework] = by_framework.get(framework, 0) + count
+            by_type[deployment_type] = by_type.get(deployment_type, 0) + count
+        
+        elapsed = _seconds_between(cls.created_at, cls.deployed_at)
+        avg_seconds, max_seconds, deployed = db.session.query(
+            func.avg(elapsed), func.max(elapsed), func.count(cls.deployed_at)
+        ).filter(cls.deployed_at.isnot(None)).one()
+        
+        return {
+            'total': sum(by_status.values()),
+            'by_status': by_status,
+            'by_framework': by_framework,
+            'by_type': by_type,
+            'durations': {
+                'deployed_count': deployed,
+                'avg_deploy_seconds': round(float(avg_seconds), 1) if avg_seconds is not None else None,
+                'max_deploy_seconds': round(float(max_seconds), 1) if max_seconds is not None else None
+            }
+        }
+    
     @classmethod
     def get_used_vm_ids(cls) -> List[int]:
         """
@@ -225,10 +428,10 @@ class Deployment(db.Model):
         """
         result = cls.query.with_entities(cls.vm_id).filter(
             cls.vm_id.isnot(None),
-            cls._status != 'deleted'
+            cls.status != DeploymentStatus.DELETED
         ).all()
         return [r[0] for r in result if r[0] is not None]
     
     def __repr__(self) -> str:
         """String representation"""
-        return f"<Deployment {self.name} ({self._status})>"
+        return f"<Deployment {self.name} ({self.status.value})>"
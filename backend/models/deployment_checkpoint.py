@@ -0,0 +1,106 @@
+"""
+Deployment Checkpoint Model
+Pipeline stages a deployment has completed, so a retry can resume after them
+"""
+
+from datetime import datetime
+from typing import Any, Dict
+from backend.extensions import db
+
+# Stage name prefix of remote step checkpoints, followed by the step key
+STEP_PREFIX = 'step:'
+
+
+class DeploymentCheckpoint(db.Model):
+    """One completed, resumable stage of a deployment"""
+
+    __tablename__ = 'deployment_checkpoints'
+
+    deployment_id = db.Column(
+        db.String(36),
+        db.ForeignKey('deployments.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    stage = db.Column(db.String(50), primary_key=True)  # 'vm_id_allocated', 'provisioned', 'step:<key>', 'deployed'
+    detail = db.Column(db.JSON(none_as_null=True), nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert checkpoint to dictionary
+
+        Returns:
+            Dictionary representation of the checkpoint
+        """
+        return {
+            'stage': self.stage,
+            'detail': self.detail or {},
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+
+    @classmethod
+    def record(cls, deployment_id: str, stage: str, **detail):
+        """
+        Mark a stage completed and commit right away
+
+        Args:
+            deployment_id: Deployment identifier
+            stage: Stage name
+            **detail: JSON-serializable values needed to resume after the stage
+        """
+        db.session.merge(cls(
+            deployment_id=deployment_id,
+            stage=stage,
+            detail=detail or None,
+            completed_at=datetime.utcnow()
+        ))
+        db.session.commit()
+
+    @classmethod
+    def forget_steps(cls, deployment_id: str):
+        """
+        Drop the remote step checkpoints of a deployment and commit
+
+        They describe work done on one guest and mean nothing for a new one.
+
+        Args:
+            deployment_id: Deployment identifier
+        """
+        cls.query.filter(
+            cls.deployment_id == deployment_id,
+            cls.stage.startswith(STEP_PREFIX)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+    @classmethod
+    def completed(cls, deployment_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the completed stages of a deployment
+
+        Args:
+            deployment_id: Deployment identifier
+
+        Returns:
+            Dictionary of stage name to its recorded detail
+        """
+        return {
+            checkpoint.stage: checkpoint.detail or {}
+            for checkpoint in cls.query.filter_by(deployment_id=deployment_id)
+        }
+
+    @classmethod
+    def for_deployment(cls, deployment_id: str):
+        """
+        Get the checkpoints of one deployment, oldest first
+
+        Args:
+            deployment_id: Deployment identifier
+
+        Returns:
+            List of DeploymentCheckpoint
+        """
+        return cls.query.filter_by(deployment_id=deployment_id).order_by(cls.completed_at).all()
+
+    def __repr__(self) -> str:
+        """String representation"""
+        return f"<DeploymentCheckpoint {self.deployment_id} {self.stage}>"
@@ -0,0 +1,106 @@
+"""
+Deployment Event Model
+Append-only log of pipeline stage boundaries with their durations
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from backend.extensions import db
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class DeploymentEvent(db.Model):
+    """One finished pipeline stage of a deployment"""
+
+    __tablename__ = 'deployment_events'
+    __table_args__ = (
+        db.Index('ix_deployment_events_deployment_id_id', 'deployment_id', 'id'),
+        db.Index('ix_deployment_events_stage_created_at', 'stage', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    deployment_id = db.Column(
+        db.String(36),
+        db.ForeignKey('deployments.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    stage = db.Column(db.String(50), nullable=False)  # e.g. 'terraform_apply', 'command'
+    status = db.Column(db.String(20), nullable=False, default='ok')  # 'ok', 'failed' or 'skipped'
+    offset_seconds = db.Column(db.Float, nullable=False)  # Monotonic start, relative to the pipeline start
+    duration_seconds = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    detail = db.Column(db.JSON(none_as_null=True), nullable=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert event to dictionary
+
+        Returns:
+            Dictionary representation of the event
+        """
+        return {
+            'stage': self.stage,
+            'status': self.status,
+            'offset_seconds': self.offset_seconds,
+            'duration_seconds': self.duration_seconds,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'detail': self.detail or {}
+        }
+
+    @classmethod
+    def timeline(cls, deployment_id: str) -> List['DeploymentEvent']:
+        """
+        Get the events of one deployment in the order they were recorded
+
+        Args:
+            deployment_id: Deployment identifier
+
+        Returns:
+            List of events
+        """
+        return cls.query.filter_by(deployment_id=deployment_id).order_by(cls.id).all()
+
+    @classmethod
+    def stage_percentiles(cls, since: Optional[datetime] = None, days: int = 30) -> Dict[str, Dict[str, Any]]:
+        """
+        Duration percentiles per stage over successful events
+
+        Only the duration column is read; the percentiles are computed in
+        Python because SQLite has no percentile aggregate.
+
+        Args:
+            since: Only events recorded after this time
+            days: Window used when since is not given
+
+        Returns:
+            Dictionary of stage -> count, p50, p95 and max seconds
+        """
+        since = since or datetime.utcnow() - timedelta(days=days)
+        rows = db.session.query(cls.stage, cls.duration_seconds).filter(
+            cls.status == 'ok',
+            cls.created_at >= since
+        ).order_by(cls.stage, cls.duration_seconds).all()
+
+        durations: Dict[str, List[float]] = {}
+        for stage, seconds in rows:
+            durations.setdefault(stage, []).append(seconds)
+
+        return {
+            stage: {
+                'count': len(values),
+                'p50': round(_percentile(values, 0.50), 3),
+                'p95': round(_percentile(values, 0.95), 3),
+                'max': round(values[-1], 3)
+            }
+            for stage, values in durations.items()
+        }
+
+    def __repr__(self) -> str:
+        """String representation"""
+        return f"<DeploymentEvent {self.deployment_id} {self.stage} {self.duration_seconds}s>"
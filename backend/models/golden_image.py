@@ -0,0 +1,120 @@
+"""
+Golden Image Model
+Proxmox templates with a framework language's system packages already installed
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from backend.extensions import db
+
+STATUSES = ('building', 'ready', 'failed', 'retired')
+
+
+class GoldenImage(db.Model):
+    """
+    One template build for a (language, deployment type) pair
+
+    version is a hash of the setup commands baked into the template, so a
+    change to those commands makes existing templates stale instead of
+    silently skipping the new steps at deploy time.
+    """
+
+    __tablename__ = 'golden_images'
+    __table_args__ = (
+        db.Index('ix_golden_images_lookup', 'language', 'deployment_type', 'status'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    language = db.Column(db.String(20), nullable=False)  # 'nodejs', 'python', 'php'
+    deployment_type = db.Column(db.String(10), nullable=False)  # 'vm' or 'lxc'
+    version = db.Column(db.String(16), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='building')
+    vm_id = db.Column(db.Integer, nullable=True)  # Template ID on Proxmox once built
+    node = db.Column(db.String(50), nullable=True)
+    error_message = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    ready_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert golden image to dictionary
+
+        Returns:
+            Dictionary representation of the image
+        """
+        return {
+            'id': self.id,
+            'language': self.language,
+            'deployment_type': self.deployment_type,
+            'version': self.version,
+            'status': self.status,
+            'vm_id': self.vm_id,
+            'node': self.node,
+            'error_message': self.error_message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'ready_at': self.ready_at.isoformat() if self.ready_at else None
+        }
+
+    @classmethod
+    def current(cls, language: str, deployment_type: str, version: str) -> Optional['GoldenImage']:
+        """
+        Get the newest ready template matching the current setup commands
+
+        Args:
+            language: Framework language
+            deployment_type: 'vm' or 'lxc'
+            version: Version of the setup commands
+
+        Returns:
+            GoldenImage or None
+        """
+        return cls.query.filter_by(
+            language=language,
+            deployment_type=deployment_type,
+            version=version,
+            status='ready'
+        ).order_by(cls.ready_at.desc()).first()
+
+    @classmethod
+    def building(cls, language: str, deployment_type: str) -> Optional['GoldenImage']:
+        """
+        Get a build in progress for the pair
+
+        Args:
+            language: Framework language
+            deployment_type: 'vm' or 'lxc'
+
+        Returns:
+            GoldenImage or None
+        """
+        return cls.query.filter_by(
+            language=language,
+            deployment_type=deployment_type,
+            status='building'
+        ).first()
+
+    @classmethod
+    def list_all(cls) -> List['GoldenImage']:
+        """
+        Get every image, newest first
+
+        Returns:
+            List of GoldenImage objects
+        """
+        return cls.query.order_by(cls.created_at.desc(), cls.id.desc()).all()
+
+    @classmethod
+    def get_used_vm_ids(cls) -> List[int]:
+        """
+        Get the template IDs of every built image, retired ones included
+
+        Retired templates stay on Proxmox while linked clones depend on them.
+
+        Returns:
+            List of VM IDs
+        """
+        return [vm_id for (vm_id,) in cls.query.with_entities(cls.vm_id).filter(cls.vm_id.isnot(None))]
+
+    def __repr__(self) -> str:
+        """String representation"""
+        return f"<GoldenImage {self.language}/{self.deployment_type} {self.version} ({self.status})>"
@@ -0,0 +1,88 @@
+"""
+Package Cache Model
+The platform-managed caching proxy guests use for apt, npm and pip downloads
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from backend.extensions import db
+
+
+class PackageCache(db.Model):
+    """One provisioning of the package cache guest"""
+
+    __tablename__ = 'package_caches'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    status = db.Column(db.String(20), nullable=False, default='provisioning')  # provisioning, ready, failed, deleted
+    vm_id = db.Column(db.Integer, nullable=True)
+    ip_address = db.Column(db.String(50), nullable=True)
+    port = db.Column(db.Integer, nullable=False)
+    error_message = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    ready_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def url(self) -> Optional[str]:
+        """Base URL guests are pointed at, once the cache has an address"""
+        if not self.ip_address:
+            return None
+        return f"http://{self.ip_address}:{self.port}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert package cache to dictionary
+
+        Returns:
+            Dictionary representation of the cache
+        """
+        return {
+            'id': self.id,
+            'status': self.status,
+            'vm_id': self.vm_id,
+            'ip_address': self.ip_address,
+            'port': self.port,
+            'url': self.url,
+            'error_message': self.error_message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'ready_at': self.ready_at.isoformat() if self.ready_at else None
+        }
+
+    @classmethod
+    def latest(cls) -> Optional['PackageCache']:
+        """
+        Get the most recent provisioning that was not deleted
+
+        Returns:
+            PackageCache or None
+        """
+        return cls.query.filter(cls.status != 'deleted').order_by(cls.id.desc()).first()
+
+    @classmethod
+    def active(cls) -> Optional['PackageCache']:
+        """
+        Get the cache guests should use
+
+        Returns:
+            The newest ready PackageCache, or None
+        """
+        return cls.query.filter_by(status='ready').order_by(cls.ready_at.desc()).first()
+
+    @classmethod
+    def get_used_vm_ids(cls) -> List[int]:
+        """
+        Get the guest IDs of cache provisionings that were not deleted
+
+        Returns:
+            List of VM IDs
+        """
+        return [
+            vm_id for (vm_id,) in cls.query.with_entities(cls.vm_id).filter(
+                cls.vm_id.isnot(None),
+                cls.status != 'deleted'
+            )
+        ]
+
+    def __repr__(self) -> str:
+        """String representation"""
+        return f"<PackageCache {self.id} {self.url} ({self.status})>"
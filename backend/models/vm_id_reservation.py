@@ -0,0 +1,47 @@
+"""
+VM ID Reservation Model
+Short-lived claims on Proxmox guest IDs taken before Terraform creates the guest
+"""
+
+from datetime import datetime
+from typing import Any, Dict
+from backend.extensions import db
+
+
+class VMIDReservation(db.Model):
+    """
+    One reserved VM/LXC ID
+
+    The primary key makes the reservation itself the lock: two allocators
+    (threads or server processes) picking the same ID cannot both insert it.
+    Rows expire after VM_ID_RESERVATION_TTL; by then the deployment row
+    carries the ID, and reservations of abandoned runs are reclaimed.
+    """
+
+    __tablename__ = 'vm_id_reservations'
+    __table_args__ = (
+        db.Index('ix_vm_id_reservations_expires_at', 'expires_at'),
+    )
+
+    vm_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    deployment_id = db.Column(db.String(36), nullable=True)
+    reserved_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert reservation to dictionary
+
+        Returns:
+            Dictionary representation of the reservation
+        """
+        return {
+            'vm_id': self.vm_id,
+            'deployment_id': self.deployment_id,
+            'reserved_at': self.reserved_at.isoformat() if self.reserved_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None
+        }
+
+    def __repr__(self) -> str:
+        """String representation"""
+        return f"<VMIDReservation {self.vm_id} ({self.deployment_id})>"
@@ -0,0 +1,102 @@
+"""
+Database Engine Utilities
+Engine options and per-connection settings for SQLite and PostgreSQL
+"""
+
+import logging
+from typing import Any, Dict, Mapping
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+logger = logging.getLogger(__name__)
+
+
+def is_sqlite_memory(database_uri: str) -> bool:
+    """Whether the URI points at an in-memory SQLite database"""
+    url = make_url(database_uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for the configured database
+
+    File and server databases get a bounded connection pool with pre-ping
+    and recycling; in-memory SQLite keeps Flask-SQLAlchemy's single static
+    connection. Options already present in SQLALCHEMY_ENGINE_OPTIONS win.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Keyword arguments for sqlalchemy.create_engine()
+    """
+    database_uri = config['SQLALCHEMY_DATABASE_URI']
+    options: Dict[str, Any] = {}
+
+    if not is_sqlite_memory(database_uri):
+        options.update({
+            'pool_size': int(config.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(config.get('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': float(config.get('DB_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(config.get('DB_POOL_RECYCLE', 1800)),
+            'pool_pre_ping': bool(config.get('DB_POOL_PRE_PING', True))
+        })
+
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def configure_sqlite(engine: Engine, config: Mapping[str, Any]):
+    """
+    Apply journal, sync and lock-wait pragmas to every new SQLite connection
+
+    WAL lets readers run while a background worker commits, and
+    busy_timeout makes a second writer wait for the lock instead of
+    failing with "database is locked". Other dialects are left untouched.
+
+    Args:
+        engine: Engine created by Flask-SQLAlchemy
+        config: Application configuration
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    journal_mode = config.get('SQLITE_JOURNAL_MODE', 'WAL')
+    synchronous = config.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    busy_timeout = int(config.get('SQLITE_BUSY_TIMEOUT', 5000))
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+            if journal_mode:
+                cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+            if synchronous:
+                cursor.execute(f"PRAGMA synchronous = {synchronous}")
+        finally:
+            cursor.close()
+
+    logger.info(
+        f"SQLite pragmas: journal_mode={journal_mode}, synchronous={synchronous}, "
+        f"busy_timeout={busy_timeout}ms"
+    )
+
+
+def dispose_engines(app):
+    """
+    Drop pooled connections inherited from a parent process
+
+    Call in a forked server worker (gunicorn preload) so that it opens its
+    own connections instead of sharing the parent's sockets. The parent's
+    connections are left open for the parent.
+
+    Args:
+        app: Flask application whose engines to reset
+    """
+    from backend.extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -5,18 +5,31 @@ General utility functions for the PaaS platform
 
 import logging
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
+import base64
 import json
 
 
+# Log file handlers installed by setup_logging() in this process
+_logging_configured = False
+
+
 def setup_logging(log_file: Path, log_level: str = 'INFO'):
     """
     Setup logging configuration
     
+    Runs once per process; later calls (one per create_app()) return
+    without opening another log file handle.
+    
     Args:
         log_file: Path to log file
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    
     # Create log directory if it doesn't exist
     log_file.parent.mkdir(parents=True, exist_ok=True)
     
@@ -126,6 +139,58 @@ def generate_deployment_config(
     return config
 
 
+def parse_bool_arg(value: Any) -> bool:
+    """
+    Interpret a query string flag such as ?fresh=1
+    
+    Args:
+        value: Raw argument value (None if absent)
+    
+    Returns:
+        True for 1/true/yes/on (case-insensitive), False otherwise
+    """
+    if value is None:
+        return False
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode keyset pagination values as an opaque cursor
+    
+    Args:
+        values: JSON-serializable sort key of the last row returned
+    
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Cursor string from a previous response
+    
+    Returns:
+        List of sort key values
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
 def save_json(filepath: Path, data: Dict[str, Any]) -> None:
     """
     Save data to JSON file
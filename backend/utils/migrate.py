@@ -0,0 +1,74 @@
+"""
+Lazy Flask-Migrate
+Registers the `flask db` command group without importing Alembic at startup
+"""
+
+from typing import List, Optional
+import click
+
+
+class LazyMigrate:
+    """
+    Stand-in for flask_migrate.Migrate that defers the import
+
+    Importing Flask-Migrate pulls in Alembic (~120 ms), which only the
+    `flask db ...` commands need. init_app() registers a placeholder `db`
+    group; the real Migrate is bound the first time one of its commands is
+    looked up.
+    """
+
+    def __init__(self, app=None, db=None, directory: str = 'migrations'):
+        """Initialize the extension, optionally binding it to an application"""
+        self.app = None
+        self.db = db
+        self.directory = directory
+        self.migrate = None
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None, directory: Optional[str] = None):
+        """
+        Bind the extension to a Flask application
+
+        Args:
+            app: Flask application instance
+            db: Flask-SQLAlchemy instance
+            directory: Migration scripts directory
+        """
+        self.app = app
+        self.db = db or self.db
+        self.directory = directory or self.directory
+        app.cli.add_command(_LazyCommandGroup(self), name='db')
+
+    def load(self):
+        """
+        Import Flask-Migrate and bind it to the application
+
+        Returns:
+            The flask_migrate.Migrate instance
+        """
+        if self.migrate is None:
+            from flask_migrate import Migrate
+
+            self.migrate = Migrate(self.app, self.db, directory=self.directory)
+        return self.migrate
+
+
+class _LazyCommandGroup(click.Group):
+    """`db` group whose subcommands come from flask_migrate.cli on first use"""
+
+    def __init__(self, extension: LazyMigrate):
+        super().__init__(name='db', help='Perform database migrations.')
+        self.extension = extension
+
+    def _group(self) -> click.Group:
+        self.extension.load()
+        from flask_migrate.cli import db as db_group
+
+        return db_group
+
+    def list_commands(self, ctx) -> List[str]:
+        return self._group().list_commands(ctx)
+
+    def get_command(self, ctx, name: str):
+        return self._group().get_command(ctx, name)
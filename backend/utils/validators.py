@@ -8,6 +8,10 @@ from typing import Dict, Any, Tuple, List
 from flask import current_app
 import validators as val
 
+# Names of platform infrastructure (package cache, golden image builds); their
+# Terraform workdirs share TERRAFORM_STATE_DIR with deployments
+RESERVED_NAME_PREFIX = '_paas-'
+
 
 def validate_deployment_request(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     """
@@ -49,7 +53,10 @@ def validate_deployment_request(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     # Validate deployment name
     name = data.get('name')
     if not validate_deployment_name(name):
-        errors.append("Invalid deployment name. Must be alphanumeric with hyphens/underscores, 3-50 characters")
+        errors.append(
+            "Invalid deployment name. Must be alphanumeric with hyphens/underscores, 3-50 characters, "
+            f"and not start with {RESERVED_NAME_PREFIX}"
+        )
     
     # Validate resources if provided
     resources = data.get('resources', {})
@@ -97,7 +104,11 @@ def validate_deployment_name(name: str) -> bool:
     
     # Must be alphanumeric with hyphens/underscores, 3-50 characters
     pattern = r'^[a-zA-Z0-9_-]{3,50}$'
-    return bool(re.match(pattern, name))
+    if not re.match(pattern, name):
+        return False
+    
+    # Reserved for infrastructure, whose Terraform state a deployment must not share
+    return not name.lower().startswith(RESERVED_NAME_PREFIX)
 
 
 def validate_resources(resources: Dict[str, Any], deployment_type: str) -> List[str]:
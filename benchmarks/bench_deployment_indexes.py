@@ -0,0 +1,110 @@
+"""
+Benchmark: deployment table indexes
+Times the status and VM ID queries on 100k deployments in SQLite, first
+with only the original name index and then with the indexes added by
+migration 5f028bdae3da.
+
+Run with: python benchmarks/bench_deployment_indexes.py
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask import Flask  # noqa: E402
+from backend.extensions import db  # noqa: E402
+from backend.models.deployment import Deployment, DeploymentStatus  # noqa: E402
+
+ROWS = 100_000
+REPEAT = 15
+NEW_INDEXES = [
+    index for index in Deployment.__table__.indexes
+    if index.name != 'ix_deployments_name'
+]
+
+# Mostly deleted history, a few thousand live guests and a handful of failures
+STATUS_WEIGHTS = {
+    DeploymentStatus.DELETED.value: 90,
+    DeploymentStatus.RUNNING.value: 8,
+    DeploymentStatus.FAILED.value: 1,
+    DeploymentStatus.STOPPED.value: 1
+}
+
+QUERIES = {
+    'count_by_status(running)': lambda: Deployment.count_by_status(DeploymentStatus.RUNNING),
+    'filter_by_status(failed)': lambda: Deployment.filter_by_status(DeploymentStatus.FAILED),
+    'get_used_vm_ids()': lambda: Deployment.get_used_vm_ids(),
+    'list_page(status=running)': lambda: Deployment.list_page(statuses=['running'], fields=['id', 'name'])
+}
+
+
+def populate():
+    """Bulk insert ROWS deployments"""
+    rng = random.Random(42)
+    statuses = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=ROWS)
+    start = datetime(2023, 1, 1)
+    rows = [
+        {
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'name': f"app-{i}",
+            'deployment_type': 'lxc' if i % 3 else 'vm',
+            'framework': 'django',
+            'github_url': 'https://github.com/test/repo',
+            'status': status,
+            'created_at': start + timedelta(seconds=i * 30),
+            'vm_id': 100 + i
+        }
+        for i, status in enumerate(statuses)
+    ]
+    db.session.execute(Deployment.__table__.insert(), rows)
+    db.session.commit()
+
+
+def measure():
+    """Median milliseconds per query"""
+    results = {}
+    for label, query in QUERIES.items():
+        query()  # Warm up the page cache
+        samples = []
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            query()
+            samples.append((time.perf_counter() - started) * 1000)
+        results[label] = statistics.median(samples)
+    return results
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            for index in NEW_INDEXES:
+                index.drop(db.engine)
+
+            print(f"Inserting {ROWS} deployments...")
+            populate()
+
+            before = measure()
+            for index in NEW_INDEXES:
+                index.create(db.engine)
+            db.session.execute(db.text('ANALYZE'))
+            after = measure()
+
+    print(f"{'query':<28}{'no index (ms)':>16}{'indexed (ms)':>16}{'speedup':>10}")
+    for label in QUERIES:
+        print(f"{label:<28}{before[label]:>16.2f}{after[label]:>16.2f}{before[label] / after[label]:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark: deployment serialization
+Loads 10k deployments and serializes them with to_dict(), comparing the
+old layout (resources as a JSON string decoded by a property on every
+access, status behind a _status shadow column) with the consolidated
+model (native JSON resources, Enum status decoded once per row).
+
+Run with: python benchmarks/bench_deployment_serialization.py
+"""
+
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sqlalchemy as sa  # noqa: E402
+from sqlalchemy.orm import declarative_base  # noqa: E402
+from flask import Flask  # noqa: E402
+from backend.extensions import db  # noqa: E402
+from backend.models.deployment import Deployment, DeploymentStatus  # noqa: E402
+
+ROWS = 10_000
+REPEAT = 7
+
+LegacyBase = declarative_base()
+
+
+class LegacyDeployment(LegacyBase):
+    """The pre-consolidation mapping, reduced to what to_dict() touches"""
+
+    __tablename__ = 'legacy_deployments'
+
+    id = sa.Column(sa.String(36), primary_key=True)
+    name = sa.Column(sa.String(100), nullable=False)
+    deployment_type = sa.Column(sa.String(10), nullable=False)
+    framework = sa.Column(sa.String(50), nullable=False)
+    github_url = sa.Column(sa.String(500), nullable=False)
+    resources_json = sa.Column(sa.Text, nullable=True)
+    _status = sa.Column('status', sa.String(20), nullable=False)
+    created_at = sa.Column(sa.DateTime, nullable=False)
+    deployed_at = sa.Column(sa.DateTime, nullable=True)
+    deleted_at = sa.Column(sa.DateTime, nullable=True)
+    ip_address = sa.Column(sa.String(45), nullable=True)
+    vm_id = sa.Column(sa.Integer, nullable=True)
+    error_message = sa.Column(sa.Text, nullable=True)
+
+    @property
+    def resources(self):
+        return json.loads(self.resources_json) if self.resources_json else {}
+
+    @property
+    def status(self):
+        return DeploymentStatus(self._status) if self._status else DeploymentStatus.PENDING
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'deployment_type': self.deployment_type,
+            'framework': self.framework,
+            'github_url': self.github_url,
+            'resources': self.resources,
+            'status': self.status.value if isinstance(self.status, DeploymentStatus) else self.status,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'deployed_at': self.deployed_at.isoformat() if self.deployed_at else None,
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None,
+            'ip_address': self.ip_address,
+            'vm_id': self.vm_id,
+            'error_message': self.error_message
+        }
+
+
+def populate():
+    """Insert the same ROWS deployments into both tables"""
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(ROWS):
+        rows.append({
+            'id': str(uuid.UUID(int=i)),
+            'name': f"app-{i}",
+            'deployment_type': 'lxc' if i % 3 else 'vm',
+            'framework': 'django',
+            'github_url': 'https://github.com/test/repo',
+            'resources': {'cores': 2, 'memory': 2048, 'disk': 20},
+            'status': 'running' if i % 4 else 'deleted',
+            'created_at': start + timedelta(minutes=i),
+            'ip_address': f"10.0.{i // 250}.{i % 250}",
+            'vm_id': 100 + i
+        })
+
+    db.session.execute(Deployment.__table__.insert(), rows)
+    legacy_rows = [
+        dict({k: v for k, v in row.items() if k != 'resources'}, resources_json=json.dumps(row['resources']))
+        for row in rows
+    ]
+    db.session.execute(LegacyDeployment.__table__.insert(), legacy_rows)
+    db.session.commit()
+
+
+def measure(model):
+    """Median milliseconds to load every row and serialize it"""
+    samples = []
+    for _ in range(REPEAT):
+        db.session.expunge_all()
+        gc.collect()
+        started = time.perf_counter()
+        payload = [row.to_dict() for row in db.session.query(model).all()]
+        samples.append((time.perf_counter() - started) * 1000)
+        assert len(payload) == ROWS
+        del payload
+    return statistics.median(samples)
+
+
+def measure_cached(model):
+    """Median milliseconds to serialize rows already in the session"""
+    rows = db.session.query(model).all()
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        for row in rows:
+            row.to_dict()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            LegacyBase.metadata.create_all(db.engine)
+            print(f"Inserting {ROWS} deployments...")
+            populate()
+
+            results = {
+                'load + to_dict()': (measure(LegacyDeployment), measure(Deployment)),
+                'to_dict() on loaded rows': (measure_cached(LegacyDeployment), measure_cached(Deployment))
+            }
+            db.session.remove()
+
+    print(f"{'operation':<28}{'legacy (ms)':>14}{'native (ms)':>14}{'speedup':>10}")
+    for label, (legacy, native) in results.items():
+        print(f"{label:<28}{legacy:>14.2f}{native:>14.2f}{legacy / native:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: deployment stage event writes
+Compares the latency a deployment worker pays per recorded stage when each
+event is committed on its own with the batched StageEventWriter, on a WAL
+SQLite file.
+
+Run with: python benchmarks/bench_stage_events.py
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask import Flask  # noqa: E402
+from backend.api.stage_events import StageEventWriter, StageTimer  # noqa: E402
+from backend.extensions import db  # noqa: E402
+from backend.models.deployment import Deployment, DeploymentStatus  # noqa: E402
+from backend.models.deployment_event import DeploymentEvent  # noqa: E402
+from backend.utils.database import configure_sqlite, engine_options  # noqa: E402
+
+EVENTS = 1000
+
+
+def commit_each(row):
+    """One INSERT and COMMIT per stage, as a naive implementation would do"""
+    db.session.add(DeploymentEvent(**row))
+    db.session.commit()
+
+
+def measure(sink):
+    """Per-call latency in microseconds of recording EVENTS stages"""
+    timer = StageTimer('bench', sink=sink)
+    samples = []
+    for i in range(EVENTS):
+        started = time.perf_counter()
+        timer.record('command', timer.now(), index=i)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95)]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+        db.init_app(app)
+        writer = StageEventWriter(app)
+
+        with app.app_context():
+            configure_sqlite(db.engine, app.config)
+            db.create_all()
+            db.session.add(Deployment(
+                id='bench',
+                name='bench',
+                deployment_type='lxc',
+                framework='flask',
+                github_url='https://github.com/test/repo',
+                resources={},
+                status=DeploymentStatus.DEPLOYING,
+                created_at=datetime.utcnow()
+            ))
+            db.session.commit()
+
+            results = {'commit per event': measure(commit_each)}
+
+            started = time.perf_counter()
+            results['batched writer'] = measure(writer.record)
+            writer.flush()
+            drained = (time.perf_counter() - started) * 1000
+
+            assert DeploymentEvent.query.count() == 2 * EVENTS
+            db.session.remove()
+            db.engine.dispose()
+
+    print(f"{'sink':<20}{'p50 (us)':>12}{'p95 (us)':>12}")
+    for label, (p50, p95) in results.items():
+        print(f"{label:<20}{p50:>12.1f}{p95:>12.1f}")
+    print(f"batched writer: {EVENTS} events recorded and flushed in {drained:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
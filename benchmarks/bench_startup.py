@@ -0,0 +1,109 @@
+"""
+Benchmark: application startup and import time
+Starts a fresh interpreter per run, as each server worker does, and times
+`import app`, create_app(), a second create_app() in the same process and
+the first GET /health, in the development and production configurations.
+Then prints the heaviest imports from a `python -X importtime` report of
+`import app`.
+
+Run with: python benchmarks/bench_startup.py
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = 5
+TOP_IMPORTS = 15
+
+CONFIGS = ('development', 'production')
+PHASES = ('import app', 'create_app()', 'create_app() again', 'first /health')
+
+# Executed in a child interpreter; prints one duration per phase in milliseconds
+PROBE = """
+import time
+marks = [time.perf_counter()]
+from app import create_app
+marks.append(time.perf_counter())
+app = create_app()
+marks.append(time.perf_counter())
+create_app()
+marks.append(time.perf_counter())
+assert app.test_client().get('/health').status_code == 200
+marks.append(time.perf_counter())
+print(*[(end - start) * 1000 for start, end in zip(marks, marks[1:])])
+"""
+
+
+def child_env(workdir: Path, config_name: str = 'development'):
+    """Environment keeping every file the app writes inside workdir"""
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': str(ROOT),
+        'FLASK_CONFIG': config_name,
+        'SECRET_KEY': 'benchmark-secret-key',
+        'PROXMOX_PASSWORD': env.get('PROXMOX_PASSWORD', 'benchmark'),
+        'DATABASE_URL': f"sqlite:///{workdir / 'deployments.db'}",
+        'LOG_FILE': str(workdir / 'logs' / 'paas.log'),
+        'TERRAFORM_STATE_DIR': str(workdir / 'states'),
+        'TERRAFORM_PLUGIN_CACHE_DIR': str(workdir / 'plugin-cache')
+    })
+    return env
+
+
+def run_probe(workdir: Path, config_name: str):
+    """Time one cold start"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=workdir, env=child_env(workdir, config_name), capture_output=True, text=True, check=True
+    )
+    return [float(value) for value in result.stdout.split()[-len(PHASES):]]
+
+
+def import_report(workdir: Path):
+    """Top-level packages of `import app` by cumulative import time (ms)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=workdir, env=child_env(workdir), capture_output=True, text=True, check=True
+    )
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        # The outermost import of a package carries its cumulative time
+        packages[package] = max(packages.get(package, 0), int(cumulative) / 1000)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        # Runs alternate between configurations so machine noise hits both
+        samples = {name: [] for name in CONFIGS}
+        for _ in range(RUNS):
+            for name in CONFIGS:
+                samples[name].append(run_probe(workdir, name))
+        report = import_report(workdir)
+
+    print(f"{'phase (median ms)':<22}" + ''.join(f"{name:>14}" for name in CONFIGS))
+    for index, label in enumerate(PHASES):
+        print(f"{label:<22}" + ''.join(
+            f"{statistics.median(s[index] for s in samples[name]):>14.1f}" for name in CONFIGS
+        ))
+    print(f"{'worker boot':<22}" + ''.join(
+        f"{statistics.median(s[0] + s[1] for s in samples[name]):>14.1f}" for name in CONFIGS
+    ))
+
+    print(f"\n{'package':<28}{'import (ms)':>14}")
+    for package, ms in report[:TOP_IMPORTS]:
+        print(f"{package:<28}{ms:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
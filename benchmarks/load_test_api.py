@@ -0,0 +1,216 @@
+"""
+Benchmark: API throughput under gunicorn
+Seeds a SQLite database with deployments, starts `gunicorn -c
+gunicorn.conf.py wsgi:app` in the production configuration and drives
+GET /api/deployments and GET /api/stats from keep-alive client threads
+while a few SSE clients hold /api/deployments/events open, as dashboards do;
+streams over STREAM_LIMIT are refused with 503, leaving threads for the API.
+Each server layout (GUNICORN_WORKERS x GUNICORN_THREADS) gets a fresh
+server; prints requests per second, latency percentiles and errors.
+
+Run with: python benchmarks/load_test_api.py
+"""
+
+import http.client
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from flask import Flask  # noqa: E402
+from backend.extensions import db  # noqa: E402
+from backend.models.deployment import Deployment, DeploymentStatus  # noqa: E402
+
+ROWS = 1000
+CLIENTS = 32
+SSE_CLIENTS = 8
+DURATION = 5.0
+PATHS = ('/api/deployments?limit=50', '/api/stats')
+
+# (workers, threads): a thread-starved layout and the shipped default
+LAYOUTS = ((1, 4), (1, 32))
+
+
+def seed(database_path: Path):
+    """Create the schema and insert ROWS deployments"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{database_path}"
+    db.init_app(app)
+
+    rng = random.Random(42)
+    statuses = [status.value for status in DeploymentStatus]
+    start = datetime(2024, 1, 1)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(Deployment.__table__.insert(), [
+            {
+                'id': str(uuid.UUID(int=rng.getrandbits(128))),
+                'name': f"app-{i}",
+                'deployment_type': 'lxc' if i % 3 else 'vm',
+                'framework': rng.choice(['django', 'flask', 'nodejs']),
+                'github_url': 'https://github.com/test/repo',
+                'status': rng.choice(statuses),
+                'created_at': start + timedelta(minutes=i),
+                'vm_id': 100 + i
+            }
+            for i in range(ROWS)
+        ])
+        db.session.commit()
+        db.engine.dispose()
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: Path, port: int, workers: int, threads: int):
+    """Start gunicorn and wait until /health answers"""
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': str(ROOT),
+        'FLASK_CONFIG': 'production',
+        'SECRET_KEY': 'benchmark-secret-key',
+        'PROXMOX_PASSWORD': env.get('PROXMOX_PASSWORD', 'benchmark'),
+        'DATABASE_URL': f"sqlite:///{workdir / 'deployments.db'}",
+        'LOG_FILE': str(workdir / 'logs' / 'paas.log'),
+        'TERRAFORM_STATE_DIR': str(workdir / 'states'),
+        'LOG_LEVEL': 'WARNING',
+        'APP_HOST': '127.0.0.1',
+        'APP_PORT': str(port),
+        'GUNICORN_WORKERS': str(workers),
+        'GUNICORN_THREADS': str(threads),
+        'GUNICORN_GRACEFUL_TIMEOUT': '5'
+    })
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', str(ROOT / 'gunicorn.conf.py'),
+         '--access-logfile', '/dev/null', 'wsgi:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited: {server.stderr.read().decode()[-2000:]}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('gunicorn did not become ready')
+
+
+def hold_event_stream(port: int, stop: threading.Event):
+    """Keep one SSE connection open until stop is set"""
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=DURATION + 10)
+        conn.request('GET', '/api/deployments/events')
+        response = conn.getresponse()
+        conn.sock.settimeout(0.5)
+        while not stop.is_set():
+            try:
+                response.read1(1024)
+            except (socket.timeout, TimeoutError):
+                pass
+        conn.close()
+    except OSError:
+        pass
+
+
+def client(port: int, deadline: float, latencies: list, errors: list):
+    """Issue requests over one keep-alive connection until the deadline"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    index = 0
+    while time.monotonic() < deadline:
+        path = PATHS[index % len(PATHS)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+    conn.close()
+
+
+def run_layout(workdir: Path, workers: int, threads: int):
+    """Load one server layout; returns (req/s, p50 ms, p95 ms, errors)"""
+    port = free_port()
+    server = start_server(workdir, port, workers, threads)
+    stop = threading.Event()
+    streams = [
+        threading.Thread(target=hold_event_stream, args=(port, stop), daemon=True)
+        for _ in range(SSE_CLIENTS)
+    ]
+    try:
+        for stream in streams:
+            stream.start()
+        time.sleep(0.5)
+
+        latencies, errors = [], []
+        deadline = time.monotonic() + DURATION
+        clients = [
+            threading.Thread(target=client, args=(port, deadline, latencies, errors))
+            for _ in range(CLIENTS)
+        ]
+        started = time.monotonic()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.monotonic() - started
+    finally:
+        stop.set()
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    if not latencies:
+        return 0.0, float('nan'), float('nan'), len(errors)
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return len(latencies) / elapsed, statistics.median(latencies), p95, len(errors)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        print(f"Seeding {ROWS} deployments...")
+        seed(workdir / 'deployments.db')
+
+        print(f"{CLIENTS} API clients and {SSE_CLIENTS} SSE streams, {DURATION:.0f}s per layout\n")
+        print(f"{'workers x threads':<20}{'req/s':>10}{'p50 (ms)':>12}{'p95 (ms)':>12}{'errors':>9}")
+        for workers, threads in LAYOUTS:
+            rps, p50, p95, errors = run_layout(workdir, workers, threads)
+            print(f"{f'{workers} x {threads}':<20}{rps:>10.0f}{p50:>12.1f}{p95:>12.1f}{errors:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,18 +8,26 @@ import sys
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Check if .env exists, if not create from example
-env_path = Path('.env')
-if not env_path.exists():
-    env_example = Path('.env.example')
-    if env_example.exists():
-        print("⚠️  .env file not found. Creating from .env.example...")
-        import shutil
-        shutil.copy(env_example, env_path)
-        print("✅ .env created. Please configure it with your settings.")
-    else:
-        print("❌ Neither .env nor .env.example found!")
-        print("   Please create a .env file with required configuration.")
+
+def ensure_env_file():
+    """
+    Create .env from .env.example on first run
+    
+    Only called by the development entry point (python app.py); importing
+    this module never writes files.
+    """
+    env_path = Path('.env')
+    if not env_path.exists():
+        env_example = Path('.env.example')
+        if env_example.exists():
+            print("⚠️  .env file not found. Creating from .env.example...")
+            import shutil
+            shutil.copy(env_example, env_path)
+            print("✅ .env created. Please configure it with your settings.")
+        else:
+            print("❌ Neither .env nor .env.example found!")
+            print("   Please create a .env file with required configuration.")
+
 
 # Load environment variables
 load_dotenv()
@@ -39,6 +47,45 @@ class Config:
     APP_PORT = int(os.getenv('APP_PORT', 5000))
     MAX_DEPLOYMENTS = int(os.getenv('MAX_DEPLOYMENTS', 10))
     
+    # Production WSGI server (gunicorn.conf.py). Job queue, live output and SSE
+    # events are per process, so one worker with many threads is the default
+    GUNICORN_WORKERS = int(os.getenv('GUNICORN_WORKERS', 1))
+    GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', 32))  # Request threads per worker; each SSE or long-poll client holds one
+    STREAM_LIMIT = int(os.getenv('STREAM_LIMIT', max(1, GUNICORN_THREADS * 3 // 4)))  # SSE streams and long-polls open at once per worker; must stay below GUNICORN_THREADS
+    STREAM_RETRY_AFTER = int(os.getenv('STREAM_RETRY_AFTER', 15))  # Seconds a client turned away for lack of a stream slot waits
+    GUNICORN_TIMEOUT = int(os.getenv('GUNICORN_TIMEOUT', 60))  # Seconds without a worker heartbeat before it is restarted
+    GUNICORN_GRACEFUL_TIMEOUT = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 900))  # Time a stopping worker gets to finish running deployments
+    GUNICORN_KEEPALIVE = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+    GUNICORN_MAX_REQUESTS = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))  # Recycle workers after N requests (0 = never)
+    GUNICORN_MAX_REQUESTS_JITTER = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+    GUNICORN_PRELOAD = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+    
+    # Deployment Job Queue (background workers running provision/deploy)
+    DEPLOY_WORKERS = int(os.getenv('DEPLOY_WORKERS', 4))
+    DEPLOY_QUEUE_SIZE = int(os.getenv('DEPLOY_QUEUE_SIZE', 500))
+    DEPLOY_LEASE_INTERVAL = int(os.getenv('DEPLOY_LEASE_INTERVAL', 30))  # Seconds between lease renewals of queued and running deployments
+    DEPLOY_LEASE_TIMEOUT = int(os.getenv('DEPLOY_LEASE_TIMEOUT', 120))  # Unrenewed for this long, an in-flight deployment can be retried
+    
+    # Live command output kept in memory per deployment (ring buffer, bytes)
+    DEPLOY_OUTPUT_BUFFER_BYTES = int(os.getenv('DEPLOY_OUTPUT_BUFFER_BYTES', 256 * 1024))
+    DEPLOY_OUTPUT_RETAIN = int(os.getenv('DEPLOY_OUTPUT_RETAIN', 50))  # Finished deployments whose output stays tail-able
+    
+    # Guest commands run as one uploaded, resumable script (False = one SSH channel per command)
+    DEPLOY_BATCH_SCRIPT = os.getenv('DEPLOY_BATCH_SCRIPT', 'True').lower() == 'true'
+    DEPLOY_SCRIPT_DIR = os.getenv('DEPLOY_SCRIPT_DIR', '/var/lib/paas-deploy')  # Script and step markers on the guest
+    
+    # Server-Sent Events stream of deployment status changes (/api/deployments/events)
+    DEPLOYMENT_EVENTS_BACKLOG = int(os.getenv('DEPLOYMENT_EVENTS_BACKLOG', 256))  # Events replayed to reconnecting clients
+    DEPLOYMENT_EVENTS_QUEUE_SIZE = int(os.getenv('DEPLOYMENT_EVENTS_QUEUE_SIZE', 100))  # Per-client buffer before it is dropped
+    DEPLOYMENT_EVENTS_HEARTBEAT = int(os.getenv('DEPLOYMENT_EVENTS_HEARTBEAT', 15))
+    
+    # /api/stats result cache (seconds); also invalidated on every status change
+    STATS_CACHE_TTL = float(os.getenv('STATS_CACHE_TTL', 10))
+    
+    # Deployment timeline (deployment_events table); stage rows are inserted in batches
+    DEPLOYMENT_TIMELINE_FLUSH_INTERVAL = float(os.getenv('DEPLOYMENT_TIMELINE_FLUSH_INTERVAL', 0.5))  # Seconds
+    DEPLOYMENT_TIMELINE_BATCH_SIZE = int(os.getenv('DEPLOYMENT_TIMELINE_BATCH_SIZE', 100))
+    
     # Proxmox Configuration
     PROXMOX_URL = os.getenv('PROXMOX_URL', 'https://192.168.1.100:8006/api2/json')
     PROXMOX_USER = os.getenv('PROXMOX_USER', 'root@pam')
@@ -46,6 +93,41 @@ class Config:
     PROXMOX_NODE = os.getenv('PROXMOX_NODE', 'pve')
     PROXMOX_STORAGE = os.getenv('PROXMOX_STORAGE', 'local-lvm')
     PROXMOX_NETWORK_BRIDGE = os.getenv('PROXMOX_NETWORK_BRIDGE', 'vmbr0')
+    PROXMOX_TIMEOUT = int(os.getenv('PROXMOX_TIMEOUT', 10))  # Seconds per API request
+    PROXMOX_POOL_SIZE = int(os.getenv('PROXMOX_POOL_SIZE', 16))  # Keep-alive connections to the API
+    
+    # Cluster inventory snapshot served to the dashboard (seconds)
+    PROXMOX_INVENTORY_TTL = int(os.getenv('PROXMOX_INVENTORY_TTL', 30))
+    PROXMOX_INVENTORY_INTERVAL = int(os.getenv('PROXMOX_INVENTORY_INTERVAL', 15))
+    PROXMOX_INVENTORY_IDLE_TIMEOUT = int(os.getenv('PROXMOX_INVENTORY_IDLE_TIMEOUT', 600))
+    
+    # Guest ID allocation: bitmap over this range, rebuilt from the database and the
+    # inventory snapshot every VM_ID_SYNC_INTERVAL seconds
+    VM_ID_RANGE_START = int(os.getenv('VM_ID_RANGE_START', 100))
+    VM_ID_RANGE_END = int(os.getenv('VM_ID_RANGE_END', 99999))
+    VM_ID_RESERVATION_TTL = int(os.getenv('VM_ID_RESERVATION_TTL', 3600))  # Seconds before an unclaimed reservation is reclaimed
+    VM_ID_SYNC_INTERVAL = int(os.getenv('VM_ID_SYNC_INTERVAL', 300))
+    
+    # Golden images: per-language templates with system packages baked in
+    GOLDEN_IMAGES_ENABLED = os.getenv('GOLDEN_IMAGES_ENABLED', 'True').lower() == 'true'
+    GOLDEN_IMAGE_LINKED_CLONE = os.getenv('GOLDEN_IMAGE_LINKED_CLONE', 'True').lower() == 'true'  # VMs; needs snapshot-capable storage
+    GOLDEN_IMAGE_SHUTDOWN_TIMEOUT = int(os.getenv('GOLDEN_IMAGE_SHUTDOWN_TIMEOUT', 120))
+    
+    # Package cache: nginx proxy caching apt, npm and pip downloads for all guests.
+    # PACKAGE_CACHE_URL points at an existing cache instead of the platform-managed one
+    PACKAGE_CACHE_ENABLED = os.getenv('PACKAGE_CACHE_ENABLED', 'True').lower() == 'true'
+    PACKAGE_CACHE_URL = os.getenv('PACKAGE_CACHE_URL', '')  # e.g. http://10.0.0.5:3142
+    PACKAGE_CACHE_PORT = int(os.getenv('PACKAGE_CACHE_PORT', 3142))
+    PACKAGE_CACHE_MAX_SIZE = os.getenv('PACKAGE_CACHE_MAX_SIZE', '40g')
+    PACKAGE_CACHE_CORES = int(os.getenv('PACKAGE_CACHE_CORES', 2))
+    PACKAGE_CACHE_MEMORY = int(os.getenv('PACKAGE_CACHE_MEMORY', 1024))  # MB
+    PACKAGE_CACHE_DISK = int(os.getenv('PACKAGE_CACHE_DISK', 50))  # GB
+    
+    # IP discovery after provisioning (exponential backoff with jitter, overall deadline)
+    IP_WAIT_TIMEOUT = float(os.getenv('IP_WAIT_TIMEOUT', 180))
+    IP_WAIT_INITIAL_DELAY = float(os.getenv('IP_WAIT_INITIAL_DELAY', 0.5))
+    IP_WAIT_MAX_DELAY = float(os.getenv('IP_WAIT_MAX_DELAY', 5))
+    DHCP_LEASES_FILE = os.getenv('DHCP_LEASES_FILE', '')  # e.g. /var/lib/misc/dnsmasq.leases
     
     # SSH Configuration for VMs/LXC
     SSH_USER = os.getenv('SSH_USER', 'root')
@@ -57,6 +139,16 @@ class Config:
     SSH_JUMP_HOST = os.getenv('SSH_JUMP_HOST', '')  # e.g., 192.168.126.50 or empty to disable
     SSH_JUMP_USER = os.getenv('SSH_JUMP_USER', 'root')
     SSH_JUMP_PASSWORD = os.getenv('SSH_JUMP_PASSWORD', '')
+    SSH_JUMP_POOL_SIZE = int(os.getenv('SSH_JUMP_POOL_SIZE', 4))  # Pooled jump-host logins per process
+    SSH_JUMP_MAX_LEASES = int(os.getenv('SSH_JUMP_MAX_LEASES', 8))  # Deployments sharing one transport before another is opened
+    SSH_JUMP_KEEPALIVE = int(os.getenv('SSH_JUMP_KEEPALIVE', 30))
+    SSH_JUMP_IDLE_TIMEOUT = int(os.getenv('SSH_JUMP_IDLE_TIMEOUT', 300))
+    
+    # SSH readiness probe (TCP connect + banner read, exponential backoff with jitter)
+    SSH_WAIT_TIMEOUT = float(os.getenv('SSH_WAIT_TIMEOUT', 300))
+    SSH_PROBE_TIMEOUT = float(os.getenv('SSH_PROBE_TIMEOUT', 3))
+    SSH_WAIT_INITIAL_DELAY = float(os.getenv('SSH_WAIT_INITIAL_DELAY', 0.5))
+    SSH_WAIT_MAX_DELAY = float(os.getenv('SSH_WAIT_MAX_DELAY', 5))
     
     # VM/LXC Templates
     VM_TEMPLATE = os.getenv('VM_TEMPLATE', 'ubuntu-22-cloudinit')
@@ -65,6 +157,9 @@ class Config:
     # Terraform Settings
     TERRAFORM_DIR = Path(os.getenv('TERRAFORM_DIR', './terraform'))
     TERRAFORM_STATE_DIR = Path(os.getenv('TERRAFORM_STATE_DIR', './terraform/states'))
+    TERRAFORM_MAX_PARALLEL = int(os.getenv('TERRAFORM_MAX_PARALLEL', 4))  # Concurrent applies per process
+    TERRAFORM_LOG_LEVEL = os.getenv('TERRAFORM_LOG_LEVEL', '')  # Sets TF_LOG (e.g. INFO, DEBUG); output goes to the deployment log
+    TERRAFORM_PLUGIN_CACHE_DIR = Path(os.getenv('TERRAFORM_PLUGIN_CACHE_DIR', './terraform/.plugin-cache'))
     
     # Default VM Settings
     DEFAULT_VM_MEMORY = int(os.getenv('DEFAULT_VM_MEMORY', 2048))
@@ -83,6 +178,18 @@ class Config:
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///deployments.db')
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = os.getenv('SQLALCHEMY_TRACK_MODIFICATIONS', 'False').lower() == 'true'
+    # Run db.create_all() in create_app; production leaves the schema to `flask db upgrade`
+    AUTO_CREATE_TABLES = os.getenv('AUTO_CREATE_TABLES', 'True').lower() == 'true'
+    # Connection pool for file and server databases (see backend/utils/database.py)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # Reconnect after this many seconds
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    # SQLite only: WAL lets the API read while deployment workers commit
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # Milliseconds a writer waits for the lock
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -190,6 +297,7 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
+    AUTO_CREATE_TABLES = os.getenv('AUTO_CREATE_TABLES', 'False').lower() == 'true'
     
     @staticmethod
     def init_app():
@@ -209,6 +317,7 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     DATABASE_URL = 'sqlite:///:memory:'
+    SQLALCHEMY_DATABASE_URI = DATABASE_URL
 
 
 # Configuration dictionary
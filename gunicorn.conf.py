@@ -0,0 +1,62 @@
+"""
+Gunicorn configuration for PaaS Platform
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+
+Request handling and deployments use separate thread pools in each worker:
+gthread request threads only serve the API (reads, SSE streams, long-poll
+output), while POST /api/deploy hands the provisioning pipeline to the
+DeploymentJobQueue pool (DEPLOY_WORKERS threads). All settings come from
+Config and can be overridden with the GUNICORN_* environment variables.
+"""
+
+from config import Config
+
+bind = f"{Config.APP_HOST}:{Config.APP_PORT}"
+
+# Threaded workers: a slow SSE client or long-poll ties up one thread, not a process
+worker_class = 'gthread'
+workers = Config.GUNICORN_WORKERS
+threads = Config.GUNICORN_THREADS
+
+# Streams beyond STREAM_LIMIT get a 503, so they can never hold every request thread
+if Config.STREAM_LIMIT >= threads:
+    raise ValueError(f"STREAM_LIMIT ({Config.STREAM_LIMIT}) must be below GUNICORN_THREADS ({threads})")
+
+timeout = Config.GUNICORN_TIMEOUT
+# A stopping worker waits for its running deployments (see worker_exit) up to this long
+graceful_timeout = Config.GUNICORN_GRACEFUL_TIMEOUT
+keepalive = Config.GUNICORN_KEEPALIVE
+
+max_requests = Config.GUNICORN_MAX_REQUESTS
+max_requests_jitter = Config.GUNICORN_MAX_REQUESTS_JITTER
+
+# Import and build the app once in the master; workers fork from it. Background
+# threads (job queue, event writer) start lazily, so none exist at fork time
+preload_app = Config.GUNICORN_PRELOAD
+
+accesslog = '-'
+loglevel = Config.LOG_LEVEL.lower()
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections"""
+    import sys
+
+    wsgi = sys.modules.get('wsgi')
+    if wsgi is not None:
+        from backend.utils.database import dispose_engines
+
+        dispose_engines(wsgi.app)
+
+
+def worker_exit(server, worker):
+    """Let running deployments finish before the worker exits; queued ones are dropped"""
+    from backend.extensions import job_queue
+
+    stats = job_queue.stats()
+    if stats['active']:
+        server.log.info(f"Worker {worker.pid} waiting for {stats['active']} running deployments")
+    dropped = job_queue.shutdown(wait=True)
+    if dropped:
+        # Their rows stay pending and become retryable once the lease expires
+        server.log.warning(f"Worker {worker.pid} dropped {dropped} queued deployments")
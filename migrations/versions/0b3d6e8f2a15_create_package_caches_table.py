@@ -0,0 +1,44 @@
+"""create package_caches table
+
+The platform-managed apt/npm/pip caching proxy guest.
+
+Revision ID: 0b3d6e8f2a15
+Revises: f7a2c9d4e1b3
+Create Date: 2026-10-19 14:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b3d6e8f2a15'
+down_revision = 'f7a2c9d4e1b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created it on fresh databases
+    if sa.inspect(op.get_bind()).has_table('package_caches'):
+        return
+
+    op.create_table(
+        'package_caches',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('vm_id', sa.Integer(), nullable=True),
+        sa.Column('ip_address', sa.String(length=50), nullable=True),
+        sa.Column('port', sa.Integer(), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('ready_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table('package_caches'):
+        return
+
+    op.drop_table('package_caches')
@@ -0,0 +1,41 @@
+"""create deployment_checkpoints table
+
+Completed pipeline stages that POST /api/deployments/<id>/retry resumes after.
+
+Revision ID: 3c9e1d7b5a48
+Revises: 0b3d6e8f2a15
+Create Date: 2026-10-20 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1d7b5a48'
+down_revision = '0b3d6e8f2a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created it on fresh databases
+    if sa.inspect(op.get_bind()).has_table('deployment_checkpoints'):
+        return
+
+    op.create_table(
+        'deployment_checkpoints',
+        sa.Column('deployment_id', sa.String(length=36), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=False),
+        sa.Column('detail', sa.JSON(none_as_null=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['deployment_id'], ['deployments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('deployment_id', 'stage')
+    )
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table('deployment_checkpoints'):
+        return
+
+    op.drop_table('deployment_checkpoints')
@@ -0,0 +1,57 @@
+"""add deployment status indexes
+
+Indexes for count_by_status/filter_by_status and status-filtered listings
+(both served by the (status, created_at) prefix), keyset pagination on
+(created_at, id) and the active VM ID lookup.
+
+Revision ID: 5f028bdae3da
+Revises: 8b8a24883df7
+Create Date: 2026-10-18 22:45:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f028bdae3da'
+down_revision = '8b8a24883df7'
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text("status != 'deleted'")
+
+
+def _existing_indexes():
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('deployments')}
+
+
+def upgrade():
+    # db.create_all() may already have created them on fresh databases
+    existing = _existing_indexes()
+
+    if 'ix_deployments_status_created_at' not in existing:
+        op.create_index('ix_deployments_status_created_at', 'deployments', ['status', 'created_at'], unique=False)
+    if 'ix_deployments_created_at_id' not in existing:
+        op.create_index('ix_deployments_created_at_id', 'deployments', ['created_at', 'id'], unique=False)
+    if 'ix_deployments_vm_id_active' not in existing:
+        op.create_index(
+            'ix_deployments_vm_id_active',
+            'deployments',
+            ['vm_id'],
+            unique=False,
+            sqlite_where=ACTIVE,
+            postgresql_where=ACTIVE
+        )
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name in (
+        'ix_deployments_vm_id_active',
+        'ix_deployments_created_at_id',
+        'ix_deployments_status_created_at',
+        'ix_deployments_status'  # Created by earlier versions of this revision
+    ):
+        if name in existing:
+            op.drop_index(name, table_name='deployments')
@@ -0,0 +1,48 @@
+"""create deployments table
+
+Baseline for databases created by db.create_all() before migrations were
+introduced; the table is only created when it does not exist yet.
+
+Revision ID: 8b8a24883df7
+Revises: 
+Create Date: 2026-10-18 22:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b8a24883df7'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('deployments'):
+        return
+
+    op.create_table(
+        'deployments',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('deployment_type', sa.String(length=10), nullable=False),
+        sa.Column('framework', sa.String(length=50), nullable=False),
+        sa.Column('github_url', sa.String(length=500), nullable=False),
+        sa.Column('resources_json', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('deployed_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('vm_id', sa.Integer(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_deployments_name', 'deployments', ['name'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_deployments_name', table_name='deployments')
+    op.drop_table('deployments')
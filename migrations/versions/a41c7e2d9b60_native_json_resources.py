@@ -0,0 +1,55 @@
+"""native json resources
+
+Replace the resources_json text column with a native JSON resources column
+and copy the existing values across. The status column keeps its layout
+(plain strings); the model now maps it with a non-native Enum type.
+
+Revision ID: a41c7e2d9b60
+Revises: 5f028bdae3da
+Create Date: 2026-10-18 23:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41c7e2d9b60'
+down_revision = '5f028bdae3da'
+branch_labels = None
+depends_on = None
+
+
+def _columns():
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns('deployments')}
+
+
+def _copy(source, target, cast_to):
+    """Copy one column into another in a single UPDATE"""
+    if op.get_bind().dialect.name == 'postgresql':
+        value = f"CAST({source} AS {cast_to})"
+    else:
+        # SQLite stores JSON as text, so the serialized value copies as-is
+        value = source
+    op.execute(f"UPDATE deployments SET {target} = {value} WHERE {source} IS NOT NULL")
+
+
+def upgrade():
+    # db.create_all() already creates the new layout on fresh databases
+    if 'resources_json' not in _columns():
+        return
+
+    op.add_column('deployments', sa.Column('resources', sa.JSON(), nullable=True))
+    _copy('resources_json', 'resources', 'JSON')
+    with op.batch_alter_table('deployments') as batch_op:
+        batch_op.drop_column('resources_json')
+
+
+def downgrade():
+    if 'resources' not in _columns():
+        return
+
+    op.add_column('deployments', sa.Column('resources_json', sa.Text(), nullable=True))
+    _copy('resources', 'resources_json', 'TEXT')
+    with op.batch_alter_table('deployments') as batch_op:
+        batch_op.drop_column('resources')
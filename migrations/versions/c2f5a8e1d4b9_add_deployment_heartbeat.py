@@ -0,0 +1,40 @@
+"""add deployment heartbeat
+
+Lease column renewed while a server process has the deployment queued or
+running; POST /api/deployments/<id>/retry treats an expired lease on an
+in-flight deployment as an interrupted run.
+
+Revision ID: c2f5a8e1d4b9
+Revises: 3c9e1d7b5a48
+Create Date: 2026-10-21 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f5a8e1d4b9'
+down_revision = '3c9e1d7b5a48'
+branch_labels = None
+depends_on = None
+
+
+def _columns():
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns('deployments')}
+
+
+def upgrade():
+    # db.create_all() may already have created it on fresh databases
+    if 'heartbeat_at' in _columns():
+        return
+
+    op.add_column('deployments', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    if 'heartbeat_at' not in _columns():
+        return
+
+    with op.batch_alter_table('deployments') as batch_op:
+        batch_op.drop_column('heartbeat_at')
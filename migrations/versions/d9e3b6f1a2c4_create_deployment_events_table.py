@@ -0,0 +1,49 @@
+"""create deployment_events table
+
+Append-only stage timings written by the deployment pipeline.
+
+Revision ID: d9e3b6f1a2c4
+Revises: a41c7e2d9b60
+Create Date: 2026-10-18 23:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e3b6f1a2c4'
+down_revision = 'a41c7e2d9b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created it on fresh databases
+    if sa.inspect(op.get_bind()).has_table('deployment_events'):
+        return
+
+    op.create_table(
+        'deployment_events',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('deployment_id', sa.String(length=36), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('offset_seconds', sa.Float(), nullable=False),
+        sa.Column('duration_seconds', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('detail', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['deployment_id'], ['deployments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_deployment_events_deployment_id_id', 'deployment_events', ['deployment_id', 'id'], unique=False)
+    op.create_index('ix_deployment_events_stage_created_at', 'deployment_events', ['stage', 'created_at'], unique=False)
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table('deployment_events'):
+        return
+
+    op.drop_index('ix_deployment_events_stage_created_at', table_name='deployment_events')
+    op.drop_index('ix_deployment_events_deployment_id_id', table_name='deployment_events')
+    op.drop_table('deployment_events')
@@ -0,0 +1,42 @@
+"""create vm_id_reservations table
+
+Guest IDs claimed by the VM ID allocator until the deployment row holds them.
+
+Revision ID: e5c8a1f3b7d2
+Revises: d9e3b6f1a2c4
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c8a1f3b7d2'
+down_revision = 'd9e3b6f1a2c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created it on fresh databases
+    if sa.inspect(op.get_bind()).has_table('vm_id_reservations'):
+        return
+
+    op.create_table(
+        'vm_id_reservations',
+        sa.Column('vm_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('deployment_id', sa.String(length=36), nullable=True),
+        sa.Column('reserved_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('vm_id')
+    )
+    op.create_index('ix_vm_id_reservations_expires_at', 'vm_id_reservations', ['expires_at'], unique=False)
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table('vm_id_reservations'):
+        return
+
+    op.drop_index('ix_vm_id_reservations_expires_at', table_name='vm_id_reservations')
+    op.drop_table('vm_id_reservations')
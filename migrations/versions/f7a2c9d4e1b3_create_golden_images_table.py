@@ -0,0 +1,48 @@
+"""create golden_images table
+
+Per-language Proxmox templates that deployments clone from.
+
+Revision ID: f7a2c9d4e1b3
+Revises: e5c8a1f3b7d2
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a2c9d4e1b3'
+down_revision = 'e5c8a1f3b7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created it on fresh databases
+    if sa.inspect(op.get_bind()).has_table('golden_images'):
+        return
+
+    op.create_table(
+        'golden_images',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('language', sa.String(length=20), nullable=False),
+        sa.Column('deployment_type', sa.String(length=10), nullable=False),
+        sa.Column('version', sa.String(length=16), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('vm_id', sa.Integer(), nullable=True),
+        sa.Column('node', sa.String(length=50), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('ready_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_golden_images_lookup', 'golden_images', ['language', 'deployment_type', 'status'], unique=False)
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table('golden_images'):
+        return
+
+    op.drop_index('ix_golden_images_lookup', table_name='golden_images')
+    op.drop_table('golden_images')
@@ -123,9 +123,12 @@ const api = {
     }),
 
     /**
-     * Get all deployments
+     * Get a page of deployments (params: limit, cursor, status, type, framework, fields)
      */
-    getDeployments: () => api.request('/deployments'),
+    getDeployments: (params = {}) => {
+        const query = new URLSearchParams(params).toString();
+        return api.request(`/deployments${query ? `?${query}` : ''}`);
+    },
 
     /**
      * Get deployment by ID
@@ -31,9 +31,15 @@ resource "proxmox_virtual_environment_vm" "deployment_vm" {
   node_name = var.proxmox_node
   vm_id     = var.vm_id
   
-  # Clone settings (if using template)
-  # For bpg provider, cloning is handled differently. 
-  # We will use a simple ISO boot or Template clone if specified.
+  # Clone from the framework's golden image when the platform has one
+  dynamic "clone" {
+    for_each = var.clone_template_id > 0 ? [1] : []
+    content {
+      vm_id     = var.clone_template_id
+      node_name = var.clone_node != "" ? var.clone_node : var.proxmox_node
+      full      = var.clone_full
+    }
+  }
   
   cpu {
     cores = var.cores
@@ -84,6 +90,15 @@ resource "proxmox_virtual_environment_container" "deployment_lxc" {
   node_name   = var.proxmox_node
   vm_id       = var.vm_id
   
+  # Clone from the framework's golden image when the platform has one
+  dynamic "clone" {
+    for_each = var.clone_template_id > 0 ? [1] : []
+    content {
+      vm_id     = var.clone_template_id
+      node_name = var.clone_node != "" ? var.clone_node : var.proxmox_node
+    }
+  }
+  
   initialization {
     hostname = var.deployment_name
     
@@ -103,9 +118,13 @@ resource "proxmox_virtual_environment_container" "deployment_lxc" {
     bridge = var.network_bridge
   }
   
-  operating_system {
-    template_file_id = var.os_template
-    type             = "ubuntu" # or debian, etc.
+  # Cloned containers inherit the template's root filesystem
+  dynamic "operating_system" {
+    for_each = var.clone_template_id > 0 ? [] : [1]
+    content {
+      template_file_id = var.os_template
+      type             = "ubuntu" # or debian, etc.
+    }
   }
 
   # Container resources
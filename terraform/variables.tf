@@ -131,6 +131,25 @@ variable "vm_template" {
   default     = ""
 }
 
+# Golden image cloning (set by the platform when a template is ready)
+variable "clone_template_id" {
+  description = "Proxmox template ID to clone from (0 = install from os_template/ISO)"
+  type        = number
+  default     = 0
+}
+
+variable "clone_node" {
+  description = "Node holding the template to clone"
+  type        = string
+  default     = ""
+}
+
+variable "clone_full" {
+  description = "Full clone instead of a linked clone of the template (VMs only)"
+  type        = bool
+  default     = false
+}
+
 # SSH Configuration
 variable "ssh_public_key" {
   description = "SSH public key for access"
@@ -0,0 +1,25 @@
+"""
+Shared fixtures for the unit tests
+Run with: pytest tests/
+"""
+
+import pytest
+from flask import Flask
+from config import Config
+from backend.extensions import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Fixture for an application with an in-memory database and temp Terraform dirs"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SUPPORTED_FRAMEWORKS'] = Config.SUPPORTED_FRAMEWORKS
+    app.config['TERRAFORM_DIR'] = tmp_path / 'terraform'
+    app.config['TERRAFORM_STATE_DIR'] = tmp_path / 'states'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
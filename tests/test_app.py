@@ -102,6 +102,7 @@ class TestValidators:
         assert validate_deployment_name("a" * 51) is False  # Too long
         assert validate_deployment_name("my app") is False  # Contains space
         assert validate_deployment_name("my@app") is False  # Invalid character
+        assert validate_deployment_name("_paas-package-cache") is False  # Reserved for infrastructure
         assert validate_deployment_name("") is False  # Empty
     
     def test_validate_github_url_valid(self):
@@ -0,0 +1,87 @@
+"""
+Unit Tests for the application factory
+Run with: pytest tests/
+"""
+
+import logging
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import event
+import config as config_module
+from app import create_app
+from backend.extensions import db, deployment_events
+from backend.utils import helpers
+
+
+@pytest.fixture
+def isolated_config(tmp_path, monkeypatch):
+    """Fixture keeping every path create_app() touches inside tmp_path"""
+    monkeypatch.setattr(config_module.Config, 'PROXMOX_PASSWORD', 'test')
+    monkeypatch.setattr(config_module.Config, 'LOG_FILE', tmp_path / 'logs' / 'paas.log')
+    monkeypatch.setattr(config_module.Config, 'TERRAFORM_STATE_DIR', tmp_path / 'states')
+    monkeypatch.setattr(
+        config_module.ProductionConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'prod.db'}"
+    )
+    monkeypatch.setenv('SECRET_KEY', 'test-secret-key')
+    monkeypatch.setattr(helpers, '_logging_configured', False)
+    yield tmp_path
+
+    # init_extensions hooked the shared broker to db.session; unhook it for other tests
+    if deployment_events._hooked:
+        event.remove(db.session, 'after_flush', deployment_events._collect)
+        event.remove(db.session, 'after_commit', deployment_events._flush_pending)
+        event.remove(db.session, 'after_rollback', deployment_events._discard_pending)
+        deployment_events._hooked = False
+
+
+class TestCreateApp:
+    """Test create_app"""
+
+    def test_production_leaves_schema_to_migrations(self, isolated_config):
+        """Test that the production boot does not run create_all()"""
+        app = create_app('production')
+
+        with app.app_context():
+            assert not sa.inspect(db.engine).has_table('deployments')
+            db.engine.dispose()
+
+    def test_testing_creates_tables(self, isolated_config):
+        """Test that other configurations still create missing tables"""
+        app = create_app('testing')
+
+        with app.app_context():
+            assert sa.inspect(db.engine).has_table('deployments')
+
+    def test_logging_configured_once_per_process(self, isolated_config, monkeypatch):
+        """Test that repeated create_app() calls set up logging only once"""
+        calls = []
+        monkeypatch.setattr(logging, 'basicConfig', lambda **kwargs: calls.append(kwargs))
+
+        create_app('testing')
+        create_app('testing')
+
+        assert len(calls) == 1
+        for handler in calls[0]['handlers']:
+            handler.close()
+
+    def test_production_requires_secret_key(self, isolated_config, monkeypatch):
+        """Test that the production configuration's own checks run"""
+        monkeypatch.delenv('SECRET_KEY')
+
+        with pytest.raises(ValueError):
+            create_app('production')
+
+    def test_import_leaves_http_client_unloaded(self):
+        """Test that importing the app does not load requests (only the package cache stats need it)"""
+        result = subprocess.run(
+            [sys.executable, '-c', "import sys, app; print('requests' in sys.modules)"],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+
+        assert result.stdout.strip().splitlines()[-1] == 'False'
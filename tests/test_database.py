@@ -0,0 +1,130 @@
+"""
+Unit Tests for database engine configuration
+Run with: pytest tests/
+"""
+
+import threading
+from datetime import datetime
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from backend.extensions import db
+from backend.models.deployment import Deployment, DeploymentStatus
+from backend.utils.database import configure_sqlite, engine_options
+
+WRITERS = 32
+READERS = 32
+OPERATIONS = 10
+
+
+def make_app(database_uri, **config):
+    """Flask application with the engine configured like init_extensions does"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config.update(config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_sqlite(engine, app.config)
+    return app
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """Fixture for an application on a SQLite file with one deployment per writer"""
+    app = make_app(f"sqlite:///{tmp_path / 'deployments.db'}")
+    with app.app_context():
+        db.create_all()
+        for i in range(WRITERS):
+            db.session.add(Deployment(
+                id=f"deployment-{i}",
+                name=f"app-{i}",
+                deployment_type='lxc',
+                framework='django',
+                github_url='https://github.com/test/repo',
+                resources={'cores': 1},
+                status=DeploymentStatus.PENDING,
+                created_at=datetime(2024, 1, 1)
+            ))
+        db.session.commit()
+        db.session.remove()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+class TestEngineOptions:
+    """Test engine_options"""
+
+    def test_pool_settings_for_server_databases(self):
+        """Test that PostgreSQL gets the configured pool and explicit options win"""
+        options = engine_options({
+            'SQLALCHEMY_DATABASE_URI': 'postgresql://paas@db/paas',
+            'DB_POOL_SIZE': 4,
+            'DB_MAX_OVERFLOW': 2,
+            'SQLALCHEMY_ENGINE_OPTIONS': {'pool_recycle': 60}
+        })
+
+        assert options['pool_size'] == 4
+        assert options['max_overflow'] == 2
+        assert options['pool_pre_ping'] is True
+        assert options['pool_recycle'] == 60
+
+    def test_memory_database_keeps_static_pool(self):
+        """Test that in-memory SQLite gets no pool sizing"""
+        assert engine_options({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'}) == {}
+
+
+class TestSQLiteConcurrency:
+    """Test SQLite pragmas under concurrent access"""
+
+    def test_pragmas_applied(self, file_app):
+        """Test that every connection runs in WAL mode with a busy timeout"""
+        with file_app.app_context():
+            assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+            assert db.session.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+            assert db.session.execute(text('PRAGMA busy_timeout')).scalar() == 5000
+
+    def test_concurrent_writers_and_readers(self, file_app):
+        """Test that 32 writers and 32 readers finish without lock errors"""
+        errors = []
+        start = threading.Barrier(WRITERS + READERS)
+        statuses = [DeploymentStatus.PROVISIONING, DeploymentStatus.DEPLOYING, DeploymentStatus.RUNNING]
+
+        def writer(i):
+            try:
+                with file_app.app_context():
+                    start.wait()
+                    for n in range(OPERATIONS):
+                        deployment = db.session.get(Deployment, f"deployment-{i}")
+                        deployment.status = statuses[n % len(statuses)]
+                        deployment.error_message = f"step {n}"
+                        db.session.commit()
+                    db.session.remove()
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                with file_app.app_context():
+                    start.wait()
+                    for _ in range(OPERATIONS):
+                        Deployment.list_page(limit=10, fields=['id', 'status'])
+                        Deployment.count_by_status(DeploymentStatus.RUNNING)
+                        db.session.rollback()
+                    db.session.remove()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(WRITERS)]
+        threads += [threading.Thread(target=reader) for _ in range(READERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        assert errors == []
+        with file_app.app_context():
+            expected = statuses[(OPERATIONS - 1) % len(statuses)]
+            assert Deployment.count_by_status(expected) == WRITERS
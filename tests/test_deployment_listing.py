@@ -0,0 +1,93 @@
+"""
+Unit Tests for paginated deployment listing
+Run with: pytest tests/
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from backend.extensions import db
+from backend.models.deployment import Deployment, DeploymentStatus
+
+
+@pytest.fixture
+def deployments():
+    """Fixture for 25 deployments created one minute apart"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        start = datetime(2024, 1, 1)
+        for i in range(25):
+            deployment = Deployment(
+                name=f"app-{i:02d}",
+                deployment_type='vm' if i % 2 else 'lxc',
+                framework='django' if i % 3 else 'flask',
+                github_url='https://github.com/test/repo',
+                resources={'cores': 1},
+                status=DeploymentStatus.DELETED if i % 5 == 0 else DeploymentStatus.RUNNING,
+                created_at=start + timedelta(minutes=i)
+            )
+            db.session.add(deployment)
+        db.session.commit()
+        yield
+        db.session.remove()
+
+
+class TestListPage:
+    """Test Deployment.list_page"""
+
+    def test_pages_cover_every_row_once(self, deployments):
+        """Test that following next_cursor walks all live rows, newest first"""
+        names, cursor = [], None
+        while True:
+            page, cursor = Deployment.list_page(limit=7, cursor=cursor, fields=['name'])
+            names += [row['name'] for row in page]
+            if not cursor:
+                break
+
+        expected = [f"app-{i:02d}" for i in range(24, -1, -1) if i % 5]
+        assert names == expected
+
+    def test_ties_on_created_at_are_broken_by_id(self, deployments):
+        """Test that rows sharing a timestamp are neither skipped nor repeated"""
+        Deployment.query.update({Deployment.created_at: datetime(2024, 1, 1)})
+        db.session.commit()
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = Deployment.list_page(limit=4, cursor=cursor, fields=['id'], include_deleted=True)
+            seen += [row['id'] for row in page]
+            if not cursor:
+                break
+
+        assert len(seen) == len(set(seen)) == 25
+
+    def test_filters_and_projection(self, deployments):
+        """Test status/type/framework filters and field projection"""
+        page, cursor = Deployment.list_page(
+            statuses=['deleted'],
+            deployment_type='lxc',
+            fields=['name', 'status', 'resources', 'created_at']
+        )
+
+        assert cursor is None
+        assert [row['name'] for row in page] == ['app-20', 'app-10', 'app-00']
+        assert page[0] == {
+            'name': 'app-20',
+            'status': 'deleted',
+            'resources': {'cores': 1},
+            'created_at': '2024-01-01T00:20:00'
+        }
+
+        page, _ = Deployment.list_page(framework='flask', fields=['name'])
+        assert [row['name'] for row in page] == ['app-24', 'app-21', 'app-18', 'app-12', 'app-09', 'app-06', 'app-03']
+
+    def test_invalid_input(self, deployments):
+        """Test that bad fields and cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            Deployment.list_page(fields=['password'])
+        with pytest.raises(ValueError):
+            Deployment.list_page(cursor='not-a-cursor')
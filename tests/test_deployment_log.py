@@ -0,0 +1,87 @@
+"""
+Unit Tests for per-deployment log files
+Run with: pytest tests/
+"""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from backend.api import deployment_log as deployment_log_module
+from backend.api.deployment_log import DeploymentLog, parse_since, read_log
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """Fixture writing 100 lines one second apart"""
+    moments = iter(datetime(2024, 1, 1, 12) + timedelta(seconds=i) for i in range(100))
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return next(moments)
+
+    monkeypatch.setattr(deployment_log_module, 'datetime', FakeDatetime)
+    log = DeploymentLog(tmp_path / 'app' / 'deployment.log')
+    for i in range(100):
+        log.write(f"line {i:03d}\r\n".encode())
+    log.close()
+    return log.path
+
+
+class TestDeploymentLog:
+    """Test DeploymentLog and read_log"""
+
+    def test_lines_are_stamped(self, tmp_path):
+        """Test that complete lines get a timestamp and partial lines wait"""
+        log = DeploymentLog(tmp_path / 'deployment.log')
+        log.write(b'npm install\nadded ')
+        log.write(b'12 packages')
+        log.close()
+
+        lines = log.path.read_bytes().splitlines()
+
+        assert [line[25:] for line in lines] == [b'npm install', b'added 12 packages']
+        assert lines[0][23:25] == b'Z '
+
+    def test_offset_returns_only_new_bytes(self, log_file):
+        """Test that passing the previous offset back returns appended data only"""
+        first = read_log(log_file)
+        assert first['offset'] == first['size']
+
+        with open(log_file, 'ab') as f:
+            f.write(b'2024-01-01T12:02:00.000Z appended\n')
+
+        second = read_log(log_file, offset=first['offset'])
+        assert second['data'] == b'2024-01-01T12:02:00.000Z appended\n'
+        assert read_log(log_file, offset=second['offset'])['data'] == b''
+
+    def test_tail_aligns_to_line(self, log_file):
+        """Test that tail starts on a full line"""
+        data = read_log(log_file, tail=50)['data']
+
+        assert data.endswith(b'line 099\n')
+        assert data.count(b'\n') == 1
+
+    def test_since_binary_search(self, log_file):
+        """Test that since starts at the first line at or after the time"""
+        data = read_log(log_file, since=parse_since('2024-01-01T12:01:30Z'))['data']
+
+        assert data.startswith(b'2024-01-01T12:01:30.000Z line 090')
+        assert data.count(b'\n') == 10
+
+    def test_limit_pages_forward_and_prefers_newest(self, log_file):
+        """Test the read size cap for offset and default reads"""
+        page = read_log(log_file, offset=0, limit=100)
+        assert len(page['data']) == 100 and page['offset'] == 100
+
+        newest = read_log(log_file, limit=100)
+        assert newest['truncated'] is True
+        assert newest['data'].endswith(b'line 099\n')
+
+    def test_parse_since(self):
+        """Test epoch and ISO inputs"""
+        epoch = datetime(2024, 1, 1, 12, tzinfo=timezone.utc).timestamp()
+        assert parse_since(str(epoch)) == '2024-01-01T12:00:00.000Z'
+        assert parse_since('2024-01-01T13:00:00+01:00') == '2024-01-01T12:00:00.000Z'
+        assert parse_since('') is None
+        with pytest.raises(ValueError):
+            parse_since('yesterday')
@@ -0,0 +1,293 @@
+"""
+Unit Tests for checkpointed deployment retries
+Run with: pytest tests/
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from backend.api import deployment_pipeline, terraform_manager
+from backend.api.live_output import OutputBuffer
+from backend.api.remote_script import step_keys
+from backend.api.routes import api_bp
+from backend.api.stage_events import StageTimer
+from backend.api.terraform_manager import TerraformManager
+from backend.extensions import db, deployment_events, job_queue
+from backend.models.deployment import Deployment, DeploymentStatus
+from backend.models.deployment_checkpoint import STEP_PREFIX, DeploymentCheckpoint
+
+
+class FakeStageEvents:
+    """Stage event writer stand-in that drops the rows"""
+
+    def record(self, row):
+        pass
+
+
+class RecordingSSH:
+    """SSH client stand-in whose channels record their command and exit 0"""
+
+    def __init__(self):
+        self.commands = []
+
+    def get_transport(self):
+        return self
+
+    def open_session(self):
+        return self
+
+    def get_pty(self):
+        pass
+
+    def exec_command(self, command):
+        self.commands.append(command)
+
+    def recv(self, size):
+        return b''
+
+    def recv_stderr_ready(self):
+        return False
+
+    def recv_exit_status(self):
+        return 0
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    """SSHConnector stand-in handing out a RecordingSSH"""
+
+    ssh = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def connect(self):
+        return {'client': self.ssh, 'attempts': 1}
+
+
+@pytest.fixture
+def app(app, monkeypatch):
+    """Fixture for the shared application with the API routes and no stage event writes"""
+    app.register_blueprint(api_bp, url_prefix='/api')
+    monkeypatch.setattr(deployment_pipeline, 'stage_events', FakeStageEvents())
+    return app
+
+
+@pytest.fixture
+def deployment(app):
+    """Fixture for a saved, pending deployment"""
+    deployment = Deployment(
+        name='retry-app',
+        deployment_type='lxc',
+        framework='express',
+        github_url='https://github.com/test/repo',
+        resources={},
+        status=DeploymentStatus.PENDING,
+        created_at=datetime.utcnow()
+    )
+    deployment.save()
+    return deployment
+
+
+@pytest.fixture
+def fake_terraform(monkeypatch):
+    """Fixture faking Terraform and SSH; set 'apply' or 'deploy' to False to make that stage fail"""
+    calls = []
+    outcome = {'apply': True, 'deploy': True}
+
+    def generate_config(self, **kwargs):
+        calls.append(('config', kwargs))
+        return {'variables': {'vm_id': kwargs['vm_id'] or 301}, 'deployment_type': 'lxc', 'golden_image': None}
+
+    def apply(self, name, config, output=None, stages=None):
+        calls.append(('apply', config['variables']['vm_id']))
+        if not outcome['apply']:
+            return {'success': False, 'error': 'apply timed out'}
+        return {'success': True, 'vm_id': config['variables']['vm_id'], 'ip_address': '10.0.0.30'}
+
+    def deploy_application(self, ip_address, on_step=None, completed_steps=None, **kwargs):
+        calls.append(('deploy', ip_address))
+        outcome['completed_steps'] = completed_steps
+        on_step(1, 'aaaa')
+        if not outcome['deploy']:
+            return {'success': False, 'error': 'npm run build failed'}
+        on_step(2, 'bbbb')
+        return {'success': True}
+
+    monkeypatch.setattr(TerraformManager, 'generate_config', generate_config)
+    monkeypatch.setattr(TerraformManager, 'apply', apply)
+    monkeypatch.setattr(TerraformManager, 'deploy_application', deploy_application)
+    return calls, outcome
+
+
+class TestResumePipeline:
+    """Test that run_deployment resumes after its checkpoints"""
+
+    def test_retry_after_remote_step_failure_reuses_guest(self, deployment, fake_terraform):
+        """Test that a failed build goes straight back to the guest on retry"""
+        calls, outcome = fake_terraform
+        outcome['deploy'] = False
+
+        deployment_pipeline.run_deployment(deployment.id)
+        assert deployment.status == DeploymentStatus.FAILED
+        assert set(DeploymentCheckpoint.completed(deployment.id)) == {'vm_id_allocated', 'provisioned', 'step:aaaa'}
+
+        calls.clear()
+        outcome['deploy'] = True
+        deployment_pipeline.run_deployment(deployment.id)
+
+        assert calls == [('deploy', '10.0.0.30')]
+        assert outcome['completed_steps'] == ['aaaa']
+        assert deployment.status == DeploymentStatus.RUNNING
+        assert deployment.error_message is None
+        assert {'step:bbbb', 'deployed'} <= set(DeploymentCheckpoint.completed(deployment.id))
+
+    def test_retry_after_apply_failure_keeps_vm_id(self, deployment, fake_terraform):
+        """Test that a failed apply is retried with the VM ID reserved the first time"""
+        calls, outcome = fake_terraform
+        outcome['apply'] = False
+
+        deployment_pipeline.run_deployment(deployment.id)
+        assert deployment.vm_id == 301
+        assert deployment_pipeline.resume_point(DeploymentCheckpoint.completed(deployment.id)) == 'provisioned'
+
+        calls.clear()
+        outcome['apply'] = True
+        deployment_pipeline.run_deployment(deployment.id)
+
+        config = calls[0][1]
+        assert (config['vm_id'], config['use_golden_image'], config['golden_image_id']) == (301, False, None)
+        assert calls[1:] == [('apply', 301), ('deploy', '10.0.0.30')]
+        assert deployment.status == DeploymentStatus.RUNNING
+
+
+class TestStepCheckpoints:
+    """Test that remote steps checkpointed in the database are skipped"""
+
+    def test_checkpointed_step_is_not_executed(self, app, deployment, monkeypatch):
+        """Test run_commands in per-command mode with one step already checkpointed"""
+        app.config['DEPLOY_BATCH_SCRIPT'] = False
+        ssh = RecordingSSH()
+        monkeypatch.setattr(FakeConnector, 'ssh', ssh)
+        monkeypatch.setattr(terraform_manager, 'SSHConnector', FakeConnector)
+        commands = ['git clone --depth 1 https://github.com/test/repo /opt/app', 'npm run build']
+        DeploymentCheckpoint.record(deployment.id, f"{STEP_PREFIX}{step_keys(commands)[0]}", index=1)
+        completed = [stage[len(STEP_PREFIX):] for stage in DeploymentCheckpoint.completed(deployment.id)]
+        stages = StageTimer()
+
+        result = TerraformManager().run_commands(
+            '10.0.0.30', commands, output=OutputBuffer(), stages=stages,
+            preamble=['rm -f /etc/pip.conf'], completed_steps=completed
+        )
+
+        assert result['success']
+        assert ssh.commands == ['rm -f /etc/pip.conf', 'npm run build']
+        assert [event['status'] for event in stages.events if event['stage'] == 'command'] == ['ok', 'skipped', 'ok']
+
+    def test_new_guest_forgets_step_checkpoints(self, deployment, fake_terraform):
+        """Test that re-provisioning drops the steps done on the previous guest"""
+        calls, outcome = fake_terraform
+        DeploymentCheckpoint.record(deployment.id, f"{STEP_PREFIX}old", index=1)
+
+        deployment_pipeline.run_deployment(deployment.id)
+
+        assert outcome['completed_steps'] == []
+        assert f"{STEP_PREFIX}old" not in DeploymentCheckpoint.completed(deployment.id)
+
+
+class TestRetryRoute:
+    """Test POST /api/deployments/<id>/retry"""
+
+    def test_only_failed_deployments_are_requeued(self, app, deployment, monkeypatch):
+        """Test the 409 for other statuses and the resume point in the response"""
+        submitted = []
+        monkeypatch.setattr(job_queue, 'submit', lambda func, *args, **kwargs: submitted.append((args, kwargs)) or 0)
+        client = app.test_client()
+
+        assert client.post(f'/api/deployments/{deployment.id}/retry').status_code == 409
+
+        deployment.status = DeploymentStatus.FAILED
+        deployment.error_message = 'npm run build failed'
+        db.session.commit()
+        DeploymentCheckpoint.record(deployment.id, 'vm_id_allocated', vm_id=301, golden_image_id=None)
+        DeploymentCheckpoint.record(deployment.id, 'provisioned', vm_id=301, ip_address='10.0.0.30')
+        DeploymentCheckpoint.record(deployment.id, 'step:aaaa', index=1)
+
+        response = client.post(f'/api/deployments/{deployment.id}/retry', json={'env_vars': {'PORT': '3000'}})
+
+        assert response.status_code == 202
+        assert response.get_json()['resume_from'] == 'deploy'
+        assert response.get_json()['completed_steps'] == 1
+        assert [checkpoint['stage'] for checkpoint in response.get_json()['checkpoints']] == [
+            'vm_id_allocated', 'provisioned', 'step:aaaa'
+        ]
+        assert submitted == [((deployment.id,), {'key': deployment.id, 'env_vars': {'PORT': '3000'}})]
+        assert deployment.status == DeploymentStatus.PENDING and deployment.error_message is None
+
+    def test_concurrent_retry_is_rejected(self, app, deployment, monkeypatch):
+        """Test that only the first of two retries claims the deployment and publishes its status"""
+        submitted = []
+        monkeypatch.setattr(job_queue, 'submit', lambda func, *args, **kwargs: submitted.append(args) or 0)
+        deployment.status = DeploymentStatus.FAILED
+        db.session.commit()
+        subscription = deployment_events.subscribe()
+        client = app.test_client()
+
+        try:
+            first = client.post(f'/api/deployments/{deployment.id}/retry')
+            second = client.post(f'/api/deployments/{deployment.id}/retry')
+            events = []
+            while not subscription.queue.empty():
+                events.append(subscription.queue.get_nowait()['data'])
+        finally:
+            deployment_events.unsubscribe(subscription)
+
+        assert (first.status_code, second.status_code) == (202, 409)
+        assert submitted == [(deployment.id,)]
+        assert [(event['id'], event['previous'], event['status']) for event in events] == [
+            (deployment.id, 'failed', 'pending')
+        ]
+
+    def test_interrupted_deployment_can_be_retried(self, app, deployment, monkeypatch):
+        """Test that an in-flight deployment becomes retryable once nothing renews its lease"""
+        monkeypatch.setattr(job_queue, 'submit', lambda func, *args, **kwargs: 0)
+        app.config['DEPLOY_LEASE_TIMEOUT'] = 120
+        deployment.status = DeploymentStatus.DEPLOYING
+        deployment.created_at = datetime.utcnow() - timedelta(hours=2)
+        db.session.commit()
+        DeploymentCheckpoint.record(deployment.id, 'provisioned', vm_id=301, ip_address='10.0.0.30')
+        client = app.test_client()
+
+        # Long-running but still leased, e.g. renewed by another server process
+        Deployment.renew_leases([deployment.id])
+        assert client.post(f'/api/deployments/{deployment.id}/retry').status_code == 409
+
+        deployment.heartbeat_at = datetime.utcnow() - timedelta(minutes=5)
+        db.session.commit()
+        response = client.post(f'/api/deployments/{deployment.id}/retry')
+
+        assert response.status_code == 202
+        assert response.get_json()['resume_from'] == 'deploy'
+        assert deployment.status == DeploymentStatus.PENDING
+        assert deployment.heartbeat_at > datetime.utcnow() - timedelta(minutes=1)
+
+    def test_deployment_owned_by_this_process_is_not_retried(self, app, deployment, monkeypatch):
+        """Test that a deployment still in the local job queue is never claimed, whatever its lease says"""
+        monkeypatch.setattr(job_queue, 'owns', lambda key: key == deployment.id)
+        deployment.heartbeat_at = None
+        db.session.commit()
+
+        response = app.test_client().post(f'/api/deployments/{deployment.id}/retry')
+
+        assert response.status_code == 409
+        assert deployment.status == DeploymentStatus.PENDING
+
+    def test_timeline_shows_where_a_retry_resumes(self, app, deployment):
+        """Test the checkpoints and resume point in GET /api/deployments/<id>/timeline"""
+        DeploymentCheckpoint.record(deployment.id, 'vm_id_allocated', vm_id=301, golden_image_id=None)
+
+        body = app.test_client().get(f'/api/deployments/{deployment.id}/timeline').get_json()
+
+        assert body['resume_from'] == 'provisioned'
+        assert body['checkpoints'][0]['detail'] == {'vm_id': 301, 'golden_image_id': None}
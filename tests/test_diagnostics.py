@@ -0,0 +1,23 @@
+"""
+Unit Tests for the diagnostics endpoint
+Run with: pytest tests/
+"""
+
+from backend.api.routes import api_bp
+
+
+class TestDiagnostics:
+    """Test GET /api/diagnostics"""
+
+    def test_component_sections(self, app):
+        """Test that every component reports its counters"""
+        app.register_blueprint(api_bp, url_prefix='/api')
+
+        response = app.test_client().get('/api/diagnostics')
+
+        assert response.status_code == 200
+        diagnostics = response.get_json()['diagnostics']
+        assert set(diagnostics['vm_ids']) == {'range', 'used', 'free', 'synced_age'}
+        assert set(diagnostics['jump_hosts']) == {'transports', 'leases', 'max_size'}
+        assert set(diagnostics['stage_events']) == {'pending', 'written'}
+        assert set(diagnostics['deployment_events']) == {'subscribers', 'last_event_id'}
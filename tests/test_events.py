@@ -0,0 +1,112 @@
+"""
+Unit Tests for deployment status events
+Run with: pytest tests/
+"""
+
+from datetime import datetime
+import json
+import pytest
+from flask import Flask
+from sqlalchemy import event
+from backend.api.events import DeploymentEvents
+from backend.extensions import db
+from backend.models.deployment import Deployment, DeploymentStatus
+
+
+@pytest.fixture
+def events():
+    """Fixture for a broker hooked to an in-memory database session"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['DEPLOYMENT_EVENTS_QUEUE_SIZE'] = 3
+    db.init_app(app)
+    broker = DeploymentEvents()
+    broker.init_app(app, db.session)
+
+    with app.app_context():
+        db.create_all()
+        yield broker
+        db.session.remove()
+
+    event.remove(db.session, 'after_flush', broker._collect)
+    event.remove(db.session, 'after_commit', broker._flush_pending)
+    event.remove(db.session, 'after_rollback', broker._discard_pending)
+
+
+def make_deployment():
+    """Create an unsaved pending deployment"""
+    return Deployment(
+        name='events-app',
+        deployment_type='lxc',
+        framework='flask',
+        github_url='https://github.com/test/repo',
+        resources={},
+        status=DeploymentStatus.PENDING,
+        created_at=datetime.utcnow()
+    )
+
+
+def drain(subscription):
+    """Collect queued event payloads"""
+    items = []
+    while not subscription.queue.empty():
+        items.append(subscription.queue.get_nowait()['data'])
+    return items
+
+
+class TestDeploymentEvents:
+    """Test DeploymentEvents"""
+
+    def test_status_transitions_published_on_commit(self, events):
+        """Test that each committed status change becomes one event"""
+        subscription = events.subscribe()
+        deployment = make_deployment()
+        deployment.save()
+        created = drain(subscription)
+        assert [(e['id'], e['previous'], e['status']) for e in created] == [(deployment.id, None, 'pending')]
+
+        deployment.status = DeploymentStatus.PROVISIONING
+        db.session.flush()
+        assert drain(subscription) == []  # Not committed yet
+
+        db.session.commit()
+        deployment.ip_address = '10.0.0.5'
+        db.session.commit()  # No status change, no event
+
+        assert [(e['previous'], e['status']) for e in drain(subscription)] == [('pending', 'provisioning')]
+
+    def test_rolled_back_changes_are_not_published(self, events):
+        """Test that a rollback discards collected changes"""
+        subscription = events.subscribe()
+        deployment = make_deployment()
+        deployment.save()
+        drain(subscription)
+
+        deployment.status = DeploymentStatus.FAILED
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+
+        assert drain(subscription) == []
+
+    def test_resume_from_last_event_id(self, events):
+        """Test that a reconnecting client gets only the missed events"""
+        for i in range(5):
+            events.publish({'status': f's{i}'})
+
+        subscription = events.subscribe(last_event_id=3)
+
+        assert drain(subscription) == [{'status': 's3'}, {'status': 's4'}]
+
+    def test_slow_subscriber_is_dropped(self, events):
+        """Test that a full client queue ends its stream"""
+        stream = events.stream()
+        assert next(stream) == 'retry: 3000\n\n'
+
+        for i in range(4):
+            events.publish({'status': f's{i}'})
+
+        frames = list(stream)
+        assert len(frames) == 3
+        assert json.loads(frames[0].split('data: ')[1]) == {'status': 's0'}
+        assert events.stats()['subscribers'] == 0
@@ -0,0 +1,78 @@
+"""
+Unit Tests for golden images
+Run with: pytest tests/
+"""
+
+from datetime import datetime
+import pytest
+from config import Config
+from backend.api import golden_images
+from backend.api.terraform_manager import TerraformManager
+from backend.extensions import db
+from backend.models.golden_image import GoldenImage
+
+
+@pytest.fixture
+def manager(app):
+    """Fixture for a TerraformManager bound to the test application"""
+    return TerraformManager()
+
+
+class TestBakedCommands:
+    """Test the split between baked setup and per-deployment commands"""
+
+    def test_baked_deploy_skips_system_setup(self, manager):
+        """Test that a clone runs only the clone, install and start steps"""
+        framework_config = Config.SUPPORTED_FRAMEWORKS['express']
+
+        stock = manager._build_deployment_commands('express', framework_config, 'https://github.com/test/repo')
+        baked = manager._build_deployment_commands('express', framework_config, 'https://github.com/test/repo', baked=True)
+
+        assert stock[:2] == manager.build_bake_commands('nodejs')
+        assert baked == stock[2:]
+        assert not any('apt-get' in cmd or 'nodesource' in cmd for cmd in baked)
+
+    def test_current_matches_setup_version(self, manager):
+        """Test that templates baked from older setup commands are not cloned"""
+        version = manager.bake_version('python')
+        db.session.add_all([
+            GoldenImage(language='python', deployment_type='lxc', version='0ld0ld0ld0ld', status='ready', vm_id=9000, ready_at=datetime(2024, 1, 2)),
+            GoldenImage(language='python', deployment_type='lxc', version=version, status='ready', vm_id=9001, ready_at=datetime(2024, 1, 1))
+        ])
+        db.session.commit()
+
+        assert GoldenImage.current('python', 'lxc', version).vm_id == 9001
+        assert GoldenImage.current('python', 'vm', version) is None
+        assert version != manager.bake_version('nodejs')
+
+
+class TestBuildGoldenImage:
+    """Test build_golden_image"""
+
+    def test_build_converts_builder_and_retires_previous(self, app, monkeypatch):
+        """Test the provision -> bake -> template flow with Terraform and Proxmox faked"""
+        calls = []
+        monkeypatch.setattr(TerraformManager, 'generate_config', lambda self, **kwargs: calls.append(('config', kwargs)) or {
+            'variables': {'proxmox_node': 'pve'}, 'deployment_type': 'lxc', 'golden_image': None
+        })
+        monkeypatch.setattr(TerraformManager, 'apply', lambda self, name, config, output=None: {
+            'success': True, 'vm_id': 9002, 'ip_address': '10.0.0.9'
+        })
+        monkeypatch.setattr(TerraformManager, 'run_commands', lambda self, ip, commands, output=None, preamble=None: calls.append(('run', commands)) or {
+            'success': True
+        })
+        monkeypatch.setattr(golden_images, '_convert_to_template', lambda *args: calls.append(('template', args)))
+
+        previous = GoldenImage(language='php', deployment_type='lxc', version='0ld0ld0ld0ld', status='ready', vm_id=9000)
+        image = GoldenImage(language='php', deployment_type='lxc', version='n3wn3wn3wn3w', status='building')
+        db.session.add_all([previous, image])
+        db.session.commit()
+
+        golden_images.build_golden_image(image.id)
+
+        assert calls[0][1]['use_golden_image'] is False
+        assert calls[0][1]['name'] == '_paas-golden-php-lxc-n3wn3wn3wn3w'
+        assert calls[1][1][:2] == TerraformManager().build_bake_commands('php')
+        assert calls[2] == ('template', (9002, 'lxc', 'pve'))
+        assert (image.status, image.vm_id, image.node) == ('ready', 9002, 'pve')
+        assert previous.status == 'retired'
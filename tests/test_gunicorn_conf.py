@@ -0,0 +1,73 @@
+"""
+Unit Tests for the gunicorn server hooks
+Run with: pytest tests/
+"""
+
+import logging
+import runpy
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from flask import Flask
+from backend import extensions
+from backend.api.job_queue import DeploymentJobQueue
+from backend.extensions import db
+
+CONF = runpy.run_path(str(Path(__file__).resolve().parent.parent / 'gunicorn.conf.py'))
+
+
+def fake_server():
+    """Arbiter stand-in exposing the logger the hooks write to"""
+    return SimpleNamespace(log=logging.getLogger('test.gunicorn'))
+
+
+class TestGunicornHooks:
+    """Test post_fork and worker_exit"""
+
+    def test_post_fork_disposes_engines(self, tmp_path, monkeypatch):
+        """Test that a forked worker does not reuse the parent's pooled connections"""
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'fork.db'}"
+        db.init_app(app)
+        with app.app_context():
+            db.session.execute(db.text('SELECT 1'))
+            db.session.remove()
+            parent_pool = db.engine.pool
+            assert parent_pool.checkedin() == 1
+
+        monkeypatch.setitem(sys.modules, 'wsgi', SimpleNamespace(app=app))
+        CONF['post_fork'](fake_server(), SimpleNamespace(pid=1))
+
+        with app.app_context():
+            assert db.engine.pool is not parent_pool
+            assert db.engine.pool.checkedin() == 0
+            db.engine.dispose()
+
+    def test_worker_exit_returns_with_full_queue(self, monkeypatch, caplog):
+        """Test that worker_exit waits for the running job only, even when the queue is full"""
+        app = Flask(__name__)
+        app.config['DEPLOY_WORKERS'] = 1
+        app.config['DEPLOY_QUEUE_SIZE'] = 2
+        job_queue = DeploymentJobQueue(app)
+        monkeypatch.setattr(extensions, 'job_queue', job_queue)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking_job():
+            started.set()
+            release.wait(5)
+
+        job_queue.submit(blocking_job)
+        started.wait(5)
+        job_queue.submit(lambda: None)
+        job_queue.submit(lambda: None)
+
+        exited = threading.Thread(target=CONF['worker_exit'], args=(fake_server(), SimpleNamespace(pid=1)))
+        with caplog.at_level(logging.INFO, logger='test.gunicorn'):
+            exited.start()
+            threading.Timer(0.05, release.set).start()
+            exited.join(5)
+
+        assert not exited.is_alive()
+        assert 'dropped 2 queued deployments' in caplog.text
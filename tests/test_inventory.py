@@ -0,0 +1,96 @@
+"""
+Unit Tests for the cached cluster inventory
+Run with: pytest tests/
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from flask import Flask
+from backend.api import inventory as inventory_module
+from backend.api.inventory import ClusterInventory
+
+CLUSTER_RESOURCES = [
+    {'id': 'node/pve', 'type': 'node', 'node': 'pve', 'cpu': 0.1},
+    {'id': 'qemu/100', 'type': 'qemu', 'node': 'pve', 'vmid': 100},
+    {'id': 'lxc/101', 'type': 'lxc', 'node': 'pve2', 'vmid': 101},
+    {'id': 'storage/pve/local', 'type': 'storage', 'node': 'pve'}
+]
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Fixture counting live /cluster/resources calls"""
+    calls = []
+    lock = threading.Lock()
+
+    def fake_with_proxmox(func, config=None):
+        with lock:
+            calls.append(config)
+        return list(CLUSTER_RESOURCES)
+
+    monkeypatch.setattr(inventory_module, 'with_proxmox', fake_with_proxmox)
+    return calls
+
+
+@pytest.fixture
+def inventory():
+    """Fixture for an inventory without a background refresher"""
+    app = Flask(__name__)
+    app.config['PROXMOX_INVENTORY_TTL'] = 30
+    app.config['PROXMOX_INVENTORY_INTERVAL'] = 0
+    return ClusterInventory(app)
+
+
+class TestClusterInventory:
+    """Test ClusterInventory"""
+
+    def test_reads_share_one_fetch(self, inventory, fetches):
+        """Test that many concurrent readers cost a single Proxmox call"""
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda _: inventory.guests(), range(50)))
+
+        assert len(fetches) == 1
+        assert all([g['vmid'] for g in r] == [100, 101] for r in results)
+
+    def test_filters_nodes_and_guests(self, inventory, fetches):
+        """Test node and per-node guest views of the snapshot"""
+        assert [n['node'] for n in inventory.nodes()] == ['pve']
+        assert [g['vmid'] for g in inventory.guests('pve')] == [100]
+        assert [g['vmid'] for g in inventory.guests('pve2')] == [101]
+        assert len(fetches) == 1
+
+    def test_fresh_and_invalidate_force_live_read(self, inventory, fetches):
+        """Test that fresh=True and invalidate() bypass the snapshot"""
+        inventory.guests()
+        inventory.guests(fresh=True)
+        assert len(fetches) == 2
+
+        inventory.invalidate()
+        inventory.nodes()
+        inventory.nodes()
+        assert len(fetches) == 3
+
+    def test_expired_snapshot_is_refreshed(self, inventory, fetches):
+        """Test that reads after the TTL go back to Proxmox"""
+        inventory.guests()
+        inventory._fetched_at -= 31
+
+        inventory.guests()
+
+        assert len(fetches) == 2
+        assert inventory.age() < 30
+
+    def test_stale_snapshot_served_on_error(self, inventory, fetches, monkeypatch):
+        """Test that a failed refresh falls back to the previous snapshot"""
+        inventory.guests()
+        inventory._fetched_at -= 31
+
+        def failing(func, config=None):
+            raise ConnectionError("proxmox down")
+
+        monkeypatch.setattr(inventory_module, 'with_proxmox', failing)
+
+        assert [g['vmid'] for g in inventory.guests()] == [100, 101]
+        with pytest.raises(ConnectionError):
+            inventory.guests(fresh=True)
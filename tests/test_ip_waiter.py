@@ -0,0 +1,137 @@
+"""
+Unit Tests for IP discovery after provisioning
+Run with: pytest tests/
+"""
+
+import pytest
+from backend.api.ip_waiter import IPWaiter, IPWaitTimeout, parse_leases
+
+
+class FakeEndpoint:
+    """Callable chain emulating proxmoxer resource paths"""
+
+    def __init__(self, proxmox, path=()):
+        self.proxmox = proxmox
+        self.path = path
+
+    def __getattr__(self, item):
+        return FakeEndpoint(self.proxmox, self.path + (item,))
+
+    def __call__(self, *args):
+        return FakeEndpoint(self.proxmox, self.path + tuple(str(a) for a in args))
+
+    def get(self, *args):
+        return self.proxmox.handle(self.path + args)
+
+
+class FakeProxmox:
+    """Returns queued responses per endpoint kind"""
+
+    def __init__(self, lxc=None, agent=None, config=None):
+        self.responses = {'interfaces': lxc or [], 'network-get-interfaces': agent or [], 'config': config or []}
+        self.calls = []
+
+    def nodes(self, node):
+        return FakeEndpoint(self, ('nodes', node))
+
+    def handle(self, path):
+        kind = path[-1]
+        self.calls.append(kind)
+        queue = self.responses[kind]
+        return queue.pop(0) if len(queue) > 1 else (queue[0] if queue else None)
+
+
+def make_waiter(proxmox, **kwargs):
+    """Build a waiter that records sleeps instead of sleeping"""
+    sleeps = []
+    waiter = IPWaiter(proxmox, 'pve', sleep=sleeps.append, **kwargs)
+    return waiter, sleeps
+
+
+class TestIPWaiter:
+    """Test IPWaiter"""
+
+    def test_lxc_ip_after_backoff(self):
+        """Test that the waiter backs off until the LXC reports eth0"""
+        proxmox = FakeProxmox(lxc=[
+            [],
+            [{'name': 'eth0', 'inet': '0.0.0.0/0'}],
+            [{'name': 'lo', 'inet': '127.0.0.1/8'}, {'name': 'eth0', 'inet': '10.0.0.7/24'}]
+        ])
+        waiter, sleeps = make_waiter(proxmox, initial_delay=1, max_delay=3)
+
+        result = waiter.wait(101, 'lxc')
+
+        assert result['ip'] == '10.0.0.7'
+        assert result['source'] == 'lxc-interfaces'
+        assert result['attempts'] == 3
+        assert len(sleeps) == 2
+        assert 0.5 <= sleeps[0] <= 1 and 1 <= sleeps[1] <= 2
+
+    def test_vm_ip_from_guest_agent(self):
+        """Test IPv4 extraction from the QEMU guest agent"""
+        proxmox = FakeProxmox(agent=[{'result': [
+            {'name': 'lo', 'ip-addresses': [{'ip-address-type': 'ipv4', 'ip-address': '127.0.0.1'}]},
+            {'name': 'ens18', 'ip-addresses': [
+                {'ip-address-type': 'ipv6', 'ip-address': 'fe80::1'},
+                {'ip-address-type': 'ipv4', 'ip-address': '10.0.0.8'}
+            ]}
+        ]}])
+        waiter, sleeps = make_waiter(proxmox)
+
+        result = waiter.wait(100, 'vm')
+
+        assert result['ip'] == '10.0.0.8'
+        assert result['source'] == 'guest-agent'
+        assert sleeps == []
+
+    def test_dhcp_leases_answer_before_agent(self, tmp_path):
+        """Test that the lease table finds the address while the agent is still down"""
+        leases = tmp_path / 'dnsmasq.leases'
+        leases.write_text('1700000000 bc:24:11:aa:bb:cc 10.0.0.9 app-1 *\n')
+        proxmox = FakeProxmox(
+            agent=[None],
+            config=[{'net0': 'virtio=BC:24:11:AA:BB:CC,bridge=vmbr0'}]
+        )
+        waiter, _ = make_waiter(proxmox, leases_file=str(leases))
+
+        result = waiter.wait(100, 'vm')
+
+        assert result == {'ip': '10.0.0.9', 'source': 'dhcp-leases', 'attempts': 1, 'seconds': result['seconds']}
+
+    def test_failed_mac_lookup_is_retried(self, tmp_path):
+        """Test that a guest config without a MAC yet does not disable the lease source"""
+        leases = tmp_path / 'dnsmasq.leases'
+        leases.write_text('1700000000 bc:24:11:aa:bb:cc 10.0.0.9 app-1 *\n')
+        proxmox = FakeProxmox(
+            agent=[None],
+            config=[{}, {'net0': 'virtio=BC:24:11:AA:BB:CC,bridge=vmbr0'}]
+        )
+        waiter, sleeps = make_waiter(proxmox, leases_file=str(leases))
+
+        result = waiter.wait(100, 'vm')
+
+        assert result['ip'] == '10.0.0.9'
+        assert result['source'] == 'dhcp-leases'
+        assert result['attempts'] == 2
+        assert proxmox.calls.count('config') == 2
+
+    def test_deadline(self):
+        """Test that the waiter gives up once the deadline has passed"""
+        proxmox = FakeProxmox(lxc=[[]])
+        waiter, _ = make_waiter(proxmox, timeout=0)
+
+        with pytest.raises(IPWaitTimeout):
+            waiter.wait(101, 'lxc')
+
+    def test_parse_leases(self):
+        """Test dnsmasq and ISC dhcpd lease formats"""
+        content = (
+            '1700000000 aa:aa:aa:aa:aa:01 10.0.0.2 host-a *\n'
+            'lease 10.0.0.3 {\n  starts 4 2024/01/01 00:00:00;\n  hardware ethernet AA:AA:AA:AA:AA:02;\n}\n'
+        )
+
+        assert parse_leases(content) == {
+            'aa:aa:aa:aa:aa:01': '10.0.0.2',
+            'aa:aa:aa:aa:aa:02': '10.0.0.3'
+        }
@@ -0,0 +1,132 @@
+"""
+Unit Tests for the deployment job queue
+Run with: pytest tests/
+"""
+
+import threading
+import pytest
+from flask import Flask, current_app
+from backend.api.job_queue import DeploymentJobQueue, QueueFullError
+
+
+@pytest.fixture
+def app():
+    """Fixture for a minimal Flask app carrying queue settings"""
+    app = Flask(__name__)
+    app.config['DEPLOY_WORKERS'] = 2
+    app.config['DEPLOY_QUEUE_SIZE'] = 2
+    return app
+
+
+class TestDeploymentJobQueue:
+    """Test DeploymentJobQueue"""
+
+    def test_jobs_run_in_app_context(self, app):
+        """Test that submitted jobs run on a worker inside the app context"""
+        job_queue = DeploymentJobQueue(app)
+        seen = []
+
+        def job(value):
+            seen.append((value, current_app.name, threading.current_thread().name))
+
+        job_queue.submit(job, 'a')
+        job_queue.submit(job, 'b')
+        job_queue.join()
+        job_queue.shutdown()
+
+        assert sorted(v for v, _, _ in seen) == ['a', 'b']
+        assert all(name == app.name for _, name, _ in seen)
+        assert all(thread.startswith('deploy-worker-') for _, _, thread in seen)
+
+    def test_failing_job_does_not_kill_worker(self, app):
+        """Test that an exception in one job leaves the worker serving others"""
+        app.config['DEPLOY_WORKERS'] = 1
+        job_queue = DeploymentJobQueue(app)
+        seen = []
+
+        def bad_job():
+            raise RuntimeError("boom")
+
+        job_queue.submit(bad_job)
+        job_queue.submit(seen.append, 'ok')
+        job_queue.join()
+        job_queue.shutdown()
+
+        assert seen == ['ok']
+
+    def test_queue_full(self, app):
+        """Test that submit refuses work beyond the queue capacity"""
+        app.config['DEPLOY_WORKERS'] = 1
+        job_queue = DeploymentJobQueue(app)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking_job():
+            started.set()
+            release.wait(5)
+
+        job_queue.submit(blocking_job)
+        started.wait(5)
+        job_queue.submit(lambda: None)
+        job_queue.submit(lambda: None)
+
+        with pytest.raises(QueueFullError):
+            job_queue.submit(lambda: None)
+
+        release.set()
+        job_queue.join()
+        job_queue.shutdown()
+
+    def test_keys_are_owned_until_the_job_finishes(self, app):
+        """Test owns() and the lease renewal of queued and running keys"""
+        app.config['DEPLOY_WORKERS'] = 1
+        app.config['DEPLOY_LEASE_INTERVAL'] = 0.01
+        job_queue = DeploymentJobQueue(app)
+        renewed = []
+        job_queue.on_renew(renewed.append)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking_job():
+            started.set()
+            release.wait(5)
+
+        job_queue.submit(blocking_job, key='a')
+        job_queue.submit(lambda: None, key='b')
+        started.wait(5)
+        while len(renewed) < 2:
+            release.wait(0.01)
+
+        assert job_queue.owns('a') and job_queue.owns('b')
+        assert sorted(renewed[-1]) == ['a', 'b']
+
+        release.set()
+        job_queue.join()
+        job_queue.shutdown()
+
+        assert not job_queue.owns('a') and not job_queue.owns('b')
+
+    def test_shutdown_with_full_queue_drops_queued_jobs(self, app):
+        """Test that shutdown waits only for the running job and refuses new ones"""
+        app.config['DEPLOY_WORKERS'] = 1
+        job_queue = DeploymentJobQueue(app)
+        release = threading.Event()
+        started = threading.Event()
+        seen = []
+
+        def blocking_job():
+            started.set()
+            release.wait(5)
+            seen.append('running')
+
+        job_queue.submit(blocking_job)
+        started.wait(5)
+        job_queue.submit(seen.append, 'queued', key='a')
+        job_queue.submit(seen.append, 'queued', key='b')
+        threading.Timer(0.05, release.set).start()
+
+        assert job_queue.shutdown() == 2
+        assert seen == ['running']
+        assert not job_queue.owns('a')
+        with pytest.raises(QueueFullError):
+            job_queue.submit(lambda: None)
@@ -0,0 +1,150 @@
+"""
+Unit Tests for streamed deployment output
+Run with: pytest tests/
+"""
+
+import threading
+import logging
+from datetime import datetime
+from backend.api.live_output import LineLogger, LiveOutput, OutputBuffer, stream_command
+from backend.api.routes import api_bp
+from backend.extensions import live_output
+from backend.models.deployment import Deployment, DeploymentStatus
+
+
+class FakeChannel:
+    """Channel stand-in replaying output in chunks"""
+
+    def __init__(self, chunks, exit_status=0):
+        self.chunks = list(chunks)
+        self.exit_status = exit_status
+        self.command = None
+        self.closed = False
+
+    def get_pty(self):
+        pass
+
+    def exec_command(self, command):
+        self.command = command
+
+    def recv(self, size):
+        return self.chunks.pop(0) if self.chunks else b''
+
+    def recv_stderr_ready(self):
+        return False
+
+    def recv_exit_status(self):
+        return self.exit_status
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSSH:
+    """SSHClient stand-in handing out one FakeChannel"""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_transport(self):
+        return self
+
+    def open_session(self):
+        return self.channel
+
+
+class TestOutputBuffer:
+    """Test OutputBuffer"""
+
+    def test_ring_buffer_keeps_newest_bytes(self):
+        """Test that the size cap drops the oldest output"""
+        buffer = OutputBuffer(max_bytes=10)
+        buffer.write(b'0123456789')
+        buffer.write(b'abcde')
+
+        chunk = buffer.read(0)
+
+        assert chunk['data'] == b'56789abcde'
+        assert chunk['offset'] == 15
+        assert chunk['truncated'] is True
+        assert buffer.read(12) == {'data': b'cde', 'offset': 15, 'truncated': False, 'closed': False}
+
+    def test_wait_returns_on_new_output(self):
+        """Test that a long-polling reader wakes up on write"""
+        buffer = OutputBuffer()
+        buffer.write(b'first')
+        threading.Timer(0.05, buffer.write, args=(b' second',)).start()
+
+        chunk = buffer.read(5, wait=5)
+
+        assert chunk['data'] == b' second'
+
+    def test_sinks_receive_every_chunk(self, caplog):
+        """Test that complete lines are forwarded to the log sink"""
+        log = logging.getLogger('test-live-output')
+        buffer = OutputBuffer(max_bytes=4, sinks=[LineLogger(log, '[app] ')])
+
+        with caplog.at_level(logging.DEBUG, logger='test-live-output'):
+            buffer.write(b'npm WARN one\r\nnpm ')
+            buffer.write(b'WARN two\n')
+
+        assert [r.message for r in caplog.records] == ['[app] npm WARN one', '[app] npm WARN two']
+
+
+class TestStreamCommand:
+    """Test stream_command"""
+
+    def test_output_streamed_into_buffer(self):
+        """Test that output lands in the buffer chunk by chunk"""
+        channel = FakeChannel([b'added 1 package\n', b'done\n'])
+        buffer = OutputBuffer()
+
+        result = stream_command(FakeSSH(channel), 'npm install', buffer)
+
+        assert channel.command == 'npm install'
+        assert channel.closed
+        assert result['exit_status'] == 0
+        assert result['tail'] == 'added 1 package\ndone\n'
+        assert buffer.read(0)['data'] == b'added 1 package\ndone\n'
+
+    def test_registry_retains_finished_buffers(self):
+        """Test that only the newest finished buffers are kept"""
+        registry = LiveOutput()
+        registry.retain = 1
+
+        for deployment_id in ('a', 'b', 'c'):
+            registry.open(deployment_id).close()
+        running = registry.open('d')
+
+        assert registry.get('a') is None and registry.get('b') is None
+        assert registry.get('c') is not None
+        assert registry.get('d') is running
+
+
+class TestOutputRoute:
+    """Test GET /api/deployments/<id>/output"""
+
+    def test_offset_returns_only_new_output(self, app):
+        """Test that ?offset= is the byte offset from the previous response"""
+        app.register_blueprint(api_bp, url_prefix='/api')
+        deployment = Deployment(
+            name='output-app',
+            deployment_type='lxc',
+            framework='flask',
+            github_url='https://github.com/test/repo',
+            resources={},
+            status=DeploymentStatus.DEPLOYING,
+            created_at=datetime.utcnow()
+        )
+        deployment.save()
+        buffer = live_output.open(deployment.id)
+        buffer.write(b'cloning\n')
+        client = app.test_client()
+
+        first = client.get(f'/api/deployments/{deployment.id}/output').get_json()
+        buffer.write(b'installing\n')
+        second = client.get(f'/api/deployments/{deployment.id}/output?offset={first["offset"]}').get_json()
+
+        assert (first['output'], second['output']) == ('cloning\n', 'installing\n')
+        assert second['running']
+        buffer.close()
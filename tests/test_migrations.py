@@ -0,0 +1,104 @@
+"""
+Unit Tests for database migrations
+Run with: pytest tests/
+"""
+
+from pathlib import Path
+import sqlalchemy as sa
+import pytest
+from flask import Flask
+from flask_migrate import Migrate, downgrade, upgrade
+from backend.extensions import db
+from backend.models.deployment import Deployment, DeploymentStatus
+from backend.utils.migrate import LazyMigrate
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / 'migrations'
+
+INDEXES = {
+    'ix_deployments_status_created_at',
+    'ix_deployments_created_at_id',
+    'ix_deployments_vm_id_active'
+}
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Fixture for an application bound to an empty SQLite file"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'migrate.db'}"
+    db.init_app(app)
+    Migrate(app, db, directory=str(MIGRATIONS_DIR))
+    with app.app_context():
+        yield app
+        db.engine.dispose()
+
+
+def index_names():
+    """Names of the indexes on the deployments table"""
+    return {index['name'] for index in sa.inspect(db.engine).get_indexes('deployments')}
+
+
+class TestMigrations:
+    """Test the Alembic migrations"""
+
+    def test_upgrade_and_downgrade(self, app):
+        """Test that a fresh database gets the table and every index"""
+        upgrade()
+        assert INDEXES <= index_names()
+        assert 'ix_deployments_status' not in index_names()
+        assert sa.inspect(db.engine).has_table('deployment_events')
+        assert sa.inspect(db.engine).has_table('vm_id_reservations')
+        assert sa.inspect(db.engine).has_table('golden_images')
+        assert sa.inspect(db.engine).has_table('package_caches')
+        assert sa.inspect(db.engine).has_table('deployment_checkpoints')
+        assert 'heartbeat_at' in {column['name'] for column in sa.inspect(db.engine).get_columns('deployments')}
+
+        downgrade(revision='8b8a24883df7')
+        assert not INDEXES & index_names()
+
+    def test_upgrade_database_created_by_create_all(self, app):
+        """Test that databases created before migrations upgrade cleanly"""
+        db.create_all()
+
+        upgrade()
+
+        assert INDEXES <= index_names()
+
+    def test_resources_json_migrated_to_native_json(self, app):
+        """Test that rows written in the old text layout keep their resources"""
+        upgrade(revision='5f028bdae3da')
+        db.session.execute(sa.text(
+            "INSERT INTO deployments (id, name, deployment_type, framework, github_url, resources_json, status, created_at) "
+            "VALUES ('a', 'app-a', 'lxc', 'django', 'https://github.com/test/repo', '{\"cores\": 2}', 'running', '2024-01-01 00:00:00'), "
+            "('b', 'app-b', 'lxc', 'django', 'https://github.com/test/repo', NULL, 'deleted', '2024-01-01 00:00:00')"
+        ))
+        db.session.commit()
+
+        upgrade()
+
+        columns = {column['name'] for column in sa.inspect(db.engine).get_columns('deployments')}
+        assert 'resources' in columns and 'resources_json' not in columns
+        assert INDEXES <= index_names()
+        assert db.session.get(Deployment, 'a').resources == {'cores': 2}
+        assert db.session.get(Deployment, 'a').status == DeploymentStatus.RUNNING
+        assert db.session.get(Deployment, 'b').to_dict()['resources'] == {}
+
+
+class TestLazyMigrate:
+    """Test the lazily loaded `flask db` command group"""
+
+    def test_db_commands_bind_flask_migrate_on_use(self, tmp_path):
+        """Test that Flask-Migrate is bound only when a db command runs"""
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'cli.db'}"
+        db.init_app(app)
+        LazyMigrate(app, db, directory=str(MIGRATIONS_DIR))
+        assert 'migrate' not in app.extensions
+
+        result = app.test_cli_runner().invoke(args=['db', 'upgrade'])
+
+        assert result.exit_code == 0, result.output
+        assert 'migrate' in app.extensions
+        with app.app_context():
+            assert sa.inspect(db.engine).has_table('deployment_events')
+            db.engine.dispose()
@@ -0,0 +1,105 @@
+"""
+Unit Tests for the package cache
+Run with: pytest tests/
+"""
+
+import subprocess
+from datetime import datetime
+from backend.api import package_cache
+from backend.api.terraform_manager import TerraformManager
+from backend.extensions import db
+from backend.models.package_cache import PackageCache
+from backend.utils.validators import validate_deployment_name
+
+CACHE_URL = 'http://10.0.0.5:3142'
+
+
+class TestGuestCommands:
+    """Test pointing guests at the cache"""
+
+    def test_cache_setup_runs_as_unkeyed_preamble(self, app, monkeypatch):
+        """Test that the cache settings come first without changing the resumable steps"""
+        runs = []
+        monkeypatch.setattr(
+            TerraformManager, 'run_commands',
+            lambda self, ip, commands, preamble=None, **kwargs: runs.append((commands, preamble)) or {'success': True}
+        )
+
+        for url in (CACHE_URL, None):
+            TerraformManager().deploy_application('10.0.0.9', 'flask', 'https://github.com/test/repo', package_cache_url=url)
+
+        (with_cache, preamble), (without_cache, no_preamble) = runs
+        assert preamble == package_cache.guest_commands(CACHE_URL)
+        assert no_preamble == [f"rm -f {' '.join(package_cache.GUEST_CONFIG_FILES)}"]
+        assert with_cache == without_cache
+        assert 'apt-get update' in with_cache[0]
+
+    def test_guest_files(self, tmp_path):
+        """Test the apt, pip and npm files the guest command writes"""
+        command = package_cache.guest_commands(CACHE_URL)[0]
+        for path in ('/etc/apt/apt.conf.d/01paas-package-cache', '/etc/pip.conf', '/root/.npmrc'):
+            command = command.replace(path, str(tmp_path / path.rsplit('/', 1)[-1]))
+
+        subprocess.run(['sh', '-c', command], check=True)
+
+        apt_conf = (tmp_path / '01paas-package-cache').read_text()
+        assert f'Acquire::http::Proxy::archive.ubuntu.com "{CACHE_URL}/";' in apt_conf.splitlines()
+        assert (tmp_path / 'pip.conf').read_text() == (
+            f"[global]\nindex-url = {CACHE_URL}/pypi/simple/\ntrusted-host = 10.0.0.5\n"
+        )
+        assert (tmp_path / '.npmrc').read_text() == f"registry={CACHE_URL}/npm/\n"
+
+
+class TestCacheStats:
+    """Test summarize_stats"""
+
+    def test_hit_ratios_and_bytes_saved(self):
+        """Test that HIT-like statuses count as served from cache"""
+        stats = package_cache.summarize_stats({'generated_at': 1, 'entries': [
+            {'section': 'npm', 'status': 'HIT', 'requests': 90, 'bytes': 9000},
+            {'section': 'npm', 'status': 'MISS', 'requests': 10, 'bytes': 1000},
+            {'section': 'apt', 'status': 'REVALIDATED', 'requests': 3, 'bytes': 30},
+            {'section': 'apt', 'status': 'MISS', 'requests': 1, 'bytes': 500},
+            {'section': 'apt', 'status': '-', 'requests': 4, 'bytes': 0}
+        ]})
+
+        assert stats['sections']['npm']['hit_ratio'] == 0.9
+        assert stats['sections']['npm']['bytes_from_cache'] == 9000
+        assert stats['sections']['apt']['hit_ratio'] == 0.375
+        assert stats['total'] == {
+            'requests': 108, 'hits': 93, 'bytes': 10530, 'bytes_from_cache': 9030, 'hit_ratio': 0.861
+        }
+
+
+class TestActiveCache:
+    """Test which cache guests are pointed at"""
+
+    def test_configured_url_wins_and_flag_disables(self, app):
+        """Test PACKAGE_CACHE_URL over the managed cache, and PACKAGE_CACHE_ENABLED=False"""
+        assert package_cache.active_cache_url() is None
+
+        db.session.add(PackageCache(status='ready', ip_address='10.0.0.7', port=3142, ready_at=datetime.utcnow()))
+        db.session.commit()
+        assert package_cache.active_cache_url() == 'http://10.0.0.7:3142'
+
+        app.config['PACKAGE_CACHE_URL'] = 'http://cache.internal:3142/'
+        assert package_cache.active_cache_url() == 'http://cache.internal:3142'
+
+        app.config['PACKAGE_CACHE_ENABLED'] = False
+        assert package_cache.active_cache_url() is None
+
+    def test_cache_name_cannot_be_taken_by_a_deployment(self):
+        """Test that the cache's Terraform workdir name is reserved"""
+        assert package_cache.CACHE_NAME.startswith('_paas-')
+        assert not validate_deployment_name(package_cache.CACHE_NAME)
+        assert validate_deployment_name('package-cache')
+
+    def test_provision_is_not_queued_twice(self, app):
+        """Test that a ready cache is returned instead of provisioning another"""
+        db.session.add(PackageCache(status='ready', ip_address='10.0.0.7', port=3142))
+        db.session.commit()
+
+        cache, queued = package_cache.queue_provision()
+
+        assert queued is False
+        assert cache.ip_address == '10.0.0.7'
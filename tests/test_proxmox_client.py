@@ -0,0 +1,89 @@
+"""
+Unit Tests for the shared Proxmox API client
+Run with: pytest tests/
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from proxmoxer.core import ResourceException
+from backend.api import proxmox_client
+from backend.api.proxmox_client import get_proxmox, parse_proxmox_host, with_proxmox
+
+
+class FakeSession:
+    """Session stand-in accepting adapter mounts"""
+
+    def __init__(self):
+        self.adapters = {}
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
+
+
+class FakeProxmoxAPI:
+    """Counts logins instead of talking to Proxmox"""
+
+    logins = 0
+
+    def __init__(self, host, **kwargs):
+        FakeProxmoxAPI.logins += 1
+        self.host = host
+        self._store = {'session': FakeSession()}
+
+
+@pytest.fixture
+def config(monkeypatch):
+    """Fixture for Proxmox settings with a fake API class"""
+    monkeypatch.setattr(proxmox_client, 'ProxmoxAPI', FakeProxmoxAPI)
+    monkeypatch.setattr(proxmox_client, '_clients', {})
+    FakeProxmoxAPI.logins = 0
+    return {
+        'PROXMOX_URL': 'https://10.0.0.1:8006/api2/json',
+        'PROXMOX_USER': 'root@pam',
+        'PROXMOX_PASSWORD': 'secret',
+        'PROXMOX_POOL_SIZE': 8
+    }
+
+
+class TestProxmoxClient:
+    """Test the shared, ticket-caching Proxmox client"""
+
+    def test_parse_proxmox_host(self):
+        """Test host extraction from API URLs"""
+        assert parse_proxmox_host('https://10.0.0.1:8006/api2/json') == '10.0.0.1'
+        assert parse_proxmox_host('https://pve.local/api2/json') == 'pve.local'
+        assert parse_proxmox_host('10.0.0.1:8006') == '10.0.0.1'
+
+    def test_client_is_reused(self, config):
+        """Test that one login serves many callers, including threads"""
+        first = get_proxmox(config)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: get_proxmox(config), range(32)))
+
+        assert FakeProxmoxAPI.logins == 1
+        assert all(client is first for client in clients)
+        assert first._store['session'].adapters['https://']._pool_maxsize == 8
+
+    def test_relogin_after_rejected_ticket(self, config):
+        """Test that a 401 drops the cached client and retries once"""
+        calls = []
+
+        def func(proxmox):
+            calls.append(proxmox)
+            if len(calls) == 1:
+                raise ResourceException(401, 'Unauthorized', 'ticket expired')
+            return 'ok'
+
+        assert with_proxmox(func, config) == 'ok'
+        assert FakeProxmoxAPI.logins == 2
+        assert calls[0] is not calls[1]
+
+    def test_other_errors_are_not_retried(self, config):
+        """Test that non-auth errors propagate without a new login"""
+        def func(proxmox):
+            raise ResourceException(500, 'Internal Server Error', 'boom')
+
+        with pytest.raises(ResourceException):
+            with_proxmox(func, config)
+        assert FakeProxmoxAPI.logins == 1
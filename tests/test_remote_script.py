@@ -0,0 +1,101 @@
+"""
+Unit Tests for the batched remote script
+Run with: pytest tests/
+"""
+
+import subprocess
+from backend.api.live_output import OutputBuffer
+from backend.api.remote_script import StepTracker, render_script, step_keys
+from backend.api.stage_events import StageTimer
+
+
+def run_script(commands, state_dir, keys=None, chunk_size=7):
+    """Run a rendered script locally, feeding its output to a tracker in small chunks"""
+    output, stages = OutputBuffer(), StageTimer()
+    tracker = StepTracker(commands, output, stages, keys=keys)
+    state_dir.mkdir(exist_ok=True)
+    script = state_dir / 'run.sh'
+    script.write_text(render_script(commands, str(state_dir), keys))
+
+    result = subprocess.run(['bash', str(script)], capture_output=True)
+    for i in range(0, len(result.stdout), chunk_size):
+        tracker(result.stdout[i:i + chunk_size])
+
+    return result.returncode, tracker, output.read(0)['data'].decode(), stages.events
+
+
+class TestRenderScript:
+    """Test rendering and following the deployment script"""
+
+    def test_steps_reported_without_markers(self, tmp_path):
+        """Test per-step stages, headers in place of markers and cleanup on success"""
+        commands = ['cd / && echo one', 'printf two', 'echo "$PWD" | grep -vx /']
+        state_dir = tmp_path / 'state'
+
+        code, tracker, text, events = run_script(commands, state_dir)
+
+        assert code == 0
+        assert tracker.completed == 3 and tracker.failed is None
+        assert '@@paas-step' not in text
+        assert text.startswith('>>> [1/3] cd / && echo one\none\n>>> [2/3]')
+        assert 'two\n>>> [3/3]' in text
+        assert [(e['stage'], e['status'], e['detail']['index']) for e in events] == [
+            ('command', 'ok', 1), ('command', 'ok', 2), ('command', 'ok', 3)
+        ]
+        assert not state_dir.exists()
+
+    def test_rerun_resumes_after_last_completed_step(self, tmp_path):
+        """Test that a failed run stops at the failing step and the next run skips finished ones"""
+        counter, flag = tmp_path / 'counter', tmp_path / 'flag'
+        commands = [f'echo x >> {counter}', f'echo checking && test -e {flag}', 'echo finished']
+        state_dir = tmp_path / 'state'
+
+        code, tracker, text, _ = run_script(commands, state_dir)
+        assert code == 1
+        assert tracker.failed == {'index': 2, 'exit_status': 1, 'tail': 'checking\n'}
+        assert 'finished' not in text
+
+        flag.touch()
+        code, tracker, text, events = run_script(commands, state_dir)
+        assert code == 0
+        assert tracker.skipped == 1 and tracker.completed == 2
+        assert '>>> [1/3] echo x' in text and '(already done)' in text
+        assert events[0]['status'] == 'skipped'
+        assert counter.read_text() == 'x\n'
+
+    def test_unkeyed_preamble_runs_every_time(self, tmp_path):
+        """Test that steps without a key are re-run on resume and skipped ones are not"""
+        preamble, counter, flag = tmp_path / 'preamble', tmp_path / 'counter', tmp_path / 'flag'
+        commands = [f'echo p >> {preamble}', f'echo x >> {counter}', f'test -e {flag}']
+        keys = [None] + step_keys(commands[1:])
+        state_dir = tmp_path / 'state'
+
+        assert run_script(commands, state_dir, keys)[0] == 1
+        flag.touch()
+        code, tracker, _, _ = run_script(commands, state_dir, keys)
+
+        assert code == 0
+        assert tracker.skipped == 1
+        assert preamble.read_text() == 'p\np\n'
+        assert counter.read_text() == 'x\n'
+
+    def test_checkpointed_steps_skipped_without_marker(self, tmp_path):
+        """Test that keys passed as completed are skipped on a guest without marker files"""
+        counter = tmp_path / 'counter'
+        commands = [f'echo x >> {counter}', 'echo next']
+        script = tmp_path / 'run.sh'
+        script.write_text(render_script(commands, str(tmp_path / 'state'), completed=step_keys(commands)[:1]))
+
+        result = subprocess.run(['bash', str(script)], capture_output=True, text=True)
+
+        assert result.returncode == 0
+        assert '@@paas-step 1 skip' in result.stdout and 'next' in result.stdout
+        assert not counter.exists()
+
+    def test_changed_command_invalidates_later_steps(self):
+        """Test that step keys chain through every earlier command"""
+        first = step_keys(['a', 'b', 'c'])
+        second = step_keys(['a', 'B', 'c'])
+
+        assert first[0] == second[0]
+        assert first[1] != second[1] and first[2] != second[2]
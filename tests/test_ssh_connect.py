@@ -0,0 +1,146 @@
+"""
+Unit Tests for the SSH readiness probe
+Run with: pytest tests/
+"""
+
+import socket
+import threading
+import pytest
+from backend.api.ssh_connect import SSHConnector, SSHWaitTimeout, read_banner
+
+
+@pytest.fixture
+def banner_server():
+    """Fixture for a local TCP server that greets like sshd"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(8)
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            conn.sendall(b'SSH-2.0-OpenSSH_9.2\r\n')
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield server.getsockname()[1]
+    server.close()
+
+
+class FakeChannel:
+    """Channel stand-in returning a canned banner"""
+
+    def __init__(self, banner):
+        self.banner = banner
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def recv(self, size):
+        data, self.banner = self.banner[:size], self.banner[size:]
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTransport:
+    """Jump transport stand-in recording direct-tcpip channels"""
+
+    def __init__(self):
+        self.channels = []
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def open_channel(self, kind, dest_addr, src_addr, timeout=None):
+        if not self.active:
+            raise EOFError('transport closed')
+        channel = FakeChannel(b'SSH-2.0-test\r\n')
+        self.channels.append((kind, dest_addr, channel))
+        return channel
+
+
+def make_connector(port=22, **kwargs):
+    """Build a connector that records sleeps instead of sleeping"""
+    sleeps = []
+    connector = SSHConnector('127.0.0.1', 'root', '/dev/null', port=port, sleep=sleeps.append, **kwargs)
+    return connector, sleeps
+
+
+class TestSSHConnector:
+    """Test SSHConnector"""
+
+    def test_probe_reads_banner(self, banner_server):
+        """Test that a listening sshd-like peer passes the probe"""
+        connector, _ = make_connector(port=banner_server)
+        assert connector.probe() is True
+
+    def test_probe_closed_port(self):
+        """Test that a refused connection fails the probe"""
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+        probe.close()
+
+        connector, _ = make_connector(port=port, probe_timeout=0.5)
+        assert connector.probe() is False
+
+    def test_login_only_after_probe_succeeds(self, monkeypatch):
+        """Test that full logins wait for the banner and back off in between"""
+        connector, sleeps = make_connector(initial_delay=1, max_delay=2)
+        results = iter([False, False, False, True])
+        logins = []
+        monkeypatch.setattr(connector, 'probe', lambda: next(results))
+        monkeypatch.setattr(connector, '_login', lambda: logins.append(1) or 'client')
+
+        result = connector.connect()
+
+        assert result['client'] == 'client'
+        assert result['attempts'] == 4
+        assert result['logins'] == 1
+        assert len(sleeps) == 3
+        assert 0.5 <= sleeps[0] <= 1 and 1 <= sleeps[1] <= 2 and 1 <= sleeps[2] <= 2
+
+    def test_deadline(self, monkeypatch):
+        """Test that the connector gives up at the deadline"""
+        connector, _ = make_connector(timeout=0)
+        monkeypatch.setattr(connector, 'probe', lambda: False)
+
+        with pytest.raises(SSHWaitTimeout):
+            connector.connect()
+
+    def test_probes_reuse_jump_transport(self):
+        """Test that probes ride channels on the shared jump transport"""
+        transport = FakeTransport()
+        connector, _ = make_connector(jump_transport=transport)
+
+        assert connector.probe() and connector.probe()
+        assert [c[:2] for c in transport.channels] == [('direct-tcpip', ('127.0.0.1', 22))] * 2
+        assert all(c[2].closed for c in transport.channels)
+
+    def test_dead_jump_transport_is_renewed(self, monkeypatch):
+        """Test that probing moves to a fresh jump transport once the leased one dies"""
+        dead, fresh = FakeTransport(), FakeTransport()
+        dead.active = False
+        renewals = []
+        connector, sleeps = make_connector(jump_transport=dead, renew_jump=lambda: renewals.append(1) or fresh)
+        monkeypatch.setattr(connector, '_login', lambda: 'client')
+
+        result = connector.connect()
+
+        assert result['attempts'] == 1
+        assert renewals == [1]
+        assert connector.jump_transport is fresh
+        assert len(fresh.channels) == 1 and dead.channels == []
+        assert sleeps == []
+
+    def test_read_banner_rejects_other_protocols(self):
+        """Test that non-SSH greetings are rejected"""
+        assert read_banner(FakeChannel(b'HTTP/1.1 400'), 1) is False
+        assert read_banner(FakeChannel(b''), 1) is False
@@ -0,0 +1,136 @@
+"""
+Unit Tests for the SSH jump-host pool
+Run with: pytest tests/
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import pytest
+from flask import Flask
+from backend.api.ssh_pool import JumpHostPool
+
+
+class FakeTransport:
+    """Transport stand-in tracking keepalive and liveness"""
+
+    def __init__(self):
+        self.active = True
+        self.keepalive = None
+
+    def is_active(self):
+        return self.active
+
+    def set_keepalive(self, interval):
+        self.keepalive = interval
+
+
+class FakeClient:
+    """SSHClient stand-in wrapping a FakeTransport"""
+
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+        self.transport.active = False
+
+
+@pytest.fixture
+def logins():
+    """Fixture recording jump-host logins"""
+    return []
+
+
+@pytest.fixture
+def pool(logins):
+    """Fixture for a pool with two leases per transport"""
+    lock = threading.Lock()
+
+    def connect(host, user, password):
+        client = FakeClient()
+        with lock:
+            logins.append((host, user, client))
+        return client
+
+    app = Flask(__name__)
+    app.config.update(
+        SSH_JUMP_HOST='10.0.0.1',
+        SSH_JUMP_USER='root',
+        SSH_JUMP_POOL_SIZE=2,
+        SSH_JUMP_MAX_LEASES=2,
+        SSH_JUMP_KEEPALIVE=15,
+        SSH_JUMP_IDLE_TIMEOUT=300
+    )
+    return JumpHostPool(app, connect=connect)
+
+
+class TestJumpHostPool:
+    """Test JumpHostPool"""
+
+    def test_sequential_leases_reuse_login(self, pool, logins):
+        """Test that back-to-back deployments share one login"""
+        for _ in range(10):
+            with pool.lease() as lease:
+                assert lease.transport.is_active()
+
+        assert len(logins) == 1
+        assert logins[0][2].transport.keepalive == 15
+
+    def test_concurrent_leases_are_bounded(self, pool, logins):
+        """Test that concurrency spreads over at most max_size transports"""
+        barrier = threading.Barrier(6)
+
+        def deploy(_):
+            with pool.lease() as lease:
+                barrier.wait(timeout=5)
+                return lease.transport
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            transports = list(executor.map(deploy, range(6)))
+
+        assert len(logins) == 2
+        assert len(set(map(id, transports))) == 2
+        assert pool.stats() == {'transports': 2, 'leases': 0, 'max_size': 2}
+
+    def test_dead_transport_is_replaced(self, pool, logins):
+        """Test that a dropped connection is evicted on the next lease"""
+        with pool.lease() as lease:
+            transport = lease.transport
+        transport.active = False
+
+        with pool.lease() as lease:
+            assert lease.transport is not transport
+
+        assert len(logins) == 2
+        assert logins[0][2].closed
+
+    def test_lease_renews_dead_transport(self, pool, logins):
+        """Test that a lease moves off a transport that died mid-deployment"""
+        with pool.lease() as lease:
+            dead = lease.transport
+            dead.active = False
+
+            fresh = lease.renew()
+
+            assert fresh is not dead and fresh.is_active()
+            assert pool.stats() == {'transports': 1, 'leases': 1, 'max_size': 2}
+
+        assert len(logins) == 2
+        assert logins[0][2].closed
+        assert pool.stats()['leases'] == 0
+
+    def test_idle_transport_is_closed(self, pool, logins):
+        """Test that transports idle past the timeout are evicted"""
+        with pool.lease():
+            pass
+        pool._pool[0].last_used -= 301
+
+        with pool.lease():
+            pass
+
+        assert logins[0][2].closed
+        assert pool.stats()['transports'] == 1
@@ -0,0 +1,101 @@
+"""
+Unit Tests for deployment stage events
+Run with: pytest tests/
+"""
+
+from datetime import datetime
+import time
+import pytest
+from flask import Flask
+from backend.api.stage_events import StageEventWriter, StageTimer
+from backend.extensions import db
+from backend.models.deployment import Deployment, DeploymentStatus
+from backend.models.deployment_event import DeploymentEvent
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def writer():
+    """Fixture for a writer bound to an in-memory database with one deployment"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['DEPLOYMENT_TIMELINE_FLUSH_INTERVAL'] = 0.05
+    db.init_app(app)
+    writer = StageEventWriter(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Deployment(
+            id='deployment-1',
+            name='timeline-app',
+            deployment_type='lxc',
+            framework='flask',
+            github_url='https://github.com/test/repo',
+            resources={},
+            status=DeploymentStatus.PENDING,
+            created_at=datetime.utcnow()
+        ))
+        db.session.commit()
+        yield writer
+        db.session.remove()
+
+
+class TestStageTimer:
+    """Test StageTimer"""
+
+    def test_offsets_and_durations(self):
+        """Test that rows carry offsets from the run start and stage durations"""
+        clock, rows = FakeClock(), []
+        timer = StageTimer('deployment-1', sink=rows.append, clock=clock)
+
+        clock.now += 2
+        started = timer.now()
+        clock.now += 1.5
+        assert timer.record('terraform_plan', started, changes=True) == 1.5
+
+        assert rows[0]['stage'] == 'terraform_plan'
+        assert rows[0]['offset_seconds'] == 2.0
+        assert rows[0]['duration_seconds'] == 1.5
+        assert rows[0]['detail'] == {'changes': True}
+
+
+class TestStageEventWriter:
+    """Test StageEventWriter and the deployment_events queries"""
+
+    def test_rows_written_in_background_batches(self, writer):
+        """Test that queued rows reach the table without an explicit flush"""
+        timer = StageTimer('deployment-1', sink=writer.record)
+        for stage in ('config_generated', 'terraform_init', 'terraform_plan'):
+            timer.record(stage, timer.now())
+
+        deadline = time.monotonic() + 5
+        while writer.written < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert [event.stage for event in DeploymentEvent.timeline('deployment-1')] == [
+            'config_generated', 'terraform_init', 'terraform_plan'
+        ]
+
+    def test_stage_percentiles(self, writer):
+        """Test nearest-rank p50/p95 per stage over successful rows only"""
+        clock = FakeClock()
+        timer = StageTimer('deployment-1', sink=writer.record, clock=clock)
+        for seconds in range(1, 21):
+            started = timer.now()
+            clock.now += seconds
+            timer.record('terraform_apply', started)
+        timer.record('terraform_apply', timer.now() - 500, status='failed')
+        writer.flush()
+
+        stats = DeploymentEvent.stage_percentiles()
+
+        assert stats['terraform_apply'] == {'count': 20, 'p50': 10.0, 'p95': 19.0, 'max': 20.0}
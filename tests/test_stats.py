@@ -0,0 +1,95 @@
+"""
+Unit Tests for aggregate deployment statistics
+Run with: pytest tests/
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from backend.api.stats_cache import StatsCache
+from backend.extensions import db
+from backend.models.deployment import Deployment, DeploymentStatus
+
+
+@pytest.fixture
+def database():
+    """Fixture for an in-memory database with a few deployments"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        start = datetime(2024, 1, 1)
+        rows = [
+            ('vm', 'django', DeploymentStatus.RUNNING, 120),
+            ('lxc', 'django', DeploymentStatus.RUNNING, 60),
+            ('lxc', 'flask', DeploymentStatus.FAILED, None),
+            ('lxc', 'flask', DeploymentStatus.PENDING, None)
+        ]
+        for i, (deployment_type, framework, status, seconds) in enumerate(rows):
+            deployment = Deployment(
+                name=f"app-{i}",
+                deployment_type=deployment_type,
+                framework=framework,
+                github_url='https://github.com/test/repo',
+                resources={},
+                status=status,
+                created_at=start
+            )
+            if seconds is not None:
+                deployment.deployed_at = start + timedelta(seconds=seconds)
+            db.session.add(deployment)
+        db.session.commit()
+        yield
+        db.session.remove()
+
+
+class TestAggregateStats:
+    """Test Deployment.aggregate_stats"""
+
+    def test_breakdowns_and_durations(self, database):
+        """Test that one grouped query yields every breakdown"""
+        stats = Deployment.aggregate_stats()
+
+        assert stats['total'] == 4
+        assert stats['by_status']['running'] == 2
+        assert stats['by_status']['failed'] == 1
+        assert stats['by_status']['deleted'] == 0
+        assert stats['by_framework'] == {'django': 2, 'flask': 2}
+        assert stats['by_type'] == {'vm': 1, 'lxc': 3}
+        assert stats['durations'] == {'deployed_count': 2, 'avg_deploy_seconds': 90.0, 'max_deploy_seconds': 120.0}
+
+
+class TestStatsCache:
+    """Test StatsCache"""
+
+    def test_ttl_and_invalidation(self):
+        """Test that results are reused within the TTL until invalidated"""
+        cache = StatsCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {'total': len(calls)}
+
+        assert cache.get(compute)['total'] == 1
+        assert cache.get(compute)['total'] == 1
+
+        cache.invalidate({'status': 'running'})
+        assert cache.get(compute)['total'] == 2
+
+        cache._computed_at -= cache.ttl + 1
+        assert cache.get(compute)['total'] == 3
+
+    def test_change_during_compute_is_not_cached(self):
+        """Test that a result computed across an invalidation is not kept"""
+        cache = StatsCache()
+
+        def compute():
+            cache.invalidate()
+            return {'total': 1}
+
+        cache.get(compute)
+
+        assert cache._value is None
@@ -0,0 +1,47 @@
+"""
+Unit Tests for the stream slot limit
+Run with: pytest tests/
+"""
+
+import pytest
+from backend.api.routes import api_bp
+from backend.api.stream_slots import StreamSlots
+from backend.extensions import stream_slots
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    """Fixture for a test client of the API with room for one stream"""
+    app.register_blueprint(api_bp, url_prefix='/api')
+    monkeypatch.setattr(stream_slots, 'limit', 1)
+    monkeypatch.setattr(stream_slots, '_in_use', 0)
+    return app.test_client()
+
+
+class TestStreamSlots:
+    """Test StreamSlots and the streaming endpoints that use it"""
+
+    def test_acquire_up_to_the_limit(self, app):
+        """Test that slots are refused at the limit and reusable after release"""
+        app.config['STREAM_LIMIT'] = 2
+        slots = StreamSlots(app)
+
+        assert [slots.acquire() for _ in range(3)] == [True, True, False]
+        slots.release()
+        assert slots.acquire()
+
+    def test_api_served_while_streams_are_at_the_limit(self, client):
+        """Test the 503 for a stream over the limit, and that other requests still succeed"""
+        stream = client.get('/api/deployments/events', buffered=False)
+        assert stream.status_code == 200
+        assert next(stream.response).startswith(b'retry:')
+
+        refused = client.get('/api/deployments/events')
+        assert refused.status_code == 503
+        assert refused.headers['Retry-After'] == str(stream_slots.retry_after)
+        assert client.get('/api/deployments').status_code == 200
+
+        stream.close()
+        reopened = client.get('/api/deployments/events', buffered=False)
+        assert reopened.status_code == 200
+        reopened.close()
@@ -0,0 +1,143 @@
+"""
+Unit Tests for TerraformManager orchestration
+Run with: pytest tests/
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from backend.api import terraform_manager
+from backend.api.terraform_manager import TerraformManager
+
+
+class FakeTerraform:
+    """Records the working directory of every command instead of running terraform"""
+
+    calls = []
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, working_dir=None, terraform_bin_path=None):
+        self.working_dir = working_dir
+
+    def _run(self, name):
+        cls = FakeTerraform
+        with cls.lock:
+            cls.calls.append((name, self.working_dir))
+            cls.running += 1
+            cls.peak = max(cls.peak, cls.running)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.running -= 1
+
+    def init(self, **kwargs):
+        self._run('init')
+        return 0, '', ''
+
+    def plan(self, **kwargs):
+        self._run('plan')
+        return 2, '', ''
+
+    def apply(self, **kwargs):
+        self._run('apply')
+        return 0, '', ''
+
+    def cmd(self, *args, **kwargs):
+        self._run(args[0])
+        return 0, '', ''
+
+    def output(self, **kwargs):
+        return {'vm_id': {'value': 101}, 'ip_address': {'value': '10.0.0.2'}}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Fixture for a TerraformManager wired to FakeTerraform"""
+    monkeypatch.setattr(terraform_manager, 'Terraform', FakeTerraform)
+    FakeTerraform.calls = []
+    FakeTerraform.running = 0
+    FakeTerraform.peak = 0
+
+    tf_dir = tmp_path / 'terraform'
+    tf_dir.mkdir()
+    (tf_dir / 'main.tf').write_text('# config\n')
+    (tf_dir / '.terraform.lock.hcl').write_text('# lock\n')
+    return TerraformManager(terraform_dir=tf_dir, state_dir=tf_dir / 'states', max_parallel=2)
+
+
+class TestParallelApply:
+    """Test isolated working directories and the apply concurrency limit"""
+
+    def test_apply_uses_isolated_workdir(self, manager):
+        """Test that each deployment runs terraform in its own directory"""
+        config = {'variables': {'vm_id': 101}, 'deployment_type': 'lxc'}
+
+        assert manager.apply('app-one', config)['success'] is True
+        assert manager.apply('app-two', config)['success'] is True
+
+        workdirs = {wd for call, wd in FakeTerraform.calls if call != 'init'}
+        assert workdirs == {
+            str(manager.state_dir / 'app-one'),
+            str(manager.state_dir / 'app-two')
+        }
+        for name in ('app-one', 'app-two'):
+            workdir = manager.state_dir / name
+            assert (workdir / 'main.tf').exists()
+            assert (workdir / '.terraform.lock.hcl').exists()
+            assert (workdir / 'terraform.tfvars.json').exists()
+            assert (workdir / '.terraform').is_dir()
+        assert not any(call == 'workspace' for call, _ in FakeTerraform.calls)
+
+    def test_apply_respects_concurrency_limit(self, manager):
+        """Test that no more than max_parallel applies run at once"""
+        config = {'variables': {}, 'deployment_type': 'lxc'}
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda i: manager.apply(f"app-{i}", config), range(6)))
+
+        assert all(r['success'] for r in results)
+        assert FakeTerraform.peak == 2
+
+    def test_destroy_isolated_workdir(self, manager):
+        """Test that destroy runs in the deployment directory and removes it"""
+        config = {'variables': {}, 'deployment_type': 'vm'}
+        manager.apply('app-gone', config)
+
+        result = manager.destroy('app-gone')
+
+        assert result['success'] is True
+        assert ('destroy', str(manager.state_dir / 'app-gone')) in FakeTerraform.calls
+        assert not (manager.state_dir / 'app-gone').exists()
+
+
+class TestSharedInit:
+    """Test one-time terraform init per configuration fingerprint"""
+
+    def test_init_runs_once_per_fingerprint(self, manager):
+        """Test that later applies reuse the shared init and report a cache hit"""
+        config = {'variables': {}, 'deployment_type': 'lxc'}
+
+        first = manager.apply('app-a', config)
+        second = manager.apply('app-b', config)
+
+        init_calls = [wd for call, wd in FakeTerraform.calls if call == 'init']
+        assert len(init_calls) == 1
+        assert first['init']['cache_hit'] is False
+        assert second['init']['cache_hit'] is True
+        assert second['init']['fingerprint'] == first['init']['fingerprint']
+        assert second['init']['seconds'] >= 0
+
+    def test_config_change_triggers_init(self, manager):
+        """Test that editing a .tf file produces a new fingerprint and a new init"""
+        config = {'variables': {}, 'deployment_type': 'lxc'}
+        first = manager.apply('app-a', config)
+
+        (manager.terraform_dir / 'main.tf').write_text('# changed config\n')
+        second = manager.apply('app-a', config)
+
+        assert second['init']['cache_hit'] is False
+        assert second['init']['fingerprint'] != first['init']['fingerprint']
+        marker = manager.state_dir / 'app-a' / '.terraform' / '.fingerprint'
+        assert marker.read_text() == second['init']['fingerprint']
@@ -0,0 +1,150 @@
+"""
+Unit Tests for the VM ID allocator
+Run with: pytest tests/
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from config import Config
+from backend.api import terraform_manager
+from backend.api.vm_ids import IDBitmap, VMIDAllocator, VMIDExhaustedError
+from backend.extensions import db
+from backend.models.deployment import Deployment, DeploymentStatus
+from backend.models.golden_image import GoldenImage
+from backend.models.package_cache import PackageCache
+from backend.models.vm_id_reservation import VMIDReservation
+from backend.utils.database import configure_sqlite
+
+
+class FakeInventory:
+    """Cluster inventory snapshot with a fixed guest list"""
+
+    def __init__(self, vm_ids=()):
+        self.vm_ids = list(vm_ids)
+
+    def guests(self):
+        return [{'vmid': vm_id, 'type': 'lxc'} for vm_id in self.vm_ids]
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Fixture for an application bound to a SQLite file with WAL enabled"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'vm_ids.db'}"
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_size': 16, 'max_overflow': 64}
+    app.config['VM_ID_RANGE_START'] = 100
+    app.config['VM_ID_RANGE_END'] = 299
+    db.init_app(app)
+
+    with app.app_context():
+        configure_sqlite(db.engine, app.config)
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def add_deployment(vm_id, status=DeploymentStatus.RUNNING):
+    """Insert a deployment holding a VM ID"""
+    deployment = Deployment(
+        name=f"app-{vm_id}",
+        deployment_type='lxc',
+        framework='flask',
+        github_url='https://github.com/test/repo',
+        resources={},
+        status=status,
+        created_at=datetime.utcnow()
+    )
+    deployment.vm_id = vm_id
+    db.session.add(deployment)
+    db.session.commit()
+
+
+class TestIDBitmap:
+    """Test IDBitmap"""
+
+    def test_take_lowest_reuses_freed_ids(self):
+        """Test lowest-free allocation across word boundaries and after discard"""
+        bitmap = IDBitmap(100, 229)
+        for vm_id in range(100, 228):
+            bitmap.add(vm_id)
+
+        assert bitmap.take_lowest() == 228
+        bitmap.discard(150)
+        assert bitmap.take_lowest() == 150
+        assert bitmap.take_lowest() == 229
+        assert bitmap.take_lowest() is None
+        assert bitmap.used == bitmap.size == 130
+
+
+class TestVMIDAllocator:
+    """Test VMIDAllocator"""
+
+    def test_sync_skips_deployments_and_inventory(self, app):
+        """Test that IDs of live deployments and existing guests are not handed out"""
+        add_deployment(100)
+        add_deployment(101, status=DeploymentStatus.DELETED)
+        allocator = VMIDAllocator(app, FakeInventory([102]))
+
+        assert [allocator.allocate() for _ in range(2)] == [101, 103]
+
+    def test_sync_skips_templates_and_cache_guest(self, app):
+        """Test that golden image templates and the cache guest keep their IDs without a reservation or snapshot"""
+        db.session.add_all([
+            GoldenImage(language='php', deployment_type='lxc', version='v1', status='retired', vm_id=100),
+            PackageCache(status='ready', vm_id=101, port=3142),
+            PackageCache(status='deleted', vm_id=102, port=3142)
+        ])
+        db.session.commit()
+        allocator = VMIDAllocator(app, FakeInventory())
+
+        assert allocator.allocate() == 102
+
+    def test_concurrent_allocations_never_collide(self, app):
+        """Test 64 concurrent deployments split over two server processes"""
+        allocators = [VMIDAllocator(app, FakeInventory()), VMIDAllocator(app, FakeInventory())]
+
+        def allocate(index):
+            with app.app_context():
+                return allocators[index % 2].allocate(f"deployment-{index}")
+
+        with ThreadPoolExecutor(max_workers=64) as pool:
+            vm_ids = list(pool.map(allocate, range(64)))
+
+        assert len(set(vm_ids)) == 64
+        assert VMIDReservation.query.count() == 64
+
+    def test_expired_reservations_are_reclaimed(self, app):
+        """Test that an abandoned reservation frees its ID after the TTL"""
+        app.config['VM_ID_RANGE_END'] = 100
+        allocator = VMIDAllocator(app, FakeInventory())
+        assert allocator.allocate('abandoned') == 100
+        with pytest.raises(VMIDExhaustedError):
+            allocator.allocate('waiting')
+
+        reservation = db.session.get(VMIDReservation, 100)
+        reservation.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+        assert allocator.allocate('waiting') == 100
+        assert db.session.get(VMIDReservation, 100).deployment_id == 'waiting'
+
+    def test_failed_config_releases_reservation(self, app, tmp_path, monkeypatch):
+        """Test that generate_config gives the ID back when it cannot finish the config"""
+        app.config['SUPPORTED_FRAMEWORKS'] = Config.SUPPORTED_FRAMEWORKS
+        app.config['TERRAFORM_DIR'] = tmp_path / 'terraform'
+        app.config['TERRAFORM_STATE_DIR'] = tmp_path / 'states'
+        allocator = VMIDAllocator(app, FakeInventory())
+        monkeypatch.setattr(terraform_manager, 'vm_ids', allocator)
+        manager = terraform_manager.TerraformManager()
+
+        with pytest.raises(ValueError):
+            manager.generate_config('lxc', 'cobol', 'app', {}, deployment_id='unsupported')
+        with pytest.raises(KeyError):
+            # No Proxmox settings configured
+            manager.generate_config('lxc', 'flask', 'app', {}, deployment_id='misconfigured')
+
+        assert VMIDReservation.query.count() == 0
+        assert allocator.allocate('next') == 100
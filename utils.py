@@ -1,20 +1,25 @@
-import torch
 import os
-import matplotlib.pyplot as plt
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict
+
+# torch and matplotlib are imported inside the functions that use them, so
+# importing this module neither requires them nor pays their load time
+if TYPE_CHECKING:
+    import torch
 
 def set_seeds(seed: int=42):
     """Sets random sets for torch operations."""
+    import torch
     torch.manual_seed(seed)
     torch.cuda.manual_seed(seed)
 
 def accuracy_fn(y_true, y_pred):
     """Calculates accuracy between truth labels and predictions."""
+    import torch
     correct = torch.eq(y_true, y_pred).sum().item()
     acc = (correct / len(y_pred)) * 100
     return acc
 
-def print_train_time(start: float, end: float, device: torch.device = None):
+def print_train_time(start: float, end: float, device: "torch.device" = None):
     """Prints difference between start and end time."""
     total_time = end - start
     print(f"Train time on {device}: {total_time:.3f} seconds")
@@ -22,6 +27,7 @@ def print_train_time(start: float, end: float, device: torch.device = None):
 
 def plot_loss_curves(results: Dict[str, List[float]]):
     """Plots training curves of a results dictionary."""
+    import matplotlib.pyplot as plt
     loss = results['train_loss']
     test_loss = results['test_loss']
     accuracy = results['train_acc']
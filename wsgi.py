@@ -0,0 +1,10 @@
+"""
+WSGI entry point for production servers
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+from app import create_app
+
+# Production boot by default: no create_all (run `flask db upgrade` on deploy)
+app = create_app(os.getenv('FLASK_CONFIG', 'production'))